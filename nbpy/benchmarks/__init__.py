@@ -0,0 +1,10 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines benchmarks of the performance-critical parts of a simulation.
+
+Each module is runnable, e.g. ``python -m nbpy.benchmarks.threads``. The
+module :mod:`.suite` runs the benchmarks of the force evaluation, the
+integrator, and the output, and compares them with a baseline.
+
+"""
@@ -0,0 +1,116 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Benchmarks the memory allocated and the time taken by the updates of a
+:class:`.Leapfrog` step, excluding the force evaluation.
+
+Run as ``python -m nbpy.benchmarks.allocations --N 1000000``.
+
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import Leapfrog
+from nbpy.particles import PhaseSpace
+
+
+class _FrozenInteraction:
+    """
+    Leaves the accelerations unchanged, so that only the updates of the
+    integrator are measured.
+
+    """
+
+    @staticmethod
+    def exert(phsp: PhaseSpace, masses: npt.NDArray) -> None:
+        """
+        Do nothing, keeping the current accelerations.
+
+        """
+
+
+def _evolve_with_temporaries(phsp: PhaseSpace, dt: float, masses: npt.NDArray,
+                             interaction) -> None:
+    """
+    The step of :class:`.Leapfrog` written with array expressions, as a
+    reference.
+
+    """
+    phsp.set_velocities(phsp.velocities + 0.5 * dt * phsp.accelerations)
+    phsp.set_positions(phsp.positions + dt * phsp.velocities)
+    interaction.exert(phsp, masses)
+    phsp.set_velocities(phsp.velocities + 0.5 * dt * phsp.accelerations)
+
+
+def measure_step(evolve,
+                 N: int,
+                 steps: int = 10,
+                 seed: int = 25092020) -> tuple:
+    """
+    Return the peak memory in bytes allocated during a step, and the best
+    wall time in seconds of a step.
+
+    Parameters
+    ----------
+
+    evolve : callable
+        The step, with the signature of :meth:`.Leapfrog.evolve`.
+
+    N : int
+        The number of particles.
+
+    steps : int (default: 10)
+        The number of timed steps, after a warm-up step.
+
+    seed : int (default: 25092020)
+        The RNG seed of the phase space.
+
+    """
+    rng = np.random.default_rng(seed)
+    masses = np.ones(N)
+    phsp = PhaseSpace(N)
+    phsp.set_positions(rng.standard_normal((N, 3)))
+    phsp.set_velocities(rng.standard_normal((N, 3)))
+    phsp.set_accelerations(rng.standard_normal((N, 3)))
+    interaction = _FrozenInteraction()
+    evolve(phsp, 1.e-3, masses, interaction)
+
+    tracemalloc.start()
+    evolve(phsp, 1.e-3, masses, interaction)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = np.inf
+    for _ in range(steps):
+        start = time.perf_counter()
+        evolve(phsp, 1.e-3, masses, interaction)
+        best = min(best, time.perf_counter() - start)
+    return peak, best
+
+
+def main() -> None:
+    """
+    Print the peak memory allocated and the time of a step with in-place
+    updates and with array expressions.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--N", type=int, default=1000000)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"N = {args.N}, state = {3 * 3 * args.N * 8 / 2**20:.1f} MiB")
+    print(f"{'step':>12} {'peak MiB':>10} {'ms':>10}")
+    for name, evolve in (("in place", Leapfrog().evolve),
+                         ("expressions", _evolve_with_temporaries)):
+        peak, seconds = measure_step(evolve, args.N, args.steps)
+        print(f"{name:>12} {peak / 2**20:>10.2f} {1.e3 * seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Benchmarks the accuracy of the integrators against the number of force
+evaluations.
+
+Run as ``python -m nbpy.benchmarks.integrators --N 100 --steps 8 16 32 64``.
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import ForestRuth, Hermite, Leapfrog
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+
+class _CountingInteraction:
+    """
+    Counts the force evaluations of the wrapped interaction.
+
+    """
+
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self.evaluations = 0
+
+    def exert(self, phsp: PhaseSpace, masses: npt.NDArray) -> None:
+        """
+        Count and perform :meth:`exert` of the wrapped interaction.
+
+        """
+        self.evaluations += 1
+        self._interaction.exert(phsp, masses)
+
+    def exert_with_jerks(self, phsp: PhaseSpace,
+                         masses: npt.NDArray) -> npt.NDArray:
+        """
+        Count and perform :meth:`exert_with_jerks` of the wrapped
+        interaction.
+
+        """
+        self.evaluations += 1
+        return self._interaction.exert_with_jerks(phsp, masses)
+
+
+def integrate(integrator,
+              N: int,
+              steps: int,
+              duration: float = 1.,
+              softening: float = 5.e-2,
+              seed: int = 25092020) -> tuple:
+    """
+    Evolve a cluster of equal masses over the given duration.
+
+    Parameters
+    ----------
+
+    integrator : obj
+        The integrator. Must have an ``evolve(phsp, dt, masses, interaction)``
+        member function.
+
+    N : int
+        The number of particles.
+
+    steps : int
+        The number of time steps.
+
+    duration : float (default: 1.)
+        The simulated time, in units where the total mass and the gravitational
+        constant are one.
+
+    softening : float (default: 5.e-2)
+        The softening parameter.
+
+    seed : int (default: 25092020)
+        The RNG seed of the initial positions and velocities.
+
+    Returns
+    -------
+
+    out : tuple
+        The final positions, the number of force evaluations, and the wall
+        time in seconds.
+
+    """
+    rng = np.random.default_rng(seed)
+    masses = np.full(N, 1. / N)
+    phsp = PhaseSpace(N)
+    phsp.set_positions(rng.standard_normal((N, 3)))
+    phsp.set_velocities(0.5 * rng.standard_normal((N, 3)))
+
+    interaction = _CountingInteraction(InverseSquareLaw(1., softening))
+    interaction.exert(phsp, masses)
+    interaction.evaluations = 0
+
+    dt = duration / steps
+    start = time.perf_counter()
+    for _ in range(steps):
+        integrator.evolve(phsp, dt, masses, interaction)
+    seconds = time.perf_counter() - start
+    return phsp.positions.copy(), interaction.evaluations, seconds
+
+
+def main() -> None:
+    """
+    Print the error of the final positions, the force evaluations, and the
+    wall time of each integrator and number of steps.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--N", type=int, default=100)
+    parser.add_argument("--steps",
+                        type=int,
+                        nargs="+",
+                        default=[8, 16, 32, 64, 128])
+    parser.add_argument("--duration", type=float, default=1.)
+    args = parser.parse_args()
+
+    # The reference solution takes far smaller steps than any of the runs.
+    reference, _, _ = integrate(ForestRuth(), args.N, 16 * max(args.steps),
+                                args.duration)
+    scale = np.max(np.abs(reference))
+
+    print(f"N = {args.N}, duration = {args.duration}")
+    print(f"{'integrator':>12} {'steps':>6} {'evaluations':>12} "
+          f"{'error':>10} {'seconds':>10}")
+    for integrator_type in (Leapfrog, ForestRuth, Hermite):
+        for steps in args.steps:
+            positions, evaluations, seconds = integrate(
+                integrator_type(), args.N, steps, args.duration)
+            error = np.max(np.abs(positions - reference)) / scale
+            print(f"{integrator_type.__name__:>12} {steps:>6} "
+                  f"{evaluations:>12} {error:>10.2e} {seconds:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
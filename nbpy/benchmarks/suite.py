@@ -0,0 +1,299 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Benchmarks the force evaluation, the integrator, and the snapshot output
+over a range of numbers of particles, and compares the results with a
+baseline.
+
+Run as ``python -m nbpy.benchmarks.suite --N 256 1024 4096 --output
+Results.json``, and later as ``python -m nbpy.benchmarks.suite --baseline
+Results.json`` to report the metrics that regressed by more than the
+threshold. The exit status is nonzero if any did.
+
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from nbpy.evolution import Leapfrog, Time
+from nbpy.interactions import InverseSquareLaw
+from nbpy.io import SnapshotWriter, write_snapshot_to_disk
+from nbpy.particles import PhaseSpace
+
+# Metrics for which larger values are better. The others are better smaller.
+_THROUGHPUTS = ("EvaluationsPerSecond", "PairsPerSecond", "StepsPerSecond",
+                "MBPerSecond")
+
+_BYTES_PER_MB = 1.e6
+
+
+def _phase_space(N: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    masses = np.full(N, 1. / N)
+    phsp = PhaseSpace(N)
+    phsp.set_positions(rng.standard_normal((N, 3)))
+    phsp.set_velocities(rng.standard_normal((N, 3)))
+    return phsp, masses
+
+
+def _best_time(function, repeats: int) -> float:
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_bytes(function) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark_force(N: int, repeats: int = 3, seed: int = 25092020) -> dict:
+    """
+    Return the throughput and peak memory of :meth:`.InverseSquareLaw.exert`.
+
+    """
+    phsp, masses = _phase_space(N, seed)
+    interaction = InverseSquareLaw(1., 1.e-2)
+    interaction.exert(phsp, masses)
+
+    def evaluate():
+        interaction.exert(phsp, masses)
+
+    seconds = _best_time(evaluate, repeats)
+    return {
+        "Benchmark": "Force",
+        "N": N,
+        "EvaluationsPerSecond": 1. / seconds,
+        "PairsPerSecond": N * N / seconds,
+        "PeakMiB": _peak_bytes(evaluate) / 2**20
+    }
+
+
+def benchmark_integrator(N: int,
+                         repeats: int = 3,
+                         seed: int = 25092020) -> dict:
+    """
+    Return the throughput and peak memory of :meth:`.Leapfrog.evolve` with
+    :class:`.InverseSquareLaw`.
+
+    """
+    phsp, masses = _phase_space(N, seed)
+    interaction = InverseSquareLaw(1., 1.e-2)
+    interaction.exert(phsp, masses)
+    integrator = Leapfrog()
+
+    def step():
+        integrator.evolve(phsp, 1.e-4, masses, interaction)
+
+    step()
+    seconds = _best_time(step, repeats)
+    return {
+        "Benchmark": "Integrator",
+        "N": N,
+        "StepsPerSecond": 1. / seconds,
+        "PairsPerSecond": N * N / seconds,
+        "PeakMiB": _peak_bytes(step) / 2**20
+    }
+
+
+def benchmark_output(N: int,
+                     repeats: int = 3,
+                     snapshots: int = 20,
+                     seed: int = 25092020) -> list:
+    """
+    Return the throughput of the snapshot output with
+    :func:`.write_snapshot_to_disk` and with :class:`.SnapshotWriter`, each
+    writing the given number of snapshots to a new file.
+
+    """
+    phsp, _ = _phase_space(N, seed)
+    megabytes = snapshots * phsp.positions.nbytes / _BYTES_PER_MB
+    options = {"Filename": "Benchmark", "Groupname": "Particles"}
+
+    def write_groups():
+        for time_id in range(snapshots):
+            write_snapshot_to_disk(options, phsp.positions,
+                                   Time(time_id, float(time_id)))
+
+    def write_datasets():
+        with SnapshotWriter("Benchmark", "Particles", N,
+                            capacity=snapshots) as writer:
+            for time_id in range(snapshots):
+                writer.write({"Positions": phsp.positions},
+                             Time(time_id, float(time_id)))
+
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            for name, write in (("WriteSnapshotToDisk", write_groups),
+                                ("SnapshotWriter", write_datasets)):
+                seconds = np.inf
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    write()
+                    seconds = min(seconds, time.perf_counter() - start)
+                    os.remove("Benchmark.hdf5")
+                results.append({
+                    "Benchmark": name,
+                    "N": N,
+                    "MBPerSecond": megabytes / seconds
+                })
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def run_suite(particle_counts: list, repeats: int = 3) -> dict:
+    """
+    Run all benchmarks for every number of particles.
+
+    Parameters
+    ----------
+
+    particle_counts : list
+        The numbers of particles.
+
+    repeats : int (default: 3)
+        The number of timed repetitions, of which the best is kept.
+
+    Returns
+    -------
+
+    out : dict
+        A dictionary with keys ``"Metadata"`` (dict), describing the machine
+        and versions, and ``"Results"`` (list), holding a dictionary of
+        metrics for every benchmark and N.
+
+    """
+    results = []
+    for N in particle_counts:
+        results.append(benchmark_force(N, repeats))
+        results.append(benchmark_integrator(N, repeats))
+        results.extend(benchmark_output(N, repeats))
+    return {
+        "Metadata": {
+            "Date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "Python": platform.python_version(),
+            "NumPy": np.__version__,
+            "Machine": platform.machine(),
+            "Processor": platform.processor(),
+            "Cores": os.cpu_count()
+        },
+        "Results": results
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> list:
+    """
+    Return the metrics that regressed with respect to a baseline.
+
+    Parameters
+    ----------
+
+    results : dict
+        The results, as returned by :func:`.run_suite`.
+
+    baseline : dict
+        The baseline results, in the same format.
+
+    threshold : float (default: 0.1)
+        The relative change beyond which a metric has regressed: a
+        throughput lower by this fraction, or a peak memory higher by it.
+
+    Returns
+    -------
+
+    out : list
+        A dictionary for every regression, with keys ``"Benchmark"``,
+        ``"N"``, ``"Metric"``, ``"Baseline"``, ``"Value"``, and
+        ``"Change"`` (relative).
+
+    """
+    reference = {
+        (entry["Benchmark"], entry["N"]): entry
+        for entry in baseline["Results"]
+    }
+
+    regressions = []
+    for entry in results["Results"]:
+        old = reference.get((entry["Benchmark"], entry["N"]))
+        if old is None:
+            continue
+        for metric, value in entry.items():
+            if metric in ("Benchmark", "N") or not old.get(metric):
+                continue
+            change = value / old[metric] - 1.
+            worse = -change if metric in _THROUGHPUTS else change
+            if worse > threshold:
+                regressions.append({
+                    "Benchmark": entry["Benchmark"],
+                    "N": entry["N"],
+                    "Metric": metric,
+                    "Baseline": old[metric],
+                    "Value": value,
+                    "Change": change
+                })
+    return regressions
+
+
+def main() -> None:
+    """
+    Run the suite, print the results, and optionally write them to a JSON
+    file and compare them with a baseline.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--N", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write the results")
+    parser.add_argument("--baseline", help="JSON file of baseline results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = run_suite(args.N, args.repeats)
+    for entry in results["Results"]:
+        metrics = ", ".join(f"{metric} = {value:.4g}"
+                            for metric, value in entry.items()
+                            if metric not in ("Benchmark", "N"))
+        print(f"{entry['Benchmark']:>20} N = {entry['N']:<8} {metrics}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as outfile:
+            json.dump(results, outfile, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression in {regression['Benchmark']} "
+                  f"(N = {regression['N']}): {regression['Metric']} "
+                  f"{regression['Baseline']:.4g} -> "
+                  f"{regression['Value']:.4g} "
+                  f"({100. * regression['Change']:+.1f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {100. * args.threshold:.0f}%.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Benchmarks the multithreaded force evaluation of :class:`.InverseSquareLaw`.
+
+Run as ``python -m nbpy.benchmarks.threads --N 20000 --workers 1 2 4 8``.
+
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+
+def time_exert(N: int,
+               workers: int,
+               tile_size: int = 128,
+               repeats: int = 3,
+               seed: int = 25092020) -> float:
+    """
+    Return the best wall time in seconds of a force evaluation.
+
+    Parameters
+    ----------
+
+    N : int
+        The number of particles.
+
+    workers : int
+        The number of threads.
+
+    tile_size : int (default: 128)
+        The number of target particles per row block.
+
+    repeats : int (default: 3)
+        The number of timed evaluations, after a warm-up evaluation.
+
+    seed : int (default: 25092020)
+        The RNG seed of the positions and masses.
+
+    """
+    rng = np.random.default_rng(seed)
+    masses = rng.random(N)
+    phsp = PhaseSpace(N)
+    phsp.set_positions(rng.standard_normal((N, 3)))
+
+    interaction = InverseSquareLaw(4. * np.pi**2.,
+                                   1.e-2,
+                                   tile_size=tile_size,
+                                   workers=workers)
+    interaction.exert(phsp, masses)
+
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        interaction.exert(phsp, masses)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """
+    Print the time per force evaluation and the speedup with respect to a
+    single worker, for each number of workers.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--N", type=int, default=10000)
+    parser.add_argument("--workers",
+                        type=int,
+                        nargs="+",
+                        default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--tile-size", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"N = {args.N}, tile size = {args.tile_size}, "
+          f"cores = {os.cpu_count()}")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    reference = None
+    for workers in args.workers:
+        seconds = time_exert(args.N, workers, args.tile_size, args.repeats)
+        if reference is None:
+            reference = seconds
+        print(f"{workers:>8} {seconds:>10.4f} {reference / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,17 @@ Defines modules and classes related to the evolution of the system.
 
 """
 
+from .block_timestep import BlockTimestep
+from .cold_collapse import ColdCollapse
+from .distribution import Distribution
+from .factory import Distributions, Integrators
+from .forest_ruth import ForestRuth
+from .galaxy_merger import GalaxyMerger
+from .hermite import Hermite
+from .hernquist_sphere import HernquistSphere
+from .integrator import Integrator
 from .leapfrog import Leapfrog
+from .plummer_sphere import PlummerSphere
 from .random_distribution import RandomDistribution
 from .time import Time
+from .uniform_sphere import UniformSphere
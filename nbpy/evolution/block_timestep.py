@@ -0,0 +1,219 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.BlockTimestep`.
+
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .integrator import Integrator
+
+
+class BlockTimestep(Integrator):
+    """
+    The Leapfrog integrator with hierarchical block time steps.
+
+    Each particle is assigned a level ``l`` and is kicked with its own time
+    step ``dt / 2**l``, where ``dt`` is the step passed to :meth:`evolve`.
+    Levels are chosen from the acceleration and velocity of the particle, so
+    that only the particles in close encounters take small steps. All
+    particles are drifted together, but the accelerations are recomputed only
+    for the particles at the end of their own step.
+
+    Parameters
+    ----------
+
+    max_level : int (default: 6)
+        The deepest level, i.e. the smallest time step is ``dt / 2**max_level``.
+
+    accuracy : float (default: 0.1)
+        The dimensionless factor ``eta`` of the time-step criterion.
+
+    length : float (default: 1.e-2)
+        The length scale ``l`` of the time-step criterion, typically the
+        softening parameter of the interaction.
+
+    Notes
+    -----
+
+    - The time step of a particle with velocity ``v`` and acceleration ``a``
+      is the largest ``dt / 2**l`` not exceeding
+      ``eta * min(sqrt(l / |a|), l / |v|)``.
+    - A particle may move to a shallower level only at times that are
+      multiples of the new time step, so the blocks stay synchronized. All
+      particles are synchronized at the end of :meth:`evolve`.
+
+    """
+
+    def __init__(self,
+                 max_level: int = 6,
+                 accuracy: float = 0.1,
+                 length: float = 1.e-2):
+        self._max_level = max_level
+        self._accuracy = accuracy
+        self._length = length
+        self._levels = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'BlockTimestep':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"MaxLevel"`` (int),
+            ``"Accuracy"`` (float), and ``"Length"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(max_level=params.get("MaxLevel", 6),
+                   accuracy=params.get("Accuracy", 0.1),
+                   length=params.get("Length", 1.e-2))
+
+    @property
+    def max_level(self) -> int:
+        """
+        The deepest level.
+
+        """
+        return self._max_level
+
+    @property
+    def accuracy(self) -> float:
+        """
+        The dimensionless factor of the time-step criterion.
+
+        """
+        return self._accuracy
+
+    @property
+    def length(self) -> float:
+        """
+        The length scale of the time-step criterion.
+
+        """
+        return self._length
+
+    @property
+    def levels(self) -> npt.NDArray:
+        """
+        The levels of the particles at the end of the last step.
+
+        """
+        return self._levels
+
+    def get_state(self) -> dict:
+        """
+        The levels of the particles at the end of the last step.
+
+        Returns
+        -------
+
+        out : dict
+            A dictionary holding the key ``"Levels"`` (numpy.typing.NDArray).
+
+        """
+        return {"Levels": self._levels}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Set the levels of the particles at the end of the last step.
+
+        Parameters
+        ----------
+
+        state : dict
+            The dictionary returned by :meth:`get_state`.
+
+        """
+        self._levels = state.get("Levels", np.zeros(0, dtype=np.int64))
+
+    def evolve(self, phsp: PhaseSpace, dt: float, masses: npt.NDArray,
+               interaction) -> None:
+        """
+        Update positions and velocities.
+
+        Since it is needed in the calculation, this function also updates the
+        accelerations for the given interaction.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system. Must contain keys ``"Positions"``,
+            ``"Velocities"``, and ``"Accelerations"``. The accelerations must
+            correspond to the positions.
+
+        dt : float
+            The largest time step, by which the whole system is evolved.
+
+        masses : numpy.typing.NDArray
+            The masses of the particles.
+
+        interaction : obj
+            The interaction from which to calculate the acceleration in terms of
+            the position. Must have an ``exert_on(phsp, masses, targets)``
+            member function, see :class:`.Interaction`.
+
+        """
+        # Time is counted in units of the smallest step.
+        n_substeps = 2**self._max_level
+        substep = dt / n_substeps
+
+        levels = self._choose_levels(phsp, dt, 0)
+        self._kick(phsp, np.arange(levels.size), 0.5 * dt / 2.**levels)
+
+        time = 0
+        while time < n_substeps:
+            # The next block boundary is the end of the current shortest step.
+            stride = 2**(self._max_level - levels.max())
+            phsp.drift(stride * substep)
+            time += stride
+
+            active = np.flatnonzero(time % 2**(self._max_level - levels) == 0)
+            interaction.exert_on(phsp, masses, active)
+            self._kick(phsp, active, 0.5 * dt / 2.**levels[active])
+
+            if time < n_substeps:
+                levels[active] = self._choose_levels(phsp, dt, time)[active]
+                self._kick(phsp, active, 0.5 * dt / 2.**levels[active])
+
+        self._levels = levels
+
+    def _choose_levels(self, phsp: PhaseSpace, dt: float,
+                       time: int) -> npt.NDArray:
+        """
+        Return the levels of all particles from the time-step criterion, at
+        the given time in units of the smallest step.
+
+        """
+        with np.errstate(divide="ignore"):
+            criterion = self._accuracy * np.minimum(
+                np.sqrt(
+                    self._length / np.linalg.norm(phsp.accelerations, axis=1)),
+                self._length / np.linalg.norm(phsp.velocities, axis=1))
+            levels = np.ceil(np.log2(dt / criterion))
+        levels = np.clip(levels, 0, self._max_level).astype(np.int64)
+
+        # Deepen the levels whose steps are not aligned with the given time.
+        misaligned = np.mod(time, 2**(self._max_level - levels)) != 0
+        while np.any(misaligned):
+            levels[misaligned] += 1
+            misaligned = np.mod(time, 2**(self._max_level - levels)) != 0
+        return levels
+
+    @staticmethod
+    def _kick(phsp: PhaseSpace, particles: npt.NDArray,
+              dt: npt.NDArray) -> None:
+        phsp.velocities[
+            particles] += dt[:, np.newaxis] * phsp.accelerations[particles]
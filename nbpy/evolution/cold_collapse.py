@@ -0,0 +1,58 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.ColdCollapse`.
+
+"""
+
+from .uniform_sphere import UniformSphere
+
+
+class ColdCollapse(UniformSphere):
+    """
+    Sets positions uniformly within a sphere, initially at rest or nearly so,
+    for the collapse and violent relaxation of a cold sphere.
+
+    Parameters
+    ----------
+
+    seed : int (default: 25092020)
+        The RNG seed.
+
+    radius : float (default: 1.)
+        The radius of the sphere.
+
+    virial_ratio : float (default: 0.)
+        The ratio of the kinetic energy to the magnitude of the potential
+        energy, as in :class:`.UniformSphere`.
+
+    """
+
+    def __init__(self,
+                 seed: int = 25092020,
+                 radius: float = 1.,
+                 virial_ratio: float = 0.):
+        super().__init__(seed, radius, virial_ratio)
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'ColdCollapse':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"Seed"`` (int), ``"Radius"``
+            (float), and ``"VirialRatio"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020),
+                   radius=params.get("Radius", 1.),
+                   virial_ratio=params.get("VirialRatio", 0.))
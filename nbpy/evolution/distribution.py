@@ -0,0 +1,86 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.Distribution`.
+
+"""
+import abc
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+
+
+class Distribution(metaclass=abc.ABCMeta):
+    """
+    Abstract base class for generators of initial data.
+
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def from_dict(cls, params: dict):
+        """
+        Constructor that uses a dictionary of parameters.
+
+        """
+
+    @classmethod
+    def name(cls) -> str:
+        """
+        The name of the distribution.
+
+        """
+        return cls.__name__
+
+    @abc.abstractmethod
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
+        """
+        Set the positions and velocities of the phase space. Distributions
+        in equilibrium use the masses of the particles, if given.
+
+        """
+
+
+def _total_mass(phsp: PhaseSpace, masses: Optional[npt.NDArray]):
+    """
+    Return the total mass of every system, shaped to broadcast against arrays
+    of shape (..., N), or one if no masses are given.
+
+    """
+    if masses is None:
+        return 1.
+    masses = np.broadcast_to(masses, phsp.positions.shape[:-1])
+    return np.sum(masses, axis=-1, keepdims=True)
+
+
+def _isotropic(rng: np.random.Generator, shape: tuple) -> npt.NDArray:
+    """
+    Return unit vectors of the given leading shape, with isotropic random
+    directions.
+
+    """
+    cos_theta = rng.uniform(-1., 1., shape)
+    phi = rng.uniform(0., 2. * np.pi, shape)
+    sin_theta = np.sqrt(1. - cos_theta**2.)
+    directions = (sin_theta * np.cos(phi), sin_theta * np.sin(phi), cos_theta)
+    return np.stack(directions, axis=-1)
+
+
+def _recenter(positions: npt.NDArray, velocities: npt.NDArray,
+              masses: Optional[npt.NDArray]) -> None:
+    """
+    Move the particles of every system, of shape (..., N, 3), to the frame of
+    their center of mass, in place.
+
+    """
+    shape = positions.shape[:-1]
+    weights = np.ones(shape) if masses is None else masses
+    weights = np.broadcast_to(weights, shape)
+    fractions = weights / np.sum(weights, axis=-1, keepdims=True)
+    for value in (positions, velocities):
+        value -= np.matmul(fractions[..., np.newaxis, :], value)
@@ -0,0 +1,74 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines classes :class:`.Integrators` and :class:`.Distributions`.
+
+"""
+
+from typing import Type
+
+from .block_timestep import BlockTimestep
+from .cold_collapse import ColdCollapse
+from .distribution import Distribution
+from .forest_ruth import ForestRuth
+from .galaxy_merger import GalaxyMerger
+from .hermite import Hermite
+from .hernquist_sphere import HernquistSphere
+from .integrator import Integrator
+from .leapfrog import Leapfrog
+from .plummer_sphere import PlummerSphere
+from .random_distribution import RandomDistribution
+from .uniform_sphere import UniformSphere
+
+
+class Integrators:
+    """
+    A class to obtain all available types derived from
+    :class:`.Integrator` s.
+
+    """
+
+    @staticmethod
+    def typelist() -> list[Type[Integrator]]:
+        """
+        Return a list of all available subtypes.
+
+        """
+        return [Leapfrog, ForestRuth, Hermite, BlockTimestep]
+
+    @classmethod
+    def typedict(cls) -> dict[str, Type[Integrator]]:
+        """
+        Return a dictionary of all available subtypes, where the keys
+        are the subtype names, and the values the types.
+
+        """
+        return {t.name(): t for t in cls.typelist()}
+
+
+class Distributions:
+    """
+    A class to obtain all available types derived from
+    :class:`.Distribution` s.
+
+    """
+
+    @staticmethod
+    def typelist() -> list[Type[Distribution]]:
+        """
+        Return a list of all available subtypes.
+
+        """
+        return [
+            RandomDistribution, PlummerSphere, HernquistSphere, UniformSphere,
+            ColdCollapse, GalaxyMerger
+        ]
+
+    @classmethod
+    def typedict(cls) -> dict[str, Type[Distribution]]:
+        """
+        Return a dictionary of all available subtypes, where the keys
+        are the subtype names, and the values the types.
+
+        """
+        return {t.name(): t for t in cls.typelist()}
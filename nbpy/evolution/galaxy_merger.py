@@ -0,0 +1,170 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.GalaxyMerger`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .distribution import Distribution, _recenter
+from .plummer_sphere import _plummer
+
+
+class GalaxyMerger(Distribution):
+    """
+    Sets positions and velocities to those of two Plummer spheres on an orbit
+    towards each other.
+
+    The first half of the particles forms the first galaxy, and the rest the
+    second. The second galaxy starts at ``(separation, impact_parameter, 0)``
+    from the first and moves along -x relative to it.
+
+    Parameters
+    ----------
+
+    seed : int (default: 25092020)
+        The RNG seed.
+
+    scale_radius : float (default: 1.)
+        The Plummer radius of both galaxies.
+
+    separation : float (default: 20.)
+        The initial separation of the centers along x.
+
+    impact_parameter : float (default: 2.)
+        The initial separation of the centers along y.
+
+    relative_speed : float (default: None)
+        The initial relative speed of the centers. If not given, that of a
+        parabolic orbit of two point masses.
+
+    truncation : float (default: 10.)
+        The radius of every galaxy in units of ``scale_radius`` beyond which
+        no particles are placed.
+
+    Notes
+    -----
+
+    - The gravitational constant is one as in the accelerations of
+      :class:`.InverseSquareLaw`, and the total mass is that of the given
+      masses, or one if none are given.
+    - The center of mass of every system is at rest at the origin.
+
+    """
+
+    def __init__(self,
+                 seed: int = 25092020,
+                 scale_radius: float = 1.,
+                 separation: float = 20.,
+                 impact_parameter: float = 2.,
+                 relative_speed: Optional[float] = None,
+                 truncation: float = 10.):
+        self._seed = seed
+        self._scale_radius = scale_radius
+        self._offset = np.array([separation, impact_parameter, 0.])
+        self._relative_speed = relative_speed
+        self._truncation = truncation
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'GalaxyMerger':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"Seed"`` (int),
+            ``"ScaleRadius"`` (float), ``"Separation"`` (float),
+            ``"ImpactParameter"`` (float), ``"RelativeSpeed"`` (float), and
+            ``"Truncation"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020),
+                   scale_radius=params.get("ScaleRadius", 1.),
+                   separation=params.get("Separation", 20.),
+                   impact_parameter=params.get("ImpactParameter", 2.),
+                   relative_speed=params.get("RelativeSpeed"),
+                   truncation=params.get("Truncation", 10.))
+
+    @property
+    def seed(self) -> int:
+        """
+        The RNG seed used to generate the distribution.
+
+        """
+        return self._seed
+
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
+        """
+        Assign positions and velocities to those of two merging galaxies.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system, whose positions and velocities will
+            be set by this function.
+
+        masses : numpy.typing.NDArray (default: None)
+            The masses of the particles, which set the masses of the galaxies.
+
+        Raises
+        ------
+
+        ValueError
+            If the system has fewer than two particles.
+
+        """
+        shape = phsp.positions.shape[:-1]
+        N = shape[-1]
+        if N < 2:
+            raise ValueError("A merger needs at least two particles.")
+
+        # Without masses, every particle carries an equal share of one.
+        weights = np.full(N, 1. / N) if masses is None else masses
+        weights = np.broadcast_to(weights, shape)
+        rng = np.random.default_rng(self._seed)
+        positions = np.empty(shape + (3, ))
+        velocities = np.empty(shape + (3, ))
+
+        galaxies = (slice(None, N // 2), slice(N // 2, None))
+        galaxy_masses = []
+        for galaxy in galaxies:
+            galaxy_weights = weights[..., galaxy]
+            mass = np.sum(galaxy_weights, axis=-1, keepdims=True)
+            galaxy_positions, galaxy_velocities = _plummer(
+                rng, galaxy_weights.shape, mass, self._scale_radius,
+                self._truncation)
+            _recenter(galaxy_positions, galaxy_velocities, galaxy_weights)
+            positions[..., galaxy, :] = galaxy_positions
+            velocities[..., galaxy, :] = galaxy_velocities
+            galaxy_masses.append(mass[..., np.newaxis])
+
+        # The centers move on the two-body orbit about their center of mass.
+        total_mass = galaxy_masses[0] + galaxy_masses[1]
+        speed = self._relative_speed
+        if speed is None:
+            speed = np.sqrt(2. * total_mass / np.linalg.norm(self._offset))
+        relative_velocity = speed * np.array([-1., 0., 0.])
+        for galaxy, sign, mass in zip(galaxies, (-1., 1.),
+                                      reversed(galaxy_masses)):
+            fraction = sign * mass / total_mass
+            positions[..., galaxy, :] += fraction * self._offset
+            velocities[..., galaxy, :] += fraction * relative_velocity
+
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
@@ -0,0 +1,145 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.Hermite`.
+
+"""
+
+from typing import Optional
+
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .integrator import Integrator
+
+
+class Hermite(Integrator):
+    """
+    The fourth-order Hermite predictor-corrector integrator of Makino &
+    Aarseth (1992).
+
+    Positions and velocities are predicted with a Taylor series using the
+    accelerations and jerks, the accelerations and jerks are evaluated at the
+    predicted state, and positions and velocities are corrected with the
+    Hermite interpolation of the accelerations over the step.
+
+    Notes
+    -----
+
+    - A step costs a single evaluation of accelerations and jerks, about
+      twice the cost of an evaluation of accelerations alone.
+    - The jerks at the end of a step are kept for the next one. They are
+      computed anew when the number of particles changes or after
+      :meth:`reset`, e.g. when the phase space is set from outside.
+    - The integrator is not symplectic, so the energy drifts slowly, but the
+      error decreases as ``dt^4``.
+
+    """
+
+    def __init__(self):
+        self._jerks: Optional[npt.NDArray] = None
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'Hermite':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. No parameters are used.
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls()
+
+    def reset(self) -> None:
+        """
+        Discard the jerks kept from the last step.
+
+        """
+        self._jerks = None
+
+    def get_state(self) -> dict:
+        """
+        The jerks kept from the last step, if any.
+
+        Returns
+        -------
+
+        out : dict
+            A dictionary holding the key ``"Jerks"`` (numpy.typing.NDArray),
+            or an empty dictionary before the first step.
+
+        """
+        return {} if self._jerks is None else {"Jerks": self._jerks}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Set the jerks kept from the last step.
+
+        Parameters
+        ----------
+
+        state : dict
+            The dictionary returned by :meth:`get_state`. Without the key
+            ``"Jerks"``, the jerks are computed anew on the next step.
+
+        """
+        self._jerks = state.get("Jerks")
+
+    def evolve(self, phsp: PhaseSpace, dt: float, masses: npt.NDArray,
+               interaction) -> None:
+        """
+        Update positions, velocities, and accelerations.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system. Must contain keys ``"Positions"``,
+            ``"Velocities"``, and ``"Accelerations"``.
+
+        dt : float
+            The (fixed) time step.
+
+        masses : numpy.typing.NDArray
+            The masses of the particles.
+
+        interaction : obj
+            The interaction from which to calculate the acceleration and its
+            time derivative. Must override
+            :meth:`.Interaction.exert_with_jerks`, as
+            :class:`.InverseSquareLaw` does.
+
+        """
+        if self._jerks is None or self._jerks.shape != phsp.positions.shape:
+            self._jerks = interaction.exert_with_jerks(phsp, masses)
+
+        positions = phsp.positions.copy()
+        velocities = phsp.velocities.copy()
+        accelerations = phsp.accelerations.copy()
+        jerks = self._jerks
+
+        phsp.set_positions(positions + dt *
+                           (velocities + dt / 2. *
+                            (accelerations + dt / 3. * jerks)))
+        phsp.set_velocities(velocities + dt *
+                            (accelerations + dt / 2. * jerks))
+        self._jerks = interaction.exert_with_jerks(phsp, masses)
+
+        # The corrected velocities enter the corrected positions.
+        half_dt = 0.5 * dt
+        dt_sq_12 = dt**2. / 12.
+        phsp.set_velocities(velocities + half_dt *
+                            (accelerations + phsp.accelerations) + dt_sq_12 *
+                            (jerks - self._jerks))
+        phsp.set_positions(positions + half_dt *
+                           (velocities + phsp.velocities) + dt_sq_12 *
+                           (accelerations - phsp.accelerations))
@@ -0,0 +1,154 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.HernquistSphere`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .distribution import Distribution, _isotropic, _recenter, _total_mass
+
+
+class HernquistSphere(Distribution):
+    """
+    Sets positions and velocities to those of a Hernquist (1990) sphere.
+
+    Parameters
+    ----------
+
+    seed : int (default: 25092020)
+        The RNG seed.
+
+    scale_radius : float (default: 1.)
+        The scale radius ``a``.
+
+    truncation : float (default: 100.)
+        The radius in units of ``a`` beyond which no particles are placed,
+        since the mass of the profile converges slowly.
+
+    Notes
+    -----
+
+    - Velocities are drawn from Gaussians with the isotropic dispersion of the
+      Jeans equation (Hernquist 1990, eq. 10), excluding speeds above the
+      local escape speed. The gravitational constant is one as in the
+      accelerations of :class:`.InverseSquareLaw`, and the total mass is that
+      of the given masses, or one if none are given.
+    - Every system is moved to the frame of its center of mass.
+
+    """
+
+    def __init__(self,
+                 seed: int = 25092020,
+                 scale_radius: float = 1.,
+                 truncation: float = 100.):
+        self._seed = seed
+        self._scale_radius = scale_radius
+        self._truncation = truncation
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'HernquistSphere':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"Seed"`` (int),
+            ``"ScaleRadius"`` (float), and ``"Truncation"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020),
+                   scale_radius=params.get("ScaleRadius", 1.),
+                   truncation=params.get("Truncation", 100.))
+
+    @property
+    def seed(self) -> int:
+        """
+        The RNG seed used to generate the distribution.
+
+        """
+        return self._seed
+
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
+        """
+        Assign positions and velocities to those of a Hernquist sphere.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system, whose positions and velocities will
+            be set by this function.
+
+        masses : numpy.typing.NDArray (default: None)
+            The masses of the particles, which set the total mass.
+
+        """
+        rng = np.random.default_rng(self._seed)
+        shape = phsp.positions.shape[:-1]
+        a = self._scale_radius
+        total_mass = _total_mass(phsp, masses)
+
+        # The enclosed mass fraction r^2 / (r + a)^2, inverted. The fraction
+        # is kept away from zero, where the dispersion is undefined.
+        upper = (self._truncation / (self._truncation + 1.))**2.
+        fraction = np.sqrt(upper * (1. - rng.random(shape)))
+        radii = a * fraction / (1. - fraction)
+        positions = radii[..., np.newaxis] * _isotropic(rng, shape)
+
+        # Rounding may turn the dispersion slightly negative at large radii.
+        variances = np.maximum(_jeans_integral(radii / a), 0.)
+        dispersions = np.sqrt(total_mass / (12. * a) * variances)
+        escape_speeds = np.sqrt(2. * total_mass / (radii + a))
+        velocities = _bound_gaussian(rng, dispersions, escape_speeds)
+
+        _recenter(positions, velocities, masses)
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
+
+
+def _jeans_integral(x: npt.NDArray) -> npt.NDArray:
+    """
+    Return the radial velocity dispersion of an isotropic Hernquist sphere at
+    radii ``x`` in units of the scale radius, in units of GM / (12 a).
+
+    """
+    polynomial = 25. + x * (52. + x * (42. + x * 12.))
+    logarithm = 12. * x * (1. + x)**3. * np.log1p(1. / x)
+    return logarithm - x / (1. + x) * polynomial
+
+
+def _bound_gaussian(rng: np.random.Generator, dispersions: npt.NDArray,
+                    escape_speeds: npt.NDArray) -> npt.NDArray:
+    """
+    Return velocities drawn from isotropic Gaussians of the given dispersions,
+    redrawing those faster than the given escape speeds.
+
+    """
+    shape = dispersions.shape
+    dispersions = dispersions.ravel()
+    escape_sq = escape_speeds.ravel()**2.
+    velocities = np.empty((dispersions.size, 3))
+    missing = np.arange(dispersions.size)
+    while missing.size > 0:
+        trial = rng.standard_normal((missing.size, 3))
+        trial *= dispersions[missing, np.newaxis]
+        accepted = np.sum(trial**2., axis=-1) < escape_sq[missing]
+        velocities[missing[accepted]] = trial[accepted]
+        missing = missing[~accepted]
+    return velocities.reshape(shape + (3, ))
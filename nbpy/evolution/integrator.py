@@ -0,0 +1,66 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.Integrator`.
+
+"""
+import abc
+
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+
+
+class Integrator(metaclass=abc.ABCMeta):
+    """
+    Abstract base class for time integrators.
+
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def from_dict(cls, params: dict):
+        """
+        Constructor that uses a dictionary of parameters.
+
+        """
+
+    @classmethod
+    def name(cls) -> str:
+        """
+        The name of the integrator.
+
+        """
+        return cls.__name__
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """
+        Whether a batched phase space, holding several independent systems,
+        can be evolved. False by default.
+
+        """
+        return False
+
+    def get_state(self) -> dict:
+        """
+        The arrays carried over from one step to the next, keyed by name.
+        Integrators without such state return an empty dictionary.
+
+        """
+        return {}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Set the arrays returned by :meth:`get_state`, e.g. when resuming from
+        a checkpoint.
+
+        """
+
+    @abc.abstractmethod
+    def evolve(self, phsp: PhaseSpace, dt: float, masses: npt.NDArray,
+               interaction) -> None:
+        """
+        Evolve the phase space by the given time step.
+
+        """
@@ -8,16 +8,44 @@ Defines class :class:`.Leapfrog`.
 import numpy.typing as npt
 
 from nbpy.particles import PhaseSpace
+from .integrator import Integrator
 
 
-class Leapfrog:
+class Leapfrog(Integrator):
     """
     The syncronized second-order Leapfrog integrator for oscillatory problems.
 
     """
 
-    @staticmethod
-    def evolve(phsp: PhaseSpace, dt: float, masses: npt.NDArray,
+    @classmethod
+    def from_dict(cls, params: dict) -> 'Leapfrog':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. No parameters are used.
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls()
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """
+        Whether a batched phase space can be evolved.
+
+        """
+        return True
+
+    def evolve(self, phsp: PhaseSpace, dt: float, masses: npt.NDArray,
                interaction) -> None:
         """
         Update positions and velocities.
@@ -43,8 +71,19 @@ class Leapfrog:
             The interaction from which to calculate the acceleration in terms of
             the position. Must have an ``exert(phsp, masses)`` member function.
 
+        Notes
+        -----
+
+        - Positions and velocities are accumulated in the (double) precision of
+          the phase space, even if the interaction computes the accelerations
+          in single precision.
+        - All systems of a batched phase space are evolved at once, provided
+          the interaction supports it.
+        - The kicks and the drift update the phase space in place, so a step
+          allocates no memory besides that of the force evaluation.
+
         """
-        phsp.set_velocities(phsp.velocities + 0.5 * dt * phsp.accelerations)
-        phsp.set_positions(phsp.positions + dt * phsp.velocities)
+        phsp.kick(0.5 * dt)
+        phsp.drift(dt)
         interaction.exert(phsp, masses)
-        phsp.set_velocities(phsp.velocities + 0.5 * dt * phsp.accelerations)
+        phsp.kick(0.5 * dt)
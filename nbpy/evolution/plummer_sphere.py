@@ -0,0 +1,151 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.PlummerSphere`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .distribution import Distribution, _isotropic, _recenter, _total_mass
+
+# Upper bound of the distribution of speed fractions, q^2 (1 - q^2)^(7/2),
+# whose maximum is about 0.092.
+_SPEED_BOUND = 0.1
+
+
+class PlummerSphere(Distribution):
+    """
+    Sets positions and velocities to those of a Plummer sphere in equilibrium,
+    sampled as in Aarseth, Henon & Wielen (1974).
+
+    Parameters
+    ----------
+
+    seed : int (default: 25092020)
+        The RNG seed.
+
+    scale_radius : float (default: 1.)
+        The Plummer radius ``a``.
+
+    truncation : float (default: None)
+        If given, the radius in units of ``a`` beyond which no particles are
+        placed.
+
+    Notes
+    -----
+
+    - Velocities are those of the isotropic distribution function, with the
+      gravitational constant equal to one as in the accelerations of
+      :class:`.InverseSquareLaw`. The total mass is that of the given masses,
+      or one if none are given.
+    - Every system is moved to the frame of its center of mass.
+
+    """
+
+    def __init__(self,
+                 seed: int = 25092020,
+                 scale_radius: float = 1.,
+                 truncation: Optional[float] = None):
+        self._seed = seed
+        self._scale_radius = scale_radius
+        self._truncation = truncation
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'PlummerSphere':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"Seed"`` (int),
+            ``"ScaleRadius"`` (float), and ``"Truncation"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020),
+                   scale_radius=params.get("ScaleRadius", 1.),
+                   truncation=params.get("Truncation"))
+
+    @property
+    def seed(self) -> int:
+        """
+        The RNG seed used to generate the distribution.
+
+        """
+        return self._seed
+
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
+        """
+        Assign positions and velocities to those of a Plummer sphere.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system, whose positions and velocities will
+            be set by this function.
+
+        masses : numpy.typing.NDArray (default: None)
+            The masses of the particles, which set the total mass.
+
+        """
+        rng = np.random.default_rng(self._seed)
+        positions, velocities = _plummer(rng, phsp.positions.shape[:-1],
+                                         _total_mass(phsp, masses),
+                                         self._scale_radius, self._truncation)
+        _recenter(positions, velocities, masses)
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
+
+
+def _plummer(rng: np.random.Generator, shape: tuple, total_mass,
+             scale_radius: float, truncation: Optional[float]) -> tuple:
+    """
+    Return the positions and velocities of particles of the given leading
+    shape sampled from a Plummer sphere.
+
+    """
+    # The enclosed mass fraction r^3 / (r^2 + a^2)^(3/2), inverted.
+    upper = 1.
+    if truncation is not None:
+        upper = truncation**3. / (truncation**2. + 1.)**1.5
+    fraction = (upper * rng.random(shape))**(2. / 3.)
+    radii = scale_radius * np.sqrt(fraction / (1. - fraction))
+    positions = radii[..., np.newaxis] * _isotropic(rng, shape)
+
+    potential = total_mass / np.sqrt(radii**2. + scale_radius**2.)
+    escape_speeds = np.sqrt(2. * potential)
+    speeds = escape_speeds * _speed_fractions(rng, shape)
+    velocities = speeds[..., np.newaxis] * _isotropic(rng, shape)
+    return positions, velocities
+
+
+def _speed_fractions(rng: np.random.Generator, shape: tuple) -> npt.NDArray:
+    """
+    Return speeds in units of the escape speed, sampled by rejection from the
+    distribution q^2 (1 - q^2)^(7/2).
+
+    """
+    fractions = np.empty(shape).ravel()
+    missing = np.arange(fractions.size)
+    while missing.size > 0:
+        trial = rng.random(missing.size)
+        test = _SPEED_BOUND * rng.random(missing.size)
+        accepted = test < trial**2. * (1. - trial**2.)**3.5
+        fractions[missing[accepted]] = trial[accepted]
+        missing = missing[~accepted]
+    return fractions.reshape(shape)
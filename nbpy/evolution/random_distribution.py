@@ -5,12 +5,16 @@ Defines class :class:`.RandomDistribution`.
 
 """
 
+from typing import Optional
+
 import numpy as np
+import numpy.typing as npt
 
 from nbpy.particles import PhaseSpace
+from .distribution import Distribution
 
 
-class RandomDistribution:
+class RandomDistribution(Distribution):
     """
     Sets positions and velocities to random values normally distributed.
 
@@ -25,6 +29,26 @@ class RandomDistribution:
     def __init__(self, seed: int = 25092020):
         self._seed = seed
 
+    @classmethod
+    def from_dict(cls, params: dict) -> 'RandomDistribution':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain the key ``"Seed"`` (int).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020))
+
     @property
     def seed(self) -> int:
         """
@@ -33,7 +57,9 @@ class RandomDistribution:
         """
         return self._seed
 
-    def set_variables(self, phsp: PhaseSpace) -> None:
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
         """
         Assign positions and velocities to random numbers.
 
@@ -45,8 +71,11 @@ class RandomDistribution:
             ``"Positions"`` and ``"Velocities"``, whose values will be set by
             this function.
 
+        masses : numpy.typing.NDArray (default: None)
+            The masses of the particles. Not used by this distribution.
+
         """
-        N = phsp.positions.shape[0]
+        shape = phsp.positions.shape
         rng = np.random.default_rng(self._seed)
-        phsp.set_positions(rng.standard_normal((N, 3)))
-        phsp.set_velocities(rng.standard_normal((N, 3)))
+        phsp.set_positions(rng.standard_normal(shape))
+        phsp.set_velocities(rng.standard_normal(shape))
@@ -0,0 +1,125 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.UniformSphere`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .distribution import Distribution, _isotropic, _recenter, _total_mass
+
+
+class UniformSphere(Distribution):
+    """
+    Sets positions uniformly within a sphere, and velocities from an
+    isotropic Gaussian scaled to the given virial ratio.
+
+    Parameters
+    ----------
+
+    seed : int (default: 25092020)
+        The RNG seed.
+
+    radius : float (default: 1.)
+        The radius of the sphere.
+
+    virial_ratio : float (default: 0.5)
+        The ratio of the kinetic energy to the magnitude of the potential
+        energy, -3 M^2 / (5 R), of a uniform sphere. A value of 0.5 is virial
+        equilibrium.
+
+    Notes
+    -----
+
+    - The gravitational constant is one as in the accelerations of
+      :class:`.InverseSquareLaw`, and the total mass is that of the given
+      masses, or one if none are given.
+    - Every system is moved to the frame of its center of mass, and its
+      velocities are scaled so that its kinetic energy is exact.
+
+    """
+
+    def __init__(self,
+                 seed: int = 25092020,
+                 radius: float = 1.,
+                 virial_ratio: float = 0.5):
+        self._seed = seed
+        self._radius = radius
+        self._virial_ratio = virial_ratio
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'UniformSphere':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. May contain keys ``"Seed"`` (int), ``"Radius"``
+            (float), and ``"VirialRatio"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(params.get("Seed", 25092020),
+                   radius=params.get("Radius", 1.),
+                   virial_ratio=params.get("VirialRatio", 0.5))
+
+    @property
+    def seed(self) -> int:
+        """
+        The RNG seed used to generate the distribution.
+
+        """
+        return self._seed
+
+    def set_variables(self,
+                      phsp: PhaseSpace,
+                      masses: Optional[npt.NDArray] = None) -> None:
+        """
+        Assign positions and velocities to those of a uniform sphere.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system, whose positions and velocities will
+            be set by this function.
+
+        masses : numpy.typing.NDArray (default: None)
+            The masses of the particles, which set the total mass.
+
+        """
+        rng = np.random.default_rng(self._seed)
+        shape = phsp.positions.shape[:-1]
+        radii = self._radius * rng.random(shape)**(1. / 3.)
+        positions = radii[..., np.newaxis] * _isotropic(rng, shape)
+        velocities = rng.standard_normal(shape + (3, ))
+        _recenter(positions, velocities, masses)
+
+        # Without masses, every particle carries an equal share of one.
+        weights = 1. / shape[-1] if masses is None else masses
+        weights = np.broadcast_to(weights, shape)
+        speeds_sq = np.sum(velocities**2., axis=-1)
+        kinetic = 0.5 * np.sum(weights * speeds_sq, axis=-1, keepdims=True)
+        total_mass = _total_mass(phsp, masses)
+        target = 0.6 * self._virial_ratio * total_mass**2. / self._radius
+        # A single particle is at rest in the frame of its center of mass.
+        ratio = np.divide(target,
+                          kinetic,
+                          out=np.zeros_like(kinetic),
+                          where=kinetic > 0.)
+        velocities *= np.sqrt(ratio)[..., np.newaxis]
+
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
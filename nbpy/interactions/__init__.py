@@ -5,5 +5,7 @@ Defines the physical interactions available for a simulation.
 
 """
 
+from .barnes_hut import BarnesHut
 from .factory import Interactions
 from .inverse_square_law import InverseSquareLaw
+from .particle_mesh import ParticleMesh
@@ -0,0 +1,564 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.BarnesHut`.
+
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .interaction import Interaction
+
+
+class BarnesHut(Interaction):
+    """
+    The Barnes-Hut tree approximation to Newton's inverse-square law.
+
+    Particles are sorted along a Morton (Z-order) curve and grouped into an
+    octree whose nodes are stored in flat NumPy arrays. Small groups of nearby
+    particles walk the tree together: the monopole of a node is used if the
+    node is seen from the whole group under an angle smaller than the opening
+    angle, otherwise the node is opened. Leaves are summed directly. The cost
+    of a force evaluation is O(N log N).
+
+    Parameters
+    ----------
+
+    constant : float
+        The gravitational constant.
+
+    softening : float
+        The softening parameter.
+
+    opening_angle : float (default: 0.5)
+        The opening angle. A node of side ``s`` at distance ``d`` from a
+        particle is opened if ``s / d`` is not lower than this value. A
+        vanishing opening angle reproduces the direct sum of
+        :class:`.InverseSquareLaw`.
+
+    leaf_size : int (default: 8)
+        The maximum number of particles in a leaf of the tree.
+
+    max_depth : int (default: 20)
+        The maximum depth of the tree. Must not exceed 21.
+
+    Notes
+    -----
+
+    - The softening enters as in :class:`.InverseSquareLaw`, for both the
+      monopoles and the direct sums of the leaves.
+
+    """
+
+    def __init__(self,
+                 constant: float,
+                 softening: float,
+                 opening_angle: float = 0.5,
+                 leaf_size: int = 8,
+                 max_depth: int = 20):
+        if not 0 < max_depth <= _MAX_DEPTH:
+            raise ValueError(f"max_depth must lie in [1, {_MAX_DEPTH}].")
+        self._constant = constant
+        self._softening = softening
+        self._opening_angle = opening_angle
+        self._leaf_size = leaf_size
+        self._max_depth = max_depth
+
+    @classmethod
+    def name(cls) -> str:
+        """
+        The name of the class.
+
+        """
+        return cls.__name__
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'BarnesHut':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. Must contain keys ``"Constant"`` (float),
+            and ``"Softening"`` (float). May contain keys ``"OpeningAngle"``
+            (float), ``"LeafSize"`` (int) and ``"MaxDepth"`` (int).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        try:
+            return cls(params["Constant"],
+                       params["Softening"],
+                       opening_angle=params.get("OpeningAngle", 0.5),
+                       leaf_size=params.get("LeafSize", 8),
+                       max_depth=params.get("MaxDepth", 20))
+        except KeyError:
+            print(f"""KeyError in {cls.name()}:\n:
+            Keys expected: ['Constant', 'Softening'].
+            Keys passed:   {list(params.keys())}
+            """)
+            raise
+        except:
+            print(f"Unknown error when initializing {cls.name()} from dict.")
+            raise
+
+    @property
+    def constant(self) -> float:
+        """
+        The gravitational constant.
+
+        """
+        return self._constant
+
+    @property
+    def softening(self) -> float:
+        """
+        The softening parameter.
+
+        """
+        return self._softening
+
+    @property
+    def opening_angle(self) -> float:
+        """
+        The opening angle.
+
+        """
+        return self._opening_angle
+
+    @property
+    def leaf_size(self) -> int:
+        """
+        The maximum number of particles in a leaf.
+
+        """
+        return self._leaf_size
+
+    @property
+    def max_depth(self) -> int:
+        """
+        The maximum depth of the tree.
+
+        """
+        return self._max_depth
+
+    def scratch_bytes(self, N: int, _batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes of the tree of N particles and
+        of the separations summed in the leaves.
+
+        """
+        # The sorted copies of the particles and the node arrays, with about
+        # two nodes per leaf.
+        n_nodes = 2 * (N // self._leaf_size + 1)
+        tree = _PARTICLE_BYTES * N + _NODE_BYTES * n_nodes
+        return tree + _PAIR_BYTES * min(N * N, _MAX_PAIRS)
+
+    def exert(self, phsp: PhaseSpace, masses: npt.NDArray) -> None:
+        """
+        Set accelerations of all interacting particles using the Barnes-Hut
+        approximation to Newton's inverse-square law.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. Must contain a key
+            ``"Accelerations"``, whose value will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        """
+        tree = _Octree(phsp.positions, masses, self._leaf_size,
+                       self._max_depth)
+        groups = tree.groups(_GROUP_SIZE)
+        for start in range(0, groups.size, _GROUPS_PER_WALK):
+            chunk = groups[start:start + _GROUPS_PER_WALK]
+            members = tree.members(chunk)
+            phsp.accelerations[tree.order[members]] = self._accelerations(
+                tree, chunk)
+
+    def exert_on(self, phsp: PhaseSpace, masses: npt.NDArray,
+                 targets: npt.NDArray) -> None:
+        """
+        Set accelerations of the target particles due to all particles using
+        the Barnes-Hut approximation to Newton's inverse-square law.
+
+        The tree is built for all particles, at a cost O(N log N), but only the
+        groups holding targets walk it, at a cost O(N_targets log N).
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. The
+            accelerations of the targets will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        targets : numpy.typing.NDArray
+            The indices of the target particles.
+
+        """
+        tree = _Octree(phsp.positions, masses, self._leaf_size,
+                       self._max_depth)
+        is_target = np.zeros(tree.positions.shape[0], dtype=bool)
+        is_target[targets] = True
+        is_target = is_target[tree.order]
+
+        groups = tree.groups(_GROUP_SIZE)
+        starts = tree.nodes.start[groups]
+        groups = groups[np.logical_or.reduceat(is_target, starts)]
+        for start in range(0, groups.size, _GROUPS_PER_WALK):
+            chunk = groups[start:start + _GROUPS_PER_WALK]
+            members = tree.members(chunk)
+            selected = is_target[members]
+            phsp.accelerations[tree.order[members[selected]]] = (
+                self._accelerations(tree, chunk)[selected])
+
+    def _accelerations(self, tree: '_Octree',
+                       groups: npt.NDArray) -> npt.NDArray:
+        """
+        Return the accelerations of the members of the given groups.
+
+        """
+        targets, sources, source_masses = self._interaction_lists(
+            tree, groups, tree.radii(groups))
+
+        # Pad the particles and the interaction lists of every group to the
+        # largest ones, with massless sources.
+        counts = tree.nodes.count[groups]
+        rows = np.repeat(np.arange(groups.size), counts)
+        slots = _ranges(counts)
+        lengths = np.bincount(targets, minlength=groups.size)
+        order = np.argsort(targets, kind="stable")
+        source_slots = _ranges(lengths)
+
+        particles = np.zeros((groups.size, counts.max(), 3))
+        particles[rows, slots] = tree.positions[tree.members(groups)]
+        padded_sources = np.zeros((groups.size, lengths.max(), 3))
+        padded_sources[targets[order], source_slots] = sources[order]
+        padded_masses = np.zeros((groups.size, lengths.max()))
+        padded_masses[targets[order], source_slots] = source_masses[order]
+
+        accelerations = np.empty_like(particles)
+        step = max(1, _MAX_PAIRS // (particles.shape[1] * lengths.max()))
+        for start in range(0, groups.size, step):
+            block = slice(start, start + step)
+            accelerations[block] = self._sum(particles[block],
+                                             padded_sources[block],
+                                             padded_masses[block])
+        return accelerations[rows, slots]
+
+    def _interaction_lists(self, tree: '_Octree', groups: npt.NDArray,
+                           radii: npt.NDArray) -> tuple:
+        """
+        Walk the tree breadth-first for all given groups at once.
+
+        A node is approximated by its monopole only if the opening criterion
+        holds for the point of the group closest to the node, so that the
+        same interaction list is valid for all particles of the group.
+
+        Returns
+        -------
+
+        out : tuple
+            The local indices of the groups, and the positions and masses
+            of the corresponding sources.
+
+        """
+        group_ids = []
+        positions = []
+        masses = []
+
+        # Each entry of the frontier is a pair (group, node) still to be
+        # processed. Groups are indexed locally.
+        local = np.arange(groups.size)
+        nodes = np.zeros(groups.size, dtype=np.intp)
+
+        while local.size > 0:
+            targets = groups[local]
+            d = tree.com[nodes] - tree.com[targets]
+            distance = np.sqrt(np.einsum("ij,ij->i", d, d))
+
+            # A node containing the group cannot be approximated.
+            shift = tree.nodes.level[targets] - tree.nodes.level[nodes]
+            inside = (shift >= 0) & np.all(
+                tree.nodes.cell[targets] >> np.maximum(shift, 0)[:, np.newaxis]
+                == tree.nodes.cell[nodes],
+                axis=1)
+            accept = ~inside & (tree.side(nodes) < self._opening_angle *
+                                (distance - radii[local]))
+            leaf = tree.nodes.n_children[nodes] == 0
+
+            group_ids.append(local[accept])
+            positions.append(tree.com[nodes[accept]])
+            masses.append(tree.mass[nodes[accept]])
+
+            direct = nodes[~accept & leaf]
+            particles = tree.members(direct)
+            group_ids.append(
+                np.repeat(local[~accept & leaf], tree.nodes.count[direct]))
+            positions.append(tree.positions[particles])
+            masses.append(tree.masses[particles])
+
+            opened = ~accept & ~leaf
+            n_children = tree.nodes.n_children[nodes[opened]]
+            local = np.repeat(local[opened], n_children)
+            nodes = np.repeat(tree.nodes.first_child[nodes[opened]],
+                              n_children) + _ranges(n_children)
+
+        return (np.concatenate(group_ids), np.concatenate(positions),
+                np.concatenate(masses))
+
+    def _sum(self, particles: npt.NDArray, sources: npt.NDArray,
+             masses: npt.NDArray) -> npt.NDArray:
+        """
+        Return the accelerations of G groups of P particles due to G lists of
+        S sources, given as G-by-P-by-3, G-by-S-by-3 and G-by-S arrays.
+
+        """
+        # Index convention: d[g, p, s] = sources[g, s] - particles[g, p].
+        d = sources[:, np.newaxis, :, :] - particles[:, :, np.newaxis, :]
+        r_sq = np.einsum("gpsi,gpsi->gps", d, d)
+        r_sq += self._softening**2.
+
+        # Without softening, the separation of a particle from itself is zero.
+        weights = np.zeros_like(r_sq)
+        np.power(r_sq, -1.5, out=weights, where=r_sq > 0.)
+        weights *= masses[:, np.newaxis, :]
+        return np.einsum("gps,gpsi->gpi", weights, d)
+
+
+@dataclass
+class _Nodes:
+    """
+    The arrays of the nodes of an :class:`_Octree`, indexed by node.
+
+    Node ``n`` holds the particles ``start[n]:start[n] + count[n]`` in Morton
+    order, and has children ``first_child[n]:first_child[n] + n_children[n]``.
+    Its cell at its level is ``cell[n]``, in units of its side.
+
+    """
+    start: npt.NDArray
+    count: npt.NDArray
+    level: npt.NDArray
+    parent: npt.NDArray
+    first_child: npt.NDArray
+    n_children: npt.NDArray
+    cell: npt.NDArray
+
+
+class _Octree:
+    """
+    Array-backed octree of a set of particles sorted along a Morton curve.
+
+    The nodes are stored in the arrays of :attr:`nodes`, together with their
+    masses and centers of mass. The root is node 0.
+
+    """
+
+    def __init__(self, positions: npt.NDArray, masses: npt.NDArray,
+                 leaf_size: int, max_depth: int):
+        lower = positions.min(axis=0)
+        extent = float(np.max(positions.max(axis=0) - lower))
+        # Enlarge the root slightly so that no particle lies on its far faces.
+        self.root_side = extent * (1. + 1.e-10) if extent > 0. else 1.
+
+        resolution = 2**max_depth
+        cells = np.floor((positions - lower) / self.root_side * resolution)
+        cells = np.clip(cells, 0, resolution - 1).astype(np.int64)
+        keys = _morton_keys(cells)
+
+        self.order = np.argsort(keys, kind="stable")
+        self.positions = np.ascontiguousarray(positions[self.order])
+        self.masses = np.ascontiguousarray(masses[self.order])
+
+        self.nodes = _build_nodes(keys[self.order], cells[self.order],
+                                  leaf_size, max_depth)
+
+        # Sum over the contiguous ranges of particles of every node. A zero
+        # is appended so that ranges may end at N.
+        start = self.nodes.start
+        bounds = np.ravel(np.column_stack((start, start + self.nodes.count)))
+        weighted = np.vstack((np.column_stack(
+            (self.masses, self.masses[:, np.newaxis] * self.positions)),
+                              np.zeros(4)))
+        sums = np.add.reduceat(weighted, bounds, axis=0)[::2]
+        self.mass = sums[:, 0]
+        self.com = sums[:, 1:] / self.mass[:, np.newaxis]
+
+    def side(self, nodes: npt.NDArray) -> npt.NDArray:
+        """
+        Return the sides of the given nodes.
+
+        """
+        return self.root_side / 2.**self.nodes.level[nodes]
+
+    def members(self, nodes: npt.NDArray) -> npt.NDArray:
+        """
+        Return the concatenated indices in Morton order of the particles of
+        the given nodes.
+
+        """
+        counts = self.nodes.count[nodes]
+        return np.repeat(self.nodes.start[nodes], counts) + _ranges(counts)
+
+    def groups(self, size: int) -> npt.NDArray:
+        """
+        Return the largest nodes holding at most ``size`` particles, or leaves
+        if these hold more. The groups are sorted in Morton order and tile the
+        particles.
+
+        """
+        small = (self.nodes.count <= size) | (self.nodes.n_children == 0)
+        top = np.ones_like(small)
+        top[1:] = ~small[self.nodes.parent[1:]]
+        groups = np.flatnonzero(small & top)
+        return groups[np.argsort(self.nodes.start[groups])]
+
+    def radii(self, nodes: npt.NDArray) -> npt.NDArray:
+        """
+        Return the largest distance of the particles of each of the given
+        nodes to its center of mass.
+
+        """
+        counts = self.nodes.count[nodes]
+        distances = np.linalg.norm(self.positions[self.members(nodes)] -
+                                   np.repeat(self.com[nodes], counts, axis=0),
+                                   axis=1)
+        return np.maximum.reduceat(distances, np.cumsum(counts) - counts)
+
+
+# Maximum depth such that the Morton keys of three coordinates fit in 64 bits.
+_MAX_DEPTH = 21
+
+# Maximum number of particles of the groups walking the tree together.
+_GROUP_SIZE = 32
+
+# Number of groups walking the tree at the same time. Bounds the size of the
+# frontier of (group, node) pairs.
+_GROUPS_PER_WALK = 64
+
+# Maximum number of particle-source pairs evaluated in a single batch.
+_MAX_PAIRS = 2**20
+
+# Bytes per particle-source pair summed: the separation, the squared distance,
+# and the weight.
+_PAIR_BYTES = 40
+
+# Bytes per particle of the tree: the order, key, cell, position and mass.
+_PARTICLE_BYTES = 72
+
+# Bytes per node of the tree: the particle range, level, side, parent,
+# children, cell, mass, and center of mass.
+_NODE_BYTES = 112
+
+
+def _build_nodes(keys: npt.NDArray, cells: npt.NDArray, leaf_size: int,
+                 max_depth: int) -> _Nodes:
+    """
+    Return the nodes of the octree of the particles with the given Morton keys
+    and cells, sorted in Morton order.
+
+    """
+    N = keys.size
+    active = np.arange(N)
+    per_level: list = []
+    parents = np.zeros(0, dtype=np.intp)
+    n_nodes = 0
+
+    for level in range(max_depth + 1):
+        if active.size == 0:
+            break
+        prefix = keys[active] >> np.uint64(3 * (max_depth - level))
+        first = np.flatnonzero(
+            np.concatenate(([True], prefix[1:] != prefix[:-1])))
+        start = active[first]
+        count = np.diff(np.append(first, active.size))
+        is_leaf = (count <= leaf_size) | (level == max_depth)
+
+        if level > 0:
+            # Map the parent prefix of every node to the index of its parent
+            # among the internal nodes of the previous level.
+            parent_prefix = prefix[first] >> np.uint64(3)
+            parent = parents[np.searchsorted(per_level[-1]["prefix"],
+                                             parent_prefix)]
+        else:
+            parent = np.full(1, -1, dtype=np.intp)
+
+        per_level.append({
+            "prefix": prefix[first][~is_leaf],
+            "start": start,
+            "count": count,
+            "level": np.full(start.size, level),
+            "parent": parent,
+        })
+        parents = n_nodes + np.flatnonzero(~is_leaf)
+        n_nodes += start.size
+        active = active[np.repeat(~is_leaf, count)]
+
+    def _concatenate(key):
+        return np.concatenate([nodes[key] for nodes in per_level])
+
+    start = _concatenate("start")
+    level = _concatenate("level")
+    parent = _concatenate("parent")
+    return _Nodes(
+        start=start,
+        count=_concatenate("count"),
+        level=level,
+        parent=parent,
+        # Nodes are stored level by level in Morton order, hence their
+        # parents are sorted and the children of every node are contiguous.
+        first_child=1 + np.searchsorted(parent[1:], np.arange(n_nodes)),
+        n_children=np.bincount(parent[1:], minlength=n_nodes),
+        cell=cells[start] >> (max_depth - level)[:, np.newaxis])
+
+
+def _morton_keys(cells: npt.NDArray) -> npt.NDArray:
+    """
+    Return the Morton keys of the given N-by-3 array of integer cells.
+
+    """
+    keys = np.zeros(cells.shape[0], dtype=np.uint64)
+    for axis in range(3):
+        keys |= _spread_bits(cells[:, axis].astype(
+            np.uint64)) << np.uint64(2 - axis)
+    return keys
+
+
+def _spread_bits(value: npt.NDArray) -> npt.NDArray:
+    """
+    Insert two zero bits between each of the lowest 21 bits of the values.
+
+    """
+    for shift, mask in ((32, 0x1f00000000ffff), (16, 0x1f0000ff0000ff),
+                        (8, 0x100f00f00f00f00f), (4, 0x10c30c30c30c30c3),
+                        (2, 0x1249249249249249)):
+        value = (value | (value << np.uint64(shift))) & np.uint64(mask)
+    return value
+
+
+def _ranges(counts: npt.NDArray) -> npt.NDArray:
+    """
+    Return the concatenation of ``arange(c)`` for every ``c`` in ``counts``.
+
+    """
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(offsets.size) - offsets
@@ -7,8 +7,10 @@ Defines class :class:`.Interactions`.
 
 from typing import Type
 
+from .barnes_hut import BarnesHut
 from .interaction import Interaction
 from .inverse_square_law import InverseSquareLaw
+from .particle_mesh import ParticleMesh
 
 
 class Interactions:
@@ -24,7 +26,7 @@ class Interactions:
         Return a list of all available subtypes.
 
         """
-        return [InverseSquareLaw]
+        return [InverseSquareLaw, BarnesHut, ParticleMesh]
 
     @classmethod
     def typedict(cls) -> dict[str, Type[Interaction]]:
@@ -5,6 +5,7 @@ Defines class :class:`.Interaction`.
 
 """
 import abc
+from typing import Optional
 
 import numpy.typing as npt
 
@@ -33,9 +34,88 @@ class Interaction(metaclass=abc.ABCMeta):
 
         """
 
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """
+        Whether the accelerations of a batched phase space, holding several
+        independent systems, can be set. False by default.
+
+        """
+        return False
+
     @abc.abstractmethod
     def exert(self, phsp: PhaseSpace, masses: npt.NDArray) -> None:
         """
         Set the accelerations in terms of the phase space.
 
         """
+
+    def exert_with_jerks(self, phsp: PhaseSpace,
+                         masses: npt.NDArray) -> npt.NDArray:
+        """
+        Set the accelerations in terms of the phase space, and return the
+        jerks, i.e. the time derivatives of the accelerations.
+
+        The default implementation raises a ValueError. Subclasses that can
+        compute the jerks, as needed by :class:`.Hermite`, should override it.
+
+        """
+        raise ValueError(f"{self.name()} does not compute jerks.")
+
+    def scratch_bytes(self,
+                      _n_particles: int,
+                      _batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes of the temporaries of a force
+        evaluation of N particles, or of a batch of systems of N particles
+        each.
+
+        The default implementation ignores its arguments and returns zero.
+        Subclasses whose temporaries grow faster than the phase space should
+        override it.
+
+        """
+        return 0
+
+    @classmethod
+    def scratch_bytes_from_dict(cls,
+                                params: dict,
+                                n_particles: int,
+                                batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes returned by
+        :meth:`scratch_bytes` for an instance constructed from a dictionary of
+        parameters.
+
+        The default implementation constructs the instance. Subclasses whose
+        construction is expensive should override it.
+
+        """
+        return cls.from_dict(params).scratch_bytes(n_particles, batch)
+
+    def exert_on(self, phsp: PhaseSpace, masses: npt.NDArray,
+                 targets: npt.NDArray) -> None:
+        """
+        Set the accelerations of the target particles due to all particles,
+        leaving the accelerations of the other particles unchanged.
+
+        The default implementation computes the accelerations of all
+        particles. Subclasses should override it with a cheaper evaluation.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        targets : numpy.typing.NDArray
+            The indices of the target particles.
+
+        """
+        current = PhaseSpace(phsp.positions.shape[0])
+        current.set_positions(phsp.positions)
+        self.exert(current, masses)
+        phsp.accelerations[targets] = current.accelerations[targets]
@@ -4,6 +4,10 @@
 Defines class :class:`.InverseSquareLaw`.
 
 """
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
 import numpy.typing as npt
 
@@ -24,11 +28,79 @@ class InverseSquareLaw(Interaction):
     softening : float
         The softening parameter.
 
+    tile_size : int (default: None)
+        If given, the number of target particles per row block of the tiled
+        direct sum. Peak memory is then O(N * tile_size) instead of O(N^2).
+
+    memory_budget : float (default: None)
+        If given and ``tile_size`` is not, the approximate number of bytes the
+        scratch buffers of the tiled direct sum may use. The tile size is then
+        chosen automatically from the number of particles.
+
+    workers : int (default: 1)
+        The number of threads among which the row blocks of the tiled direct
+        sum are distributed. NumPy releases the GIL in the element-wise
+        operations and products that dominate the cost.
+
+    symmetric : bool (default: False)
+        Whether to evaluate each unordered pair of particles once, using
+        Newton's third law to obtain the contribution of the other particle of
+        the pair. This halves the pairwise work of the tiled direct sum.
+
+    precision : str (default: "double")
+        The floating-point precision of the pairwise terms, either
+        ``"single"`` or ``"double"``. Single precision halves the memory
+        traffic of the N-by-N temporaries and doubles the SIMD width, at the
+        cost of a relative error of about 1e-7 in the accelerations.
+
+    Notes
+    -----
+
+    - If neither ``tile_size`` nor ``memory_budget`` are given, a single
+      worker is used and ``symmetric`` is false, the accelerations are
+      computed in a single dense N-by-N pass.
+    - In the symmetric mode the particles are split into tiles, and only the
+      blocks on and above the diagonal of the N-by-N matrix of pairs are
+      computed. Peak memory is then O(tile_size^2).
+    - In single precision, positions are taken relative to their mean before
+      rounding. The pairwise terms, the masses, and the sums over the sources
+      are all in single precision, and only the resulting accelerations are
+      stored in double precision. The error of every component is then within
+      a few single-precision epsilons of the sum over the sources of
+      m_k (|d_jk| + R) / (d_jk^2 + softening^2)^(3/2), where R is the largest
+      distance of a particle from the mean position.
+    - The scratch buffers of the tiled direct sum are allocated on the first
+      call to :meth:`exert` and reused as long as the number of particles does
+      not change. Each worker owns its buffers, and the memory budget is shared
+      among the workers.
+    - For a batched phase space of B systems, all systems are evaluated with
+      dense pairwise arrays of shape (b, N, N), in groups of b systems that
+      fit in the memory budget (1 MiB by default, to stay in cache). Groups
+      are distributed among the workers, and the tiled and symmetric modes
+      are not used.
+
     """
 
-    def __init__(self, constant: float, softening: float):
+    def __init__(self,
+                 constant: float,
+                 softening: float,
+                 tile_size: Optional[int] = None,
+                 memory_budget: Optional[float] = None,
+                 workers: int = 1,
+                 symmetric: bool = False,
+                 precision: str = "double"):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        if precision not in _DTYPES:
+            raise ValueError(
+                f"precision must be one of {list(_DTYPES.keys())}.")
         self._constant = constant
         self._softening = softening
+        self._tiling = _Tiling(tile_size, memory_budget, symmetric)
+        self._workers = workers
+        self._precision = precision
+        self._workspace: dict = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     @classmethod
     def name(cls) -> str:
@@ -38,6 +110,14 @@ class InverseSquareLaw(Interaction):
         """
         return cls.__name__
 
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """
+        Whether the accelerations of a batched phase space can be set.
+
+        """
+        return True
+
     @classmethod
     def from_dict(cls, params: dict) -> 'InverseSquareLaw':
         """
@@ -48,7 +128,9 @@ class InverseSquareLaw(Interaction):
 
         params : dict
             The dictionary. Must contain keys ``"Constant"`` (float),
-            and ``"Softening"`` (float).
+            and ``"Softening"`` (float). May contain keys ``"TileSize"``
+            (int), ``"MemoryBudget"`` (float, in bytes), ``"Workers"``
+            (int), ``"Symmetric"`` (bool) and ``"Precision"`` (str).
 
         Returns
         -------
@@ -58,7 +140,13 @@ class InverseSquareLaw(Interaction):
 
         """
         try:
-            return cls(params["Constant"], params["Softening"])
+            return cls(params["Constant"],
+                       params["Softening"],
+                       tile_size=params.get("TileSize"),
+                       memory_budget=params.get("MemoryBudget"),
+                       workers=params.get("Workers", 1),
+                       symmetric=params.get("Symmetric", False),
+                       precision=params.get("Precision", "double"))
         except KeyError:
             print(f"""KeyError in {cls.name()}:\n:
             Keys expected: ['Constant', 'Softening'].
@@ -85,6 +173,90 @@ class InverseSquareLaw(Interaction):
         """
         return self._softening
 
+    @property
+    def tile_size(self) -> Optional[int]:
+        """
+        The number of target particles per row block, if set explicitly.
+
+        """
+        return self._tiling.tile_size
+
+    @property
+    def memory_budget(self) -> Optional[float]:
+        """
+        The memory budget in bytes of the tiled direct sum, if set.
+
+        """
+        return self._tiling.memory_budget
+
+    @property
+    def workers(self) -> int:
+        """
+        The number of threads used to compute the accelerations.
+
+        """
+        return self._workers
+
+    @property
+    def symmetric(self) -> bool:
+        """
+        Whether each unordered pair of particles is evaluated once.
+
+        """
+        return self._tiling.symmetric
+
+    @property
+    def precision(self) -> str:
+        """
+        The floating-point precision of the pairwise terms.
+
+        """
+        return self._precision
+
+    @property
+    def _dtype(self) -> type:
+        # The floating-point type of the pairwise terms.
+        return _DTYPES[self._precision]
+
+    def tile_size_for(self, N: int) -> Optional[int]:
+        """
+        Return the number of particles per tile used for a system of N
+        particles, or ``None`` if the dense N-by-N pass is used.
+
+        """
+        tiling = self._tiling
+        if tiling.tile_size is not None:
+            return max(1, min(int(tiling.tile_size), N))
+        if tiling.memory_budget is not None:
+            # Buffer entries per worker, of a tile of rows by N columns, or of
+            # a tile of rows by a tile of columns in the symmetric mode.
+            itemsize = np.dtype(self._dtype).itemsize
+            entries = tiling.memory_budget / (self._workers *
+                                              _BUFFERS_PER_ROW * itemsize)
+            rows = np.sqrt(entries) if tiling.symmetric else entries / N
+            return max(1, min(int(rows), N))
+        if self._workers > 1 or tiling.symmetric:
+            return min(_DEFAULT_TILE_SIZE, -(-N // self._workers))
+        return None
+
+    def scratch_bytes(self, N: int, batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes of the pairwise temporaries of
+        a force evaluation of N particles, or of a batch of systems of N
+        particles each.
+
+        """
+        itemsize = np.dtype(self._dtype).itemsize
+        if batch is not None:
+            systems = self._systems_per_group(batch, N)
+            return self._workers * systems * _BUFFERS_PER_ROW * N * N * itemsize
+
+        tile = self.tile_size_for(N)
+        if tile is None:
+            return _DENSE_BUFFERS * N * N * itemsize
+        columns = tile if self._tiling.symmetric else N
+        return self._workers * _BUFFERS_PER_ROW * tile * columns * itemsize
+
     def exert(self, phsp: PhaseSpace, masses: npt.NDArray) -> None:
         """
         Set accelerations of all interacting particles using Newton's
@@ -99,13 +271,29 @@ class InverseSquareLaw(Interaction):
             function.
 
         masses : numpy.typing.NDArray
-            N-by-1 array containing the masses of all N particles.
+            N-by-1 array containing the masses of all N particles. For a
+            batched phase space, it may also be a B-by-N array holding the
+            masses of every system.
 
         """
+        positions, masses = self._cast(phsp.positions, masses)
+        if phsp.batch is not None:
+            self._exert_batched(phsp, positions, masses)
+            return
+
+        N = phsp.positions.shape[0]
+        tile = self.tile_size_for(N)
+        if tile is not None and self._tiling.symmetric:
+            self._exert_symmetric(phsp, positions, masses, tile)
+            return
+        if tile is not None:
+            self._exert_tiled(phsp, positions, masses, tile)
+            return
+
         # `x` stores x coordinates of all particles, and similarly for y and z.
-        x = phsp.positions[:, 0:1]
-        y = phsp.positions[:, 1:2]
-        z = phsp.positions[:, 2:3]
+        x = positions[:, 0:1]
+        y = positions[:, 1:2]
+        z = positions[:, 2:3]
 
         # Index convention: d_x[j, k] = x[k] - x[j], and similarly for y and z.
         d_x = x.T - x
@@ -118,3 +306,376 @@ class InverseSquareLaw(Interaction):
         phsp.accelerations[:, 0] = np.matmul(d_x * inv_d_cube, masses)
         phsp.accelerations[:, 1] = np.matmul(d_y * inv_d_cube, masses)
         phsp.accelerations[:, 2] = np.matmul(d_z * inv_d_cube, masses)
+
+    def _cast(self, positions: npt.NDArray, masses: npt.NDArray) -> tuple:
+        if self._dtype == np.float64:
+            return positions, masses
+        # Rounding relative to the mean preserves the small separations.
+        mean = np.mean(positions, axis=-2, keepdims=True)
+        positions = (positions - mean).astype(self._dtype)
+        return positions, masses.astype(self._dtype)
+
+    def _exert_batched(self, phsp: PhaseSpace, positions: npt.NDArray,
+                       masses: npt.NDArray) -> None:
+        n_systems, N = positions.shape[:2]
+        masses = np.broadcast_to(masses, (n_systems, N))
+        systems = self._systems_per_group(n_systems, N)
+
+        def _exert_systems(first: int, last: int) -> None:
+            for start in range(first, last, systems):
+                stop = min(start + systems, last)
+
+                # As in the dense pass, d_x[b, j, k] = x[b, k] - x[b, j], and
+                # similarly for y and z.
+                x = positions[start:stop, :, 0]
+                y = positions[start:stop, :, 1]
+                z = positions[start:stop, :, 2]
+                d_x = x[:, np.newaxis, :] - x[:, :, np.newaxis]
+                d_y = y[:, np.newaxis, :] - y[:, :, np.newaxis]
+                d_z = z[:, np.newaxis, :] - z[:, :, np.newaxis]
+
+                inv_d_cube = d_x * d_x
+                inv_d_cube += d_y * d_y
+                inv_d_cube += d_z * d_z
+                inv_d_cube += self._softening**2.
+                np.power(inv_d_cube, -1.5, out=inv_d_cube)
+
+                weights = masses[start:stop, :, np.newaxis]
+                accelerations = phsp.accelerations[start:stop]
+                for axis, diff in enumerate((d_x, d_y, d_z)):
+                    diff *= inv_d_cube
+                    accelerations[..., axis] = np.matmul(diff, weights)[..., 0]
+
+        if self._workers == 1:
+            _exert_systems(0, n_systems)
+            return
+
+        # Each worker takes a contiguous slab of whole groups of systems.
+        bounds = self._slab_bounds(n_systems, systems)
+        self._run(_exert_systems, [(bounds[worker], bounds[worker + 1])
+                                   for worker in range(self._workers)])
+
+    def _systems_per_group(self, n_systems: int, N: int) -> int:
+        # Number of systems whose pairwise arrays fit in the memory budget.
+        budget = self._tiling.memory_budget or _DEFAULT_BATCH_BYTES
+        systems = int(budget / (self._workers * _BUFFERS_PER_ROW * N * N *
+                                np.dtype(self._dtype).itemsize))
+        return max(1, min(systems, -(-n_systems // self._workers)))
+
+    def exert_on(self, phsp: PhaseSpace, masses: npt.NDArray,
+                 targets: npt.NDArray) -> None:
+        """
+        Set accelerations of the target particles due to all particles using
+        Newton's inverse-square law, at a cost O(N_targets * N).
+
+        The targets are processed in row blocks as in the tiled direct sum,
+        also when the symmetric mode is enabled.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. The
+            accelerations of the targets will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        targets : numpy.typing.NDArray
+            The indices of the target particles.
+
+        """
+        N = phsp.positions.shape[0]
+        positions, masses = self._cast(phsp.positions, masses)
+        tile = self.tile_size_for(N) or min(_DEFAULT_TILE_SIZE, N)
+        self._exert_tiled(phsp, positions, masses, tile, np.asarray(targets))
+
+    def exert_with_jerks(self, phsp: PhaseSpace,
+                         masses: npt.NDArray) -> npt.NDArray:
+        """
+        Set accelerations of all particles as in :meth:`exert`, and return
+        their jerks, i.e. the time derivatives of the accelerations.
+
+        The pairs are processed in row blocks as in the tiled direct sum, and
+        the symmetric mode is not used.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. Must contain a key
+            ``"Accelerations"``, whose value will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        Returns
+        -------
+
+        out : numpy.typing.NDArray
+            N-by-3 array with the jerks of all particles.
+
+        Raises
+        ------
+
+        ValueError
+            If the phase space is batched.
+
+        """
+        if phsp.batch is not None:
+            raise ValueError(
+                "Jerks of a batched phase space are not supported.")
+
+        N = phsp.positions.shape[0]
+        positions, masses = self._cast(phsp.positions, masses)
+        velocities = phsp.velocities
+        if self._dtype != np.float64:
+            velocities = velocities - np.mean(velocities, axis=0)
+        velocities = velocities.astype(self._dtype)
+        tile = self.tile_size_for(N) or N
+
+        # As in the tiled direct sum, sources are stored coordinate-major.
+        sources = np.ascontiguousarray(positions.T)
+        source_velocities = np.ascontiguousarray(velocities.T)
+        jerks = np.empty((N, 3))
+
+        def _jerk_rows(first: int, last: int) -> None:
+            for start in range(first, last, tile):
+                rows = slice(start, min(start + tile, last))
+                phsp.accelerations[rows], jerks[rows] = _jerks_block(
+                    positions[rows], velocities[rows], sources,
+                    source_velocities, masses, self._softening**2.)
+
+        if self._workers == 1:
+            _jerk_rows(0, N)
+        else:
+            bounds = self._slab_bounds(N, tile)
+            self._run(_jerk_rows, [(bounds[worker], bounds[worker + 1])
+                                   for worker in range(self._workers)])
+        return jerks
+
+    def _exert_tiled(self,
+                     phsp: PhaseSpace,
+                     positions: npt.NDArray,
+                     masses: npt.NDArray,
+                     tile: int,
+                     targets: Optional[npt.NDArray] = None) -> None:
+        N = positions.shape[0]
+        n_targets = N if targets is None else targets.size
+
+        # Sources are stored coordinate-major so that each row block is a
+        # broadcast of contiguous rows.
+        sources = np.ascontiguousarray(positions.T)
+        buffers = self._buffers(tile, N)
+
+        def _exert_rows(worker: int, first: int, last: int) -> None:
+            if buffers[worker] is None:
+                buffers[worker] = (np.empty((3, tile, N), dtype=self._dtype),
+                                   np.empty((tile, N), dtype=self._dtype))
+            diff, inv_d_cube = buffers[worker]
+            for start in range(first, last, tile):
+                stop = min(start + tile, last)
+                # A contiguous range of particles, or of indices of targets.
+                block = slice(start, stop)
+                rows = block if targets is None else targets[block]
+                phsp.accelerations[rows] = _accelerations_block(
+                    positions[rows], sources, masses, self._softening**2.,
+                    diff[:, :stop - start], inv_d_cube[:stop - start])
+
+        if self._workers == 1:
+            _exert_rows(0, 0, n_targets)
+            return
+
+        # Each worker takes a contiguous slab of whole row blocks.
+        bounds = self._slab_bounds(n_targets, tile)
+        self._run(_exert_rows, [(worker, bounds[worker], bounds[worker + 1])
+                                for worker in range(self._workers)])
+
+    def _exert_symmetric(self, phsp: PhaseSpace, positions: npt.NDArray,
+                         masses: npt.NDArray, tile: int) -> None:
+        N = positions.shape[0]
+        sources = np.ascontiguousarray(positions.T)
+        buffers = self._buffers(tile, tile)
+
+        # Blocks (rows, columns) on and above the diagonal.
+        starts = range(0, N, tile)
+        blocks = [(slice(i, i + tile), slice(j, j + tile)) for i in starts
+                  for j in starts if j >= i]
+
+        def _exert_blocks(worker: int, accelerations: npt.NDArray) -> None:
+            if buffers[worker] is None:
+                buffers[worker] = (np.empty((3, tile, tile),
+                                            dtype=self._dtype),
+                                   np.empty((tile, tile), dtype=self._dtype))
+            diff, inv_d_cube = buffers[worker]
+            for rows, columns in blocks[worker::self._workers]:
+                n_rows = positions[rows].shape[0]
+                n_columns = positions[columns].shape[0]
+                block = diff[:, :n_rows, :n_columns]
+                _pair_block(positions[rows], sources[:, columns],
+                            self._softening**2., block,
+                            inv_d_cube[:n_rows, :n_columns])
+
+                accelerations[rows] += np.matmul(block, masses[columns]).T
+                # Equal and opposite contributions on the column particles.
+                if rows != columns:
+                    accelerations[columns] -= np.matmul(masses[rows], block).T
+
+        if self._workers == 1:
+            phsp.accelerations[:] = 0.
+            _exert_blocks(0, phsp.accelerations)
+            return
+
+        # Each worker accumulates its blocks separately.
+        partial = [np.zeros((N, 3)) for _ in range(self._workers)]
+        self._run(_exert_blocks, [(worker, partial[worker])
+                                  for worker in range(self._workers)])
+        phsp.set_accelerations(np.sum(partial, axis=0))
+
+    def _run(self, function, arguments: list) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        futures = [
+            self._executor.submit(function, *args) for args in arguments
+        ]
+        for future in futures:
+            future.result()
+
+    def _slab_bounds(self, n: int, block: int) -> list:
+        # Bounds of contiguous slabs of whole blocks, one slab per worker.
+        n_blocks = -(-n // block)
+        return [
+            min(n, block * (n_blocks * worker // self._workers))
+            for worker in range(self._workers + 1)
+        ]
+
+    def _buffers(self, tile: int, columns: int) -> list:
+        # One slot per worker, filled by the worker itself on first use.
+        key = (tile, columns)
+        if key not in self._workspace:
+            self._workspace.clear()
+            self._workspace[key] = [None] * self._workers
+        return self._workspace[key]
+
+
+@dataclass(frozen=True)
+class _Tiling:
+    """
+    The options of the tiled direct sum of :class:`InverseSquareLaw`.
+
+    """
+    tile_size: Optional[int]
+    memory_budget: Optional[float]
+    symmetric: bool
+
+
+# Number of N-long float rows held in scratch per target particle: the three
+# coordinate differences plus the inverse distance cube.
+_BUFFERS_PER_ROW = 4
+
+# Number of N-by-N arrays alive at the peak of the dense pass.
+_DENSE_BUFFERS = 6
+
+# Floating-point types of the pairwise terms for each precision.
+_DTYPES = {"single": np.float32, "double": np.float64}
+
+# Tile size used by multiple workers when neither a tile size nor a memory
+# budget are given.
+_DEFAULT_TILE_SIZE = 128
+
+# Memory in bytes of the pairwise arrays of a batched phase space when no
+# memory budget is given.
+_DEFAULT_BATCH_BYTES = 2**20
+
+
+def _accelerations_block(targets: npt.NDArray, sources: npt.NDArray,
+                         masses: npt.NDArray, softening_sq: float,
+                         diff: npt.NDArray,
+                         inv_d_cube: npt.NDArray) -> npt.NDArray:
+    """
+    Return the accelerations of a block of targets due to all sources.
+
+    Parameters
+    ----------
+
+    targets : numpy.typing.NDArray
+        B-by-3 array with the positions of the B target particles.
+
+    sources : numpy.typing.NDArray
+        3-by-N array with the positions of the N source particles.
+
+    masses : numpy.typing.NDArray
+        N-dimensional array with the masses of the sources.
+
+    softening_sq : float
+        The square of the softening parameter.
+
+    diff : numpy.typing.NDArray
+        3-by-B-by-N scratch buffer, overwritten by this function.
+
+    inv_d_cube : numpy.typing.NDArray
+        B-by-N scratch buffer, overwritten by this function.
+
+    Returns
+    -------
+
+    out : numpy.typing.NDArray
+        B-by-3 array with the accelerations of the targets.
+
+    """
+    _pair_block(targets, sources, softening_sq, diff, inv_d_cube)
+    return np.matmul(diff, masses).T
+
+
+def _pair_block(targets: npt.NDArray, sources: npt.NDArray,
+                softening_sq: float, diff: npt.NDArray,
+                inv_d_cube: npt.NDArray) -> None:
+    """
+    Set ``diff`` to the softened pairwise separations over distance cubed of a
+    block of B targets and a block of S sources, with the arguments laid out as
+    in :func:`_accelerations_block`.
+
+    """
+    # Index convention: diff[i, j, k] = sources[i, k] - targets[j, i].
+    np.subtract(sources[:, np.newaxis, :],
+                targets.T[:, :, np.newaxis],
+                out=diff)
+
+    np.einsum("ijk,ijk->jk", diff, diff, out=inv_d_cube)
+    inv_d_cube += softening_sq
+    np.power(inv_d_cube, -1.5, out=inv_d_cube)
+
+    np.multiply(diff, inv_d_cube, out=diff)
+
+
+def _jerks_block(targets: npt.NDArray, target_velocities: npt.NDArray,
+                 sources: npt.NDArray, source_velocities: npt.NDArray,
+                 masses: npt.NDArray, softening_sq: float) -> tuple:
+    """
+    Return the accelerations and jerks of a block of B targets due to all N
+    sources, with the positions and velocities of the targets given as B-by-3
+    arrays and those of the sources as 3-by-N arrays.
+
+    """
+    # Index convention: diff[i, j, k] = sources[i, k] - targets[j, i], and
+    # similarly for the velocities.
+    diff = sources[:, np.newaxis, :] - targets.T[:, :, np.newaxis]
+    diff_v = (source_velocities[:, np.newaxis, :] -
+              target_velocities.T[:, :, np.newaxis])
+
+    inv_d_sq = np.einsum("ijk,ijk->jk", diff, diff)
+    inv_d_sq += softening_sq
+    np.reciprocal(inv_d_sq, out=inv_d_sq)
+    inv_d_cube = inv_d_sq * np.sqrt(inv_d_sq)
+
+    # The jerk of a pair is (dv - 3 (d . dv) d / d^2) / d^3.
+    rate = np.einsum("ijk,ijk->jk", diff, diff_v)
+    rate *= inv_d_sq
+    rate *= -3.
+
+    diff *= inv_d_cube
+    diff_v *= inv_d_cube
+    diff_v += rate * diff
+    return np.matmul(diff, masses).T, np.matmul(diff_v, masses).T
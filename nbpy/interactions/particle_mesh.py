@@ -0,0 +1,275 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.ParticleMesh`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.particles import PhaseSpace
+from .interaction import Interaction
+
+
+class ParticleMesh(Interaction):
+    """
+    Newton's gravity solved on a periodic mesh with the particle-mesh method.
+
+    The masses are deposited on a cubic grid with the cloud-in-cell (CIC)
+    scheme, Poisson's equation is solved with fast Fourier transforms, and the
+    accelerations are interpolated back to the particles with the same CIC
+    weights. A force evaluation costs O(N + M log M), where M is the number of
+    grid cells.
+
+    Parameters
+    ----------
+
+    constant : float
+        The gravitational constant.
+
+    grid_size : int
+        The number of cells along each side of the grid.
+
+    box_size : float
+        The side of the periodic box, centered at the origin.
+
+    Notes
+    -----
+
+    - The accelerations are normalized as those of :class:`.InverseSquareLaw`,
+      with which they agree for separations of a few cells that are small
+      compared to the box.
+    - Particles outside the box interact with the periodic images of those
+      inside. Forces are smoothed on the scale of a cell, so no softening
+      parameter is needed.
+    - Poisson's equation is discretized with the 7-point Laplacian and the
+      gradient with central differences, which avoids ringing near the
+      particles. The deposit and interpolation use the same weights, so the
+      total momentum is conserved.
+
+    """
+
+    def __init__(self, constant: float, grid_size: int, box_size: float):
+        self._constant = constant
+        self._grid_size = grid_size
+        self._box_size = box_size
+
+        # Fourier transform of the gradient of the Green's function of the
+        # discrete 7-point Laplacian, using second-order central differences.
+        # The mean mode is removed.
+        h = box_size / grid_size
+        k = 2. * np.pi * np.fft.fftfreq(grid_size, d=h)
+        k_last = 2. * np.pi * np.fft.rfftfreq(grid_size, d=h)
+        k_x, k_y, k_z = np.meshgrid(k, k, k_last, indexing="ij")
+        laplacian = -(2. / h)**2. * (np.sin(0.5 * k_x * h)**2. + np.sin(
+            0.5 * k_y * h)**2. + np.sin(0.5 * k_z * h)**2.)
+        laplacian[0, 0, 0] = 1.
+        self._kernel = [
+            -1.j * np.sin(k_i * h) / h / laplacian for k_i in (k_x, k_y, k_z)
+        ]
+
+    @classmethod
+    def name(cls) -> str:
+        """
+        The name of the class.
+
+        """
+        return cls.__name__
+
+    @classmethod
+    def from_dict(cls, params: dict) -> 'ParticleMesh':
+        """
+        Construct an instance from a dictionary of parameters.
+
+        Parameters
+        ----------
+
+        params : dict
+            The dictionary. Must contain keys ``"Constant"`` (float),
+            ``"GridSize"`` (int), and ``"BoxSize"`` (float).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        try:
+            return cls(params["Constant"], params["GridSize"],
+                       params["BoxSize"])
+        except KeyError:
+            print(f"""KeyError in {cls.name()}:\n:
+            Keys expected: ['Constant', 'GridSize', 'BoxSize'].
+            Keys passed:   {list(params.keys())}
+            """)
+            raise
+        except:
+            print(f"Unknown error when initializing {cls.name()} from dict.")
+            raise
+
+    @property
+    def constant(self) -> float:
+        """
+        The gravitational constant.
+
+        """
+        return self._constant
+
+    @property
+    def grid_size(self) -> int:
+        """
+        The number of cells along each side of the grid.
+
+        """
+        return self._grid_size
+
+    @property
+    def box_size(self) -> float:
+        """
+        The side of the periodic box.
+
+        """
+        return self._box_size
+
+    def scratch_bytes(self, N: int, _batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes of the kernels, of the meshes
+        of a force evaluation, and of the cloud-in-cell weights of N
+        particles.
+
+        """
+        return _mesh_bytes(self._grid_size, N)
+
+    @classmethod
+    def scratch_bytes_from_dict(cls,
+                                params: dict,
+                                n_particles: int,
+                                batch: Optional[int] = None) -> int:
+        """
+        Return the approximate number of bytes returned by
+        :meth:`scratch_bytes`, without computing the kernels.
+
+        """
+        return _mesh_bytes(params["GridSize"], n_particles)
+
+    def exert(self, phsp: PhaseSpace, masses: npt.NDArray) -> None:
+        """
+        Set accelerations of all interacting particles by solving Poisson's
+        equation on the mesh.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. Must contain a key
+            ``"Accelerations"``, whose value will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        """
+        cells, weights = self._cloud_in_cell(phsp.positions)
+        for axis, field in enumerate(self._fields(cells, weights, masses)):
+            phsp.accelerations[:, axis] = np.sum(weights * field[cells],
+                                                 axis=0)
+
+    def exert_on(self, phsp: PhaseSpace, masses: npt.NDArray,
+                 targets: npt.NDArray) -> None:
+        """
+        Set accelerations of the target particles due to all particles by
+        solving Poisson's equation on the mesh.
+
+        The mesh is solved for all particles, but the accelerations are
+        interpolated only to the targets.
+
+        Parameters
+        ----------
+
+        phsp : :class:`.PhaseSpace`
+            The object representing the system's phase space. The
+            accelerations of the targets will be set to new values by this
+            function.
+
+        masses : numpy.typing.NDArray
+            N-by-1 array containing the masses of all N particles.
+
+        targets : numpy.typing.NDArray
+            The indices of the target particles.
+
+        """
+        cells, weights = self._cloud_in_cell(phsp.positions)
+        for axis, field in enumerate(self._fields(cells, weights, masses)):
+            phsp.accelerations[targets, axis] = np.sum(
+                weights[:, targets] * field[cells[:, targets]], axis=0)
+
+    def _fields(self, cells: npt.NDArray, weights: npt.NDArray,
+                masses: npt.NDArray) -> list:
+        """
+        Return the three components of the acceleration on the flattened mesh,
+        given the CIC cells and weights of the particles.
+
+        """
+        mesh_size = self._grid_size
+        cell_volume = (self._box_size / mesh_size)**3.
+        density = np.zeros(mesh_size**3)
+        for corner in range(8):
+            density += np.bincount(cells[corner],
+                                   weights=masses * weights[corner],
+                                   minlength=mesh_size**3)
+        shape = (mesh_size, mesh_size, mesh_size)
+        density_k = np.fft.rfftn(density.reshape(shape) / cell_volume)
+
+        # From Poisson's equation, the acceleration is 4 pi i k rho / k^2 in
+        # the continuum limit.
+        return [
+            np.fft.irfftn(4. * np.pi * kernel * density_k,
+                          s=shape,
+                          axes=(0, 1, 2)).ravel() for kernel in self._kernel
+        ]
+
+    def _cloud_in_cell(self, positions: npt.NDArray) -> tuple:
+        """
+        Return the flat indices of the eight cells closest to each particle,
+        and the corresponding CIC weights, as 8-by-N arrays.
+
+        """
+        mesh_size = self._grid_size
+        shape = (mesh_size, mesh_size, mesh_size)
+
+        # Coordinates in units of cells, with cell centers at integers.
+        cells_per_length = mesh_size / self._box_size
+        scaled = (positions + 0.5 * self._box_size) * cells_per_length - 0.5
+        lower = np.floor(scaled)
+        fraction = scaled - lower
+        lower = lower.astype(np.int64)
+
+        cells = np.empty((8, positions.shape[0]), dtype=np.int64)
+        weights = np.empty((8, positions.shape[0]))
+        for corner in range(8):
+            offset = np.array([(corner >> 2) & 1, (corner >> 1) & 1,
+                               corner & 1])
+            index = np.mod(lower + offset, mesh_size)
+            cells[corner] = np.ravel_multi_index(index.T, shape)
+            weights[corner] = np.prod(np.where(offset, fraction,
+                                               1. - fraction),
+                                      axis=1)
+        return cells, weights
+
+
+def _mesh_bytes(grid_size: int, N: int) -> int:
+    """
+    Return the approximate number of bytes of the three complex kernels, the
+    real and complex meshes alive at the peak of a force evaluation, and the
+    eight cell indices and weights of each of N particles.
+
+    """
+    real = grid_size**3
+    half_complex = grid_size**2 * (grid_size // 2 + 1)
+    # The density and the three fields, the density and one product in
+    # Fourier space, and the three kernels.
+    return 8 * 4 * real + 16 * (2 + 3) * half_complex + 8 * 2 * 8 * N
@@ -5,6 +5,13 @@ Defines functions related to Input/Output operations.
 
 """
 
+from .async_snapshot_writer import *
+from .checkpoint import *
 from .input_from_yaml import *
+from .observer import *
 from .plot import *
+from .quantization import *
+from .snapshot_reader import *
+from .snapshot_writer import *
 from .write_snapshot_to_disk import *
+from .writer import *
@@ -0,0 +1,190 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.AsyncSnapshotWriter`.
+
+"""
+
+import queue
+import threading
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import Time
+from .snapshot_writer import _DEFAULT_FIELDS, SnapshotWriter
+
+
+class AsyncSnapshotWriter:
+    """
+    Writes snapshots with a :class:`.SnapshotWriter` in a background thread.
+
+    A copy of every snapshot is handed to a bounded queue that is consumed by
+    the writer thread, so that the evolution continues while the data is
+    written to disk. When the queue is full, :meth:`write` blocks until the
+    writer thread catches up.
+
+    Parameters
+    ----------
+
+    writer : :class:`.SnapshotWriter`
+        The writer to which the snapshots are passed. It is closed by
+        :meth:`close`.
+
+    queue_size : int (default: 8)
+        The maximum number of snapshots waiting to be written.
+
+    Notes
+    -----
+
+    - The writer may be used as a context manager, which writes the pending
+      snapshots and closes the file on exit.
+    - An exception raised in the writer thread is raised again by the next
+      call to :meth:`write`, :meth:`flush`, or :meth:`close`.
+
+    """
+
+    def __init__(self, writer: SnapshotWriter, queue_size: int = 8):
+        if queue_size < 1:
+            raise ValueError(
+                f"queue_size must be positive. Value passed: {queue_size}.")
+
+        self._writer = writer
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_dict(cls,
+                  options: dict,
+                  n_particles: int,
+                  capacity: int = 1,
+                  fields: tuple = _DEFAULT_FIELDS,
+                  resume_after: Optional[int] = None) -> 'AsyncSnapshotWriter':
+        """
+        Construct an instance from a dictionary of options.
+
+        Parameters
+        ----------
+
+        options : dict
+            The dictionary. Must contain the keys required by
+            :meth:`.SnapshotWriter.from_dict`, and optionally ``"QueueSize"``
+            (int).
+
+        n_particles : int
+            The number of particles.
+
+        capacity : int (default: 1)
+            The number of snapshots for which space is preallocated.
+
+        fields : tuple (default: ("Positions", ))
+            The names of the fields written in every snapshot.
+
+        resume_after : int (default: None)
+            If given, append to an existing group after dropping the
+            snapshots with time IDs larger than the given one.
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(SnapshotWriter.from_dict(options, n_particles, capacity,
+                                            fields, resume_after),
+                   queue_size=options.get("QueueSize", 8))
+
+    @property
+    def path(self) -> str:
+        """
+        The absolute path to the file.
+
+        """
+        return self._writer.path
+
+    def write(self, data: dict, time: Time) -> None:
+        """
+        Queue a copy of the given fields to be written at the given time.
+
+        Parameters
+        ----------
+
+        data : dict
+            The N-by-3 array of every field, keyed by the field names.
+
+        time : :class:`.Time`
+            The object representing the time of observation.
+
+        """
+        self._raise_error()
+        copies = {field: np.copy(value) for field, value in data.items()}
+        self._queue.put((self._writer.write, (copies, time)))
+
+    def write_constant(self, name: str, data: npt.NDArray) -> None:
+        """
+        Queue a copy of data that does not change during the run, such as the
+        masses.
+
+        Parameters
+        ----------
+
+        name : str
+            The name of the dataset.
+
+        data : numpy.typing.NDArray
+            The data to write.
+
+        """
+        self._raise_error()
+        self._queue.put((self._writer.write_constant, (name, np.copy(data))))
+
+    def flush(self) -> None:
+        """
+        Wait for the pending snapshots to be written and flush them to disk.
+
+        """
+        if self._thread.is_alive():
+            self._queue.put((self._writer.flush, ()))
+            self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Wait for the pending snapshots to be written and close the file.
+
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            self._writer.close()
+        self._raise_error()
+
+    def _consume(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            # After an error, the remaining snapshots are discarded so that
+            # the main thread is never blocked.
+            if self._error is None:
+                function, arguments = item
+                try:
+                    function(*arguments)
+                except Exception as err:  # pylint: disable=broad-except
+                    self._error = err
+            self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> 'AsyncSnapshotWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
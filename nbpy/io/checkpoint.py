@@ -0,0 +1,199 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the functions :func:`.write_checkpoint`, :func:`.read_checkpoint`, and
+:func:`.restore_integrator`.
+
+"""
+
+import json
+import os
+from typing import Optional
+
+import h5py
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import Time
+from nbpy.particles import PhaseSpace
+
+
+def write_checkpoint(filename: str,
+                     phsp: PhaseSpace,
+                     masses: npt.NDArray,
+                     time: Time,
+                     parameters: dict,
+                     integrator,
+                     rng: Optional[np.random.Generator] = None) -> str:
+    """
+    Write the full state of the simulation to a HDF5 file, from which it can
+    be resumed exactly.
+
+    The checkpoint is first written to a temporary file, which then replaces
+    the previous checkpoint, so that an interrupted write never leaves a
+    corrupt checkpoint behind.
+
+    Parameters
+    ----------
+
+    filename : str
+        The name of the file to write, without extension.
+
+    phsp : :class:`.PhaseSpace`
+        The phase space of the system.
+
+    masses : numpy.typing.NDArray
+        The masses of the particles.
+
+    time : :class:`.Time`
+        The object representing the current time.
+
+    parameters : dict
+        The parameters of the run, such as the time step. The values must be
+        scalars or strings.
+
+    integrator : :class:`.Integrator`
+        The integrator. Its name, its scalar attributes, and the arrays
+        returned by its ``get_state()`` member function are written.
+
+    rng : numpy.random.Generator (default: None)
+        If given, the random number generator whose state is written.
+
+    Returns
+    -------
+
+    out : string
+        The absolute path to the file written.
+
+    """
+    path = os.path.abspath(f"./{filename}.hdf5")
+    temporary = f"{path}.tmp"
+
+    with h5py.File(temporary, "w") as outfile:
+        outfile.create_dataset("Positions", data=phsp.positions)
+        outfile.create_dataset("Velocities", data=phsp.velocities)
+        outfile.create_dataset("Accelerations", data=phsp.accelerations)
+        outfile.create_dataset("Masses", data=masses)
+        outfile.attrs["TimeId"] = time.id_
+        outfile.attrs["TimeValue"] = time.value
+
+        outfile.create_group("Parameters").attrs.update(parameters)
+
+        group = outfile.create_group("Integrator")
+        group.attrs.update(_integrator_parameters(integrator))
+        for key, value in integrator.get_state().items():
+            group.create_dataset(key, data=value)
+
+        if rng is not None:
+            outfile.attrs["RngState"] = json.dumps(rng.bit_generator.state)
+
+    with open(temporary, "rb+") as outfile:
+        os.fsync(outfile.fileno())
+    os.replace(temporary, path)
+
+    return path
+
+
+def read_checkpoint(filename: str) -> dict:
+    """
+    Read the state of the simulation written by :func:`.write_checkpoint`.
+
+    Parameters
+    ----------
+
+    filename : str
+        The name of the file to read, without extension.
+
+    Returns
+    -------
+
+    out : dict
+        A dictionary holding the keys ``"PhaseSpace"`` (:class:`.PhaseSpace`),
+        ``"Masses"`` (numpy.typing.NDArray), ``"Time"`` (:class:`.Time`),
+        ``"Parameters"`` (dict), ``"Integrator"`` (dict of the name and the
+        parameters), ``"IntegratorState"`` (dict of arrays), and ``"Rng"``
+        (numpy.random.Generator, or None if no state was written).
+
+    """
+    with h5py.File(f"./{filename}.hdf5", "r") as infile:
+        positions = np.array(infile["Positions"])
+        phsp = PhaseSpace(positions.shape[-2],
+                          positions.shape[0] if positions.ndim == 3 else None)
+        phsp.set_positions(positions)
+        phsp.set_velocities(infile["Velocities"][:])
+        phsp.set_accelerations(infile["Accelerations"][:])
+
+        rng = None
+        if "RngState" in infile.attrs:
+            state = json.loads(infile.attrs["RngState"])
+            rng = np.random.Generator(
+                getattr(np.random, state["bit_generator"])())
+            rng.bit_generator.state = state
+
+        time = Time(int(infile.attrs["TimeId"]),
+                    float(infile.attrs["TimeValue"]))
+        return {
+            "PhaseSpace": phsp,
+            "Masses": infile["Masses"][:],
+            "Time": time,
+            "Parameters": _scalars(infile["Parameters"].attrs),
+            "Integrator": _scalars(infile["Integrator"].attrs),
+            "IntegratorState": {
+                key: dataset[:]
+                for key, dataset in infile["Integrator"].items()
+            },
+            "Rng": rng
+        }
+
+
+def restore_integrator(integrator, checkpoint: dict) -> None:
+    """
+    Set the state of the integrator from a checkpoint, after checking that
+    the checkpoint was written by an integrator of the same type and with the
+    same parameters.
+
+    Parameters
+    ----------
+
+    integrator : :class:`.Integrator`
+        The integrator, as constructed from the input file.
+
+    checkpoint : dict
+        The dictionary returned by :func:`.read_checkpoint`.
+
+    Raises
+    ------
+
+    ValueError
+        If the integrator differs from the integrator of the checkpoint.
+
+    """
+    parameters = _integrator_parameters(integrator)
+    if parameters != checkpoint["Integrator"]:
+        raise ValueError(f"Integrator {parameters} differs from the "
+                         f"integrator of the checkpoint "
+                         f"{checkpoint['Integrator']}.")
+    integrator.set_state(checkpoint["IntegratorState"])
+
+
+def _integrator_parameters(integrator) -> dict:
+    """
+    Return the name and the scalar attributes of the integrator.
+
+    """
+    parameters: dict = {"Name": type(integrator).__name__}
+    for key, value in vars(integrator).items():
+        if np.isscalar(value):
+            parameters[key.lstrip("_")] = value
+    return parameters
+
+
+def _scalars(attrs) -> dict:
+    """
+    Convert the HDF5 attributes to a dictionary of Python scalars.
+
+    """
+    return {
+        key: value.item() if isinstance(value, np.generic) else value
+        for key, value in attrs.items()
+    }
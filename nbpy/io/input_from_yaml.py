@@ -20,6 +20,13 @@ def input_from_yaml(inputfile: str) -> dict:
 
         Particles:
           N: (int)
+          Batch: (int, optional)
+          Seed: (int, optional)
+          Masses: (float or list, optional)
+
+        InitialData:  # optional
+          <name>:
+            <parameter>: ...
 
         Interaction:
           <name>:
@@ -30,14 +37,55 @@ def input_from_yaml(inputfile: str) -> dict:
         Evolution:
           InitialDt: (float)
           Timesteps: (int)
+          Integrator:  # optional
+            <name>:
+              <parameter>: ...
 
         Observers:
           Observing: (bool)
           Filename: (str)
           Groupname: (str)
-
-    An example can be found  ``/tests/io/Example.yml``. See
-    ``/interactions`` for all available interactions. 
+          FlushEvery: (int, optional)
+          Compression: (str, optional)
+          CompressionLevel: (int, optional)
+          Shuffle: (bool, optional)
+          Precision: (str, optional)
+          Quantization: (int, optional)
+          Asynchronous: (bool, optional)
+          QueueSize: (int, optional)
+          Every: (int, optional)
+          EveryDt: (float, optional)
+          Times: (list, optional)
+          Fields: (list, optional)
+          Subsample: (int, optional)
+
+        Checkpoints:  # optional
+          Every: (int)
+          Filename: (str)
+          Restart: (bool)
+
+        Instrumentation:  # optional
+          Timing: (bool, optional)
+          ProgressEvery: (float, optional)
+          Profile: (str, optional)
+
+    An example can be found  ``/tests/io/Example.yml``. The types of the
+    interaction, the integrator, and the initial data are looked up in
+    :class:`.Interactions`, :class:`.Integrators`, and :class:`.Distributions`,
+    respectively, and constructed from their parameters. A type without
+    parameters may also be given by its name alone, e.g. ``Integrator:
+    ForestRuth``. By default, the integrator is :class:`.Leapfrog`, the
+    initial data are drawn by :class:`.RandomDistribution` with the given
+    ``Seed``, and all masses are one. See :class:`.Observer`,
+    :class:`.SnapshotWriter`, and :class:`.AsyncSnapshotWriter` for the
+    observation options.
+
+    With ``Timing`` enabled, the time spent in the force evaluations, the rest
+    of the integrator steps, the output, and the checkpoints is reported at
+    the end of the run. With an asynchronous writer, the output time is that
+    of handing the snapshots over to the writer thread. ``ProgressEvery`` is
+    the wall time in seconds between progress lines, and ``Profile`` the file
+    to which the statistics of :mod:`cProfile` are written.
 
     Parameters
     ----------
@@ -0,0 +1,257 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.Observer`.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import Time
+from nbpy.particles import PhaseSpace
+
+# Fields that can be observed. Masses are written once per run.
+_FIELDS = ("Positions", "Velocities", "Accelerations", "Masses")
+
+# Relative tolerance with which a time is considered to reach a target time.
+_TOLERANCE = 1.e-9
+
+
+class Observer:
+    """
+    Decides when to observe the system and which data to write.
+
+    At most one cadence may be given. If none is given, the system is
+    observed at every step.
+
+    Parameters
+    ----------
+
+    every : int (default: None)
+        Observe every ``every`` steps.
+
+    every_dt : float (default: None)
+        Observe at the first step reaching every multiple of ``every_dt`` of
+        simulated time.
+
+    times : list (default: None)
+        Observe at the first step reaching each of the given times.
+
+    fields : tuple (default: ("Positions", ))
+        The fields to write, among ``"Positions"``, ``"Velocities"``,
+        ``"Accelerations"``, and ``"Masses"``. At least one field other than
+        the masses must be given.
+
+    subsample : int (default: 1)
+        Write only every ``subsample``-th particle.
+
+    Notes
+    -----
+
+    - Unless a list of times is given, the initial time is observed.
+    - When subsampling, the indices of the observed particles are written to
+      the dataset ``ParticleIds``.
+    - The systems of a batched phase space are written one after the other,
+      as a single system of B * N particles.
+
+    """
+
+    def __init__(self,
+                 every: Optional[int] = None,
+                 every_dt: Optional[float] = None,
+                 times: Optional[list] = None,
+                 fields: tuple = ("Positions", ),
+                 subsample: int = 1):
+        cadences = [every, every_dt, times]
+        if sum(cadence is not None for cadence in cadences) > 1:
+            raise ValueError("At most one of every, every_dt, and times may "
+                             "be given.")
+        unknown = set(fields) - set(_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}. "
+                             f"Fields available: {list(_FIELDS)}.")
+        if not set(fields) - {"Masses"}:
+            raise ValueError("At least one field other than the masses must "
+                             "be written in every snapshot.")
+        if subsample < 1:
+            raise ValueError(
+                f"subsample must be positive. Value passed: {subsample}.")
+
+        self._every = 1 if all(cadence is None
+                               for cadence in cadences) else every
+        self._every_dt = every_dt
+        self._times = None if times is None else np.sort(times)
+        self._fields = tuple(fields)
+        self._subsample = subsample
+        self._next = 0
+
+    @classmethod
+    def from_dict(cls, options: dict) -> 'Observer':
+        """
+        Construct an instance from a dictionary of options.
+
+        Parameters
+        ----------
+
+        options : dict
+            The dictionary. May contain at most one of the keys ``"Every"``
+            (int), ``"EveryDt"`` (float), or ``"Times"`` (list), and
+            optionally the keys ``"Fields"`` (list) and ``"Subsample"``
+            (int).
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(every=options.get("Every"),
+                   every_dt=options.get("EveryDt"),
+                   times=options.get("Times"),
+                   fields=tuple(options.get("Fields", ("Positions", ))),
+                   subsample=options.get("Subsample", 1))
+
+    @property
+    def fields(self) -> tuple:
+        """
+        The fields to write.
+
+        """
+        return self._fields
+
+    @property
+    def snapshot_fields(self) -> tuple:
+        """
+        The fields written in every snapshot, i.e. all but the masses.
+
+        """
+        return tuple(field for field in self._fields if field != "Masses")
+
+    @property
+    def subsample(self) -> int:
+        """
+        The stride between observed particles.
+
+        """
+        return self._subsample
+
+    def n_observed(self, N: int) -> int:
+        """
+        The number of observed particles out of N.
+
+        """
+        return -(-N // self._subsample)
+
+    def capacity(self, timesteps: int, dt: float) -> int:
+        """
+        The number of snapshots taken in a run of the given number of steps.
+
+        """
+        if self._every is not None:
+            return timesteps // self._every + 1
+        if self._every_dt is not None:
+            return int(timesteps * dt / self._every_dt + _TOLERANCE) + 1
+        # Without the other cadences, a list of times was given.
+        assert self._times is not None
+        return self._times.size
+
+    def is_due(self, time: Time) -> bool:
+        """
+        Whether to observe the system at the given time.
+
+        Times must be passed in increasing order, and the return value
+        assumes that the system is observed when it is True.
+
+        """
+        if self._every is not None:
+            return time.id_ % self._every == 0
+
+        if self._every_dt is not None:
+            steps = np.floor(time.value / self._every_dt + _TOLERANCE)
+            if steps < self._next:
+                return False
+            self._next = steps + 1
+            return True
+
+        assert self._times is not None
+        tolerance = _TOLERANCE * max(abs(time.value), 1.)
+        reached = int(
+            np.searchsorted(self._times, time.value + tolerance, side="right"))
+        if reached <= self._next:
+            return False
+        self._next = reached
+        return True
+
+    def resume(self, time: Time) -> None:
+        """
+        Skip the observations up to and including the given time, e.g. when
+        resuming a run from a checkpoint.
+
+        """
+        if self._every is None:
+            self.is_due(time)
+
+    def start(self, writer, masses: npt.NDArray) -> None:
+        """
+        Write the data that does not change during the run.
+
+        Parameters
+        ----------
+
+        writer : obj
+            The writer. Must have a ``write_constant(name, data)`` member
+            function.
+
+        masses : numpy.typing.NDArray
+            The masses of all particles.
+
+        """
+        if "Masses" in self._fields:
+            writer.write_constant("Masses",
+                                  np.ravel(masses)[::self._subsample])
+        if self._subsample > 1:
+            writer.write_constant("ParticleIds",
+                                  np.arange(0, masses.size, self._subsample))
+
+    def observe(self, writer, phsp: PhaseSpace, time: Time) -> bool:
+        """
+        Write the selected fields if the system is to be observed at the
+        given time.
+
+        Parameters
+        ----------
+
+        writer : obj
+            The writer. Must have a ``write(data, time)`` member function.
+
+        phsp : :class:`.PhaseSpace`
+            The phase space of the system.
+
+        time : :class:`.Time`
+            The object representing the current time.
+
+        Returns
+        -------
+
+        out : bool
+            Whether the system was observed.
+
+        """
+        if not self.is_due(time):
+            return False
+
+        values = {
+            "Positions": phsp.positions,
+            "Velocities": phsp.velocities,
+            "Accelerations": phsp.accelerations
+        }
+        writer.write(
+            {
+                field: values[field].reshape(-1, 3)[::self._subsample]
+                for field in self.snapshot_fields
+            }, time)
+        return True
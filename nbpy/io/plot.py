@@ -5,14 +5,19 @@ Defines functions to plot simulation data.
 
 """
 
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
 
 import h5py
-import matplotlib.pyplot as plt
+from matplotlib import animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
 import numpy.typing as npt
 
 from nbpy.evolution import Time
 from nbpy.io import util
+from nbpy.io.snapshot_reader import SnapshotReader
 
 
 def positions_3d(axis,
@@ -20,7 +25,8 @@ def positions_3d(axis,
                  positions: npt.NDArray,
                  folder: str,
                  center_of_mass: Optional[npt.NDArray] = None,
-                 grid_off: bool = True) -> None:
+                 grid_off: bool = True,
+                 dpi: int = 300) -> None:
     """
     Plot particles at their 3-d positions at the given time.
 
@@ -45,6 +51,9 @@ def positions_3d(axis,
     grid_off : bool (default: True)
         Whether to turn off plot grid.
 
+    dpi : int (default: 300)
+        The resolution of the plot in dots per inch.
+
     """
 
     axis.scatter(positions[:, 0],
@@ -62,38 +71,160 @@ def positions_3d(axis,
                      depthshade=False,
                      s=1.)
 
-    half_side = 2.
-    axis.set_xlim(-half_side, half_side)
-    axis.set_ylim(-half_side, half_side)
-    axis.set_zlim(-half_side, half_side)
+    _decorate(axis, grid_off)
 
-    if grid_off:
-        axis.grid(False)
+    axis.set_title(f"elapsed time: {time.value:1.3f} years")
 
-    axis.set_xticks([-0.5, 0.5])
-    axis.set_xticklabels(["astronomical unit", ""])
-    axis.set_yticks([])
-    axis.set_zticks([])
+    axis.figure.savefig(f"{folder}/{time.id_:06}",
+                        bbox_inches='tight',
+                        dpi=dpi)
 
-    axis.yaxis.labelpad = 12
-    axis.yaxis.set_rotate_label(False)
+    axis.clear()
 
-    black = (0., 0., 0.)
-    background_color = black
-    axis.xaxis.set_pane_color(background_color + (0.95, ))
-    axis.yaxis.set_pane_color(background_color + (0.9, ))
-    axis.zaxis.set_pane_color(background_color)
 
-    plt.title(f"elapsed time: {time.value:1.3f} years")
+class FrameRenderer:
+    """
+    Renders the particles at their 3-d positions to an in-memory RGB image.
 
-    plt.savefig(f"{folder}/{time.id_:06}", bbox_inches='tight', dpi=300)
+    The figure and its artists are created once, and only the positions and
+    the title are updated for every frame, as opposed to
+    :func:`.positions_3d`, which plots every frame from scratch.
 
-    axis.clear()
+    Parameters
+    ----------
+
+    dpi : int (default: 100)
+        The resolution of the frames in dots per inch.
+
+    grid_off : bool (default: True)
+        Whether to turn off plot grid.
+
+    """
+
+    def __init__(self, dpi: int = 100, grid_off: bool = True):
+        self._figure = Figure(dpi=dpi)
+        self._canvas = FigureCanvasAgg(self._figure)
+        axis = self._figure.add_subplot(projection='3d')
+        self._scatter = axis.scatter([], [], [],
+                                     color='white',
+                                     depthshade=False,
+                                     s=1.)
+        _decorate(axis, grid_off)
+        self._title = axis.set_title("")
+
+    @property
+    def figure(self):
+        """
+        The Matplotlib figure.
+
+        """
+        return self._figure
+
+    def update(self, time: Time, positions: npt.NDArray) -> None:
+        """
+        Update the artists to the positions at the given time.
+
+        """
+        self._scatter.set_offsets(positions[:, :2])
+        self._scatter.set_3d_properties(positions[:, 2], "z")
+        self._title.set_text(f"elapsed time: {time.value:1.3f} years")
+
+    def render(self, time: Time, positions: npt.NDArray) -> npt.NDArray:
+        """
+        Render the positions at the given time.
+
+        Parameters
+        ----------
+
+        time : :class:`.Time`
+            The object representing the time of observation.
+
+        positions : numpy.typing.NDArray
+            The positions at the given time, stored as a N-by-3 NumPy array.
+
+        Returns
+        -------
+
+        out : numpy.typing.NDArray
+            The frame as an array of shape (height, width, 3) of 8-bit
+            integers. It is a view of the canvas, overwritten by the next
+            call.
+
+        """
+        self.update(time, positions)
+        self._canvas.draw()
+        return np.asarray(self._canvas.buffer_rgba())[..., :3]
+
+
+def orbits_movie(filepath: str,
+                 groupname: str,
+                 output: Optional[str] = None,
+                 sink: Optional[Callable] = None,
+                 fps: int = 30,
+                 stride: int = 1,
+                 dpi: int = 100) -> None:
+    """
+    Render the time evolution of the orbits to a single video or animation,
+    or stream the frames to a function.
+
+    Parameters
+    ----------
+
+    filepath : str
+        The path to the file containing the data.
+
+    groupname : str
+        The HDF5 group name in the file.
+
+    output : str (default: None)
+        The path to the video to write. GIF files are written with Pillow,
+        and any other format with FFmpeg, which must be installed.
+
+    sink : callable (default: None)
+        If given instead of ``output``, a function called with every frame as
+        an array of shape (height, width, 3) of 8-bit integers. The array is
+        overwritten by the next frame.
+
+    fps : int (default: 30)
+        The frames per second of the video.
+
+    stride : int (default: 1)
+        Render only every ``stride``-th snapshot.
+
+    dpi : int (default: 100)
+        The resolution of the frames in dots per inch.
+
+    """
+    if (output is None) == (sink is None):
+        raise ValueError("Exactly one of output and sink must be given.")
+
+    renderer = FrameRenderer(dpi=dpi)
+    frames = np.arange(0, _count_frames(filepath, groupname), stride)
+
+    if sink is not None:
+        for time, positions in _read_frames(filepath, groupname, frames):
+            sink(renderer.render(time, positions))
+        return
+
+    # Without a sink, the output was given.
+    assert output is not None
+    writer: animation.AbstractMovieWriter
+    if output.lower().endswith(".gif"):
+        writer = animation.PillowWriter(fps=fps)
+    else:
+        writer = animation.FFMpegWriter(fps=fps)
+    with writer.saving(renderer.figure, output, dpi):
+        for time, positions in _read_frames(filepath, groupname, frames):
+            renderer.update(time, positions)
+            writer.grab_frame()
 
 
 def orbits_3d(filepath: str,
               groupname: str,
-              figure_folder: str = "./figures") -> None:
+              figure_folder: str = "./figures",
+              workers: int = 1,
+              stride: int = 1,
+              dpi: int = 300) -> None:
     """
     Plot time evolution of the orbits as a sequence of snapshots.
 
@@ -109,14 +240,106 @@ def orbits_3d(filepath: str,
     figure_folder : str (default: "./figures")
         The local folder where to store the figures.
 
+    workers : int (default: 1)
+        The number of processes rendering the snapshots in parallel.
+
+    stride : int (default: 1)
+        Plot only every ``stride``-th snapshot.
+
+    dpi : int (default: 300)
+        The resolution of the figures in dots per inch.
+
+    Notes
+    -----
+
+    - Every process renders its snapshots with its own figure and the Agg
+      backend, so the figures may be created without a display.
+
     """
-    fig = plt.figure()
-    axis = plt.axes(projection='3d')
     util.create_folder(figure_folder)
+    frames = np.arange(0, _count_frames(filepath, groupname), stride)
+
+    if workers == 1:
+        _render_frames(filepath, groupname, frames, figure_folder, dpi)
+        return
+
+    # Contiguous blocks of snapshots are read efficiently from chunked
+    # datasets. Several blocks per worker balance the load.
+    blocks = np.array_split(frames, max(1, min(frames.size, 4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_render_frames, filepath, groupname, block,
+                            figure_folder, dpi) for block in blocks
+        ]
+        for future in futures:
+            future.result()
+
+
+def _decorate(axis, grid_off: bool) -> None:
+    """
+    Set the limits, ticks, and colors of the given 3-d axis.
+
+    """
+    half_side = 2.
+    axis.set_xlim(-half_side, half_side)
+    axis.set_ylim(-half_side, half_side)
+    axis.set_zlim(-half_side, half_side)
+
+    if grid_off:
+        axis.grid(False)
 
+    axis.set_xticks([-0.5, 0.5])
+    axis.set_xticklabels(["astronomical unit", ""])
+    axis.set_yticks([])
+    axis.set_zticks([])
+
+    axis.yaxis.labelpad = 12
+    axis.yaxis.set_rotate_label(False)
+
+    black = (0., 0., 0.)
+    background_color = black
+    axis.xaxis.set_pane_color(background_color + (0.95, ))
+    axis.yaxis.set_pane_color(background_color + (0.9, ))
+    axis.zaxis.set_pane_color(background_color)
+
+
+def _count_frames(filepath: str, groupname: str) -> int:
     with h5py.File(filepath, "r") as readfile:
-        for key, value in readfile[groupname].items():
-            time = Time(key, value.attrs["TimeValue"])
-            positions_3d(axis, time, value, figure_folder)
+        group = readfile[groupname]
+        if "Time" not in group:
+            return len(group)
+        return int(group.attrs.get("Size", group["Time"].shape[0]))
+
 
-    plt.close(fig)
+def _read_frames(filepath: str, groupname: str, frames: npt.NDArray):
+    """
+    Yield the time and positions of the given snapshots.
+
+    Files written by :class:`.SnapshotWriter` hold all snapshots in a single
+    dataset. Older files hold one dataset per snapshot.
+
+    """
+    with h5py.File(filepath, "r") as readfile:
+        group = readfile[groupname]
+        if "Time" not in group:
+            keys = list(group.keys())
+            for frame in frames:
+                value = group[keys[frame]]
+                yield Time(keys[frame], value.attrs["TimeValue"]), value[:]
+            return
+
+    with SnapshotReader(filepath, groupname) as reader:
+        positions = reader["Positions"]
+        time_ids = reader.time_ids
+        times = reader.times
+        for frame in frames:
+            yield Time(int(time_ids[frame]), times[frame]), positions[frame]
+
+
+def _render_frames(filepath: str, groupname: str, frames: npt.NDArray,
+                   folder: str, dpi: int) -> None:
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    axis = figure.add_subplot(projection='3d')
+    for time, positions in _read_frames(filepath, groupname, frames):
+        positions_3d(axis, time, positions, folder, dpi=dpi)
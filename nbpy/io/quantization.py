@@ -0,0 +1,77 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines functions to quantize snapshots relative to their bounding box.
+
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+_UNSIGNED = {8: np.uint8, 16: np.uint16, 32: np.uint32}
+
+
+def quantize(data: npt.NDArray, bits: int) -> tuple:
+    """
+    Map the given data to unsigned integers of the given number of bits,
+    relative to the bounding box of the data along every axis.
+
+    Parameters
+    ----------
+
+    data : numpy.typing.NDArray
+        The N-by-3 array to quantize.
+
+    bits : int
+        The number of bits of every integer. Must be 8, 16, or 32.
+
+    Returns
+    -------
+
+    out : tuple
+        The N-by-3 array of integers and the 2-by-3 array holding the lower
+        and upper corners of the bounding box.
+
+    Notes
+    -----
+
+    The largest error of a component is half the side of the box along that
+    axis divided by ``2**bits - 1``.
+
+    """
+    levels = 2.**bits - 1.
+    box = np.stack((np.min(data, axis=0), np.max(data, axis=0)))
+    side = box[1] - box[0]
+    side[side == 0.] = 1.
+    quantized = np.rint((data - box[0]) * (levels / side))
+    return quantized.astype(_UNSIGNED[bits]), box
+
+
+def dequantize(quantized: npt.NDArray, box: npt.NDArray,
+               bits: int) -> npt.NDArray:
+    """
+    Invert :func:`.quantize`, up to the quantization error.
+
+    Parameters
+    ----------
+
+    quantized : numpy.typing.NDArray
+        The array of integers, of shape (..., N, 3).
+
+    box : numpy.typing.NDArray
+        The corners of the bounding box, of shape (..., 2, 3).
+
+    bits : int
+        The number of bits of every integer.
+
+    Returns
+    -------
+
+    out : numpy.typing.NDArray
+        The data in double precision.
+
+    """
+    levels = 2.**bits - 1.
+    lower = box[..., 0:1, :]
+    side = box[..., 1:2, :] - lower
+    return lower + quantized * (side / levels)
@@ -0,0 +1,262 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines classes :class:`.SnapshotReader` and :class:`.SnapshotArray`.
+
+"""
+
+import h5py
+import numpy as np
+import numpy.typing as npt
+
+from .quantization import dequantize
+
+
+class SnapshotReader:
+    """
+    Reads the snapshots written by :class:`.SnapshotWriter`.
+
+    Every field is exposed as a :class:`.SnapshotArray`, which reads only the
+    snapshots and particles selected by slicing.
+
+    Parameters
+    ----------
+
+    filepath : str
+        The path to the file containing the data.
+
+    groupname : str
+        The HDF5 group name in the file.
+
+    Notes
+    -----
+
+    - The reader may be used as a context manager, which closes the file on
+      exit. Arrays obtained from the reader are invalid after closing it.
+    - If the run did not finish, only the snapshots flushed to disk are
+      exposed.
+
+    """
+
+    def __init__(self, filepath: str, groupname: str):
+        self._file = h5py.File(filepath, "r")
+        self._group = self._file[groupname]
+        if "Time" not in self._group:
+            self._file.close()
+            raise ValueError(f"Group {groupname} in {filepath} was not "
+                             "written by SnapshotWriter.")
+
+        self._size = int(
+            self._group.attrs.get("Size", self._group["Time"].shape[0]))
+
+        # Bounding boxes of quantized fields are not fields themselves.
+        arrays = [
+            name for name, dataset in self._group.items() if dataset.ndim == 3
+        ]
+        self._fields = tuple(
+            name for name in arrays
+            if not (name.endswith("Box") and name[:-3] in arrays))
+
+    @property
+    def fields(self) -> tuple:
+        """
+        The names of the fields written in every snapshot.
+
+        """
+        return self._fields
+
+    @property
+    def size(self) -> int:
+        """
+        The number of snapshots T.
+
+        """
+        return self._size
+
+    @property
+    def times(self) -> npt.NDArray:
+        """
+        The time values of the snapshots.
+
+        """
+        return self._group["Time"][:self._size]
+
+    @property
+    def time_ids(self) -> npt.NDArray:
+        """
+        The time IDs of the snapshots.
+
+        """
+        return self._group["TimeId"][:self._size]
+
+    def constant(self, name: str) -> npt.NDArray:
+        """
+        Read data that does not change during the run, such as the masses.
+
+        """
+        return self._group[name][()]
+
+    def close(self) -> None:
+        """
+        Close the file.
+
+        """
+        self._file.close()
+
+    def __getitem__(self, field: str) -> 'SnapshotArray':
+        if field not in self._fields:
+            raise KeyError(f"Unknown field: {field}. "
+                           f"Fields available: {list(self._fields)}.")
+        return SnapshotArray(self._group, field, self._size)
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class SnapshotArray:
+    """
+    A lazily loaded array of shape (T, N, 3) holding the snapshots of a field.
+
+    Indexing with integers, slices, or arrays of indices along the time,
+    particle, and component axes reads only the selected data, which is
+    returned in double precision as a NumPy array.
+
+    Parameters
+    ----------
+
+    group : obj
+        The HDF5 group written by :class:`.SnapshotWriter`.
+
+    field : str
+        The name of the field.
+
+    size : int
+        The number of snapshots T.
+
+    Notes
+    -----
+
+    - Uncompressed contiguous datasets are read through a memory map of the
+      file. Chunked datasets, as written by :class:`.SnapshotWriter`, are
+      read chunk by chunk by HDF5.
+    - Quantized snapshots are dequantized after reading.
+
+    """
+
+    def __init__(self, group, field: str, size: int):
+        self._dataset = group[field]
+        self._shape = (size, ) + self._dataset.shape[1:]
+
+        self._bits = self._dataset.attrs.get("Quantization")
+        self._box = group[f"{field}Box"] if self._bits is not None else None
+
+        self._memmap = None
+        offset = self._dataset.id.get_offset()
+        if (self._dataset.chunks is None and offset is not None
+                and self._dataset.compression is None):
+            self._memmap = np.memmap(group.file.filename,
+                                     dtype=self._dataset.dtype,
+                                     mode="r",
+                                     offset=offset,
+                                     shape=self._dataset.shape)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        The shape (T, N, 3) of the array.
+
+        """
+        return self._shape
+
+    @property
+    def memory_mapped(self) -> bool:
+        """
+        Whether the data is read through a memory map.
+
+        """
+        return self._memmap is not None
+
+    @property
+    def ndim(self) -> int:
+        """
+        The number of dimensions of the array.
+
+        """
+        return 3
+
+    def __len__(self) -> int:
+        return self._shape[0]
+
+    def __array__(self, dtype=None) -> npt.NDArray:
+        data = self[:]
+        return data if dtype is None else data.astype(dtype)
+
+    def __getitem__(self, key) -> npt.NDArray:
+        if not isinstance(key, tuple):
+            key = (key, )
+        if len(key) > 3:
+            raise IndexError("too many indices for SnapshotArray.")
+        key = key + (slice(None), ) * (3 - len(key))
+
+        times, time_order = _selection(key[0], self._shape[0])
+        particles, particle_order = _selection(key[1], self._shape[1])
+
+        # A single particle is read as a range, so that the particle axis is
+        # kept until the data is dequantized.
+        if isinstance(particles, int):
+            particles = slice(particles, particles + 1)
+        if isinstance(times, np.ndarray) and isinstance(particles, np.ndarray):
+            data = np.stack([self._read(time, particles) for time in times])
+        else:
+            data = self._read(times, particles)
+
+        particle_axis = 0 if isinstance(times, int) else 1
+        if time_order is not None:
+            data = data[time_order]
+        if particle_order is not None:
+            data = np.take(data, particle_order, axis=particle_axis)
+        if isinstance(key[1], (int, np.integer)):
+            data = np.squeeze(data, axis=particle_axis)
+        return data[..., key[2]]
+
+    def _read(self, times, particles) -> npt.NDArray:
+        source = self._dataset if self._memmap is None else self._memmap
+        data = source[times, particles]
+        if self._bits is None:
+            return data.astype(np.float64)
+        # Quantized fields always have a bounding box per snapshot.
+        assert self._box is not None
+        return dequantize(data, self._box[times], int(self._bits))
+
+
+def _selection(key, size: int) -> tuple:
+    """
+    Convert an index along one axis to an integer, a slice with positive step,
+    or an increasing array of unique indices, as supported by HDF5. Also
+    return the indices that restore the requested order, if any.
+
+    """
+    if isinstance(key, (int, np.integer)):
+        index = int(key) + size if key < 0 else int(key)
+        if not 0 <= index < size:
+            raise IndexError(f"index {key} is out of bounds for axis with "
+                             f"size {size}.")
+        return index, None
+
+    if isinstance(key, slice):
+        start, stop, step = key.indices(size)
+        if step > 0:
+            return slice(start, stop, step), None
+        key = np.arange(start, stop, step)
+
+    key = np.asarray(key)
+    if key.dtype == bool:
+        key = np.flatnonzero(key)
+    key = np.where(key < 0, key + size, key)
+    if np.any((key < 0) | (key >= size)):
+        raise IndexError(f"index out of bounds for axis with size {size}.")
+    unique, order = np.unique(key, return_inverse=True)
+    return unique, order
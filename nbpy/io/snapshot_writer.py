@@ -0,0 +1,350 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.SnapshotWriter`.
+
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import h5py
+import numpy as np
+import numpy.typing as npt
+
+from nbpy.evolution import Time
+from .quantization import quantize
+
+# Target size in bytes of a chunk of a snapshot dataset.
+_CHUNK_BYTES = 2**20
+
+_DEFAULT_FIELDS = ("Positions", )
+
+_DTYPES = {"single": np.float32, "double": np.float64}
+
+
+@dataclass
+class _Datasets:
+    """
+    The datasets of a :class:`.SnapshotWriter` that grow with every snapshot.
+
+    """
+    fields: dict
+    boxes: dict
+    time: h5py.Dataset
+    time_id: h5py.Dataset
+
+
+class SnapshotWriter:
+    """
+    Writes snapshots of the particles to a HDF5 file that is kept open during
+    the whole run.
+
+    Every field is stored in a single chunked dataset of shape (T, N, 3)
+    inside the given group, along with the datasets ``Time`` and ``TimeId``
+    of length T holding the time of every snapshot. The datasets are
+    preallocated and extended as needed, and trimmed to the number of
+    snapshots written when the file is closed.
+
+    The snapshots may be compressed, stored in single precision, or quantized
+    to integers relative to the bounding box of every snapshot. Snapshots
+    stored in any of these layouts are read back in double precision by
+    :class:`.SnapshotReader`.
+
+    Parameters
+    ----------
+
+    filename : str
+        The name of the file to write, without extension.
+
+    groupname : str
+        The name of the group in the HDF5 File object. An existing group with
+        the same name is overwritten.
+
+    n_particles : int
+        The number of particles N.
+
+    capacity : int (default: 1)
+        The number of snapshots T for which space is preallocated.
+
+    flush_every : int (default: 100)
+        The number of snapshots written between flushes of the file to disk.
+
+    fields : tuple (default: ("Positions", ))
+        The names of the fields written in every snapshot.
+
+    compression : str (default: None)
+        The HDF5 compression filter, ``"gzip"`` or ``"lzf"``.
+
+    compression_level : int (default: None)
+        The level of the ``"gzip"`` filter, from 0 to 9.
+
+    shuffle : bool (default: False)
+        Whether to apply the HDF5 byte-shuffle filter before compressing.
+
+    precision : str (default: "double")
+        The floating-point precision, ``"single"`` or ``"double"``.
+
+    quantization : int (default: None)
+        If given, the number of bits (8, 16, or 32) of the unsigned integers
+        to which every snapshot is quantized. Overrides ``precision``.
+
+    resume_after : int (default: None)
+        If given and the group exists, append to it instead of overwriting
+        it, after dropping the snapshots with time IDs larger than the given
+        one. The layout of the existing datasets is kept.
+
+    Notes
+    -----
+
+    - Quantized fields have the attribute ``"Quantization"`` holding the
+      number of bits, and the bounding boxes are stored in a companion
+      dataset ``<field>Box`` of shape (T, 2, 3).
+    - The writer may be used as a context manager, which closes the file on
+      exit.
+    - The group attribute ``"Size"`` holds the number of snapshots written
+      up to the last flush, so the data can be recovered from an unfinished
+      run.
+
+    """
+
+    def __init__(self,
+                 filename: str,
+                 groupname: str,
+                 n_particles: int,
+                 capacity: int = 1,
+                 flush_every: int = 100,
+                 fields: tuple = _DEFAULT_FIELDS,
+                 compression: Optional[str] = None,
+                 compression_level: Optional[int] = None,
+                 shuffle: bool = False,
+                 precision: str = "double",
+                 quantization: Optional[int] = None,
+                 resume_after: Optional[int] = None):
+        if flush_every < 1:
+            raise ValueError(
+                f"flush_every must be positive. Value passed: {flush_every}.")
+        if precision not in _DTYPES:
+            raise ValueError(f"Unknown precision: {precision}. "
+                             f"Precisions available: {list(_DTYPES)}.")
+        if quantization not in (None, 8, 16, 32):
+            raise ValueError("quantization must be 8, 16, or 32. "
+                             f"Value passed: {quantization}.")
+
+        self._path = os.path.abspath(f"./{filename}.hdf5")
+        self._flush_every = flush_every
+        self._quantization = quantization
+        self._size = 0
+
+        self._file = h5py.File(self._path, "a")
+        if resume_after is not None and groupname in self._file:
+            self._resume(self._file[groupname], fields, resume_after)
+            return
+        if groupname in self._file:
+            del self._file[groupname]
+        self._group = self._file.create_group(groupname)
+
+        dtype: np.dtype = np.dtype(_DTYPES[precision])
+        if quantization is not None:
+            dtype = np.dtype(f"uint{quantization}")
+
+        capacity = max(capacity, 1)
+        snapshot_bytes = 3 * n_particles * dtype.itemsize
+        chunk = max(1, min(capacity, _CHUNK_BYTES // snapshot_bytes))
+        datasets = _Datasets(
+            fields={},
+            boxes={},
+            time=self._group.create_dataset("Time",
+                                            shape=(capacity, ),
+                                            maxshape=(None, ),
+                                            dtype=np.float64),
+            time_id=self._group.create_dataset("TimeId",
+                                               shape=(capacity, ),
+                                               maxshape=(None, ),
+                                               dtype=np.int64))
+        for field in fields:
+            datasets.fields[field] = self._group.create_dataset(
+                field,
+                shape=(capacity, n_particles, 3),
+                maxshape=(None, n_particles, 3),
+                chunks=(chunk, n_particles, 3),
+                dtype=dtype,
+                compression=compression,
+                compression_opts=compression_level,
+                shuffle=shuffle)
+            if quantization is not None:
+                datasets.fields[field].attrs["Quantization"] = quantization
+                datasets.boxes[field] = self._group.create_dataset(
+                    f"{field}Box",
+                    shape=(capacity, 2, 3),
+                    maxshape=(None, 2, 3),
+                    dtype=np.float64)
+        self._datasets = datasets
+        self._group.attrs["Size"] = 0
+
+    @classmethod
+    def from_dict(cls,
+                  options: dict,
+                  n_particles: int,
+                  capacity: int = 1,
+                  fields: tuple = _DEFAULT_FIELDS,
+                  resume_after: Optional[int] = None) -> 'SnapshotWriter':
+        """
+        Construct an instance from a dictionary of options.
+
+        Parameters
+        ----------
+
+        options : dict
+            The dictionary. Must contain keys ``"Filename"`` (str) and
+            ``"Groupname"`` (str), and optionally ``"FlushEvery"`` (int),
+            ``"Compression"`` (str), ``"CompressionLevel"`` (int),
+            ``"Shuffle"`` (bool), ``"Precision"`` (str), and
+            ``"Quantization"`` (int).
+
+        n_particles : int
+            The number of particles.
+
+        capacity : int (default: 1)
+            The number of snapshots for which space is preallocated.
+
+        fields : tuple (default: ("Positions", ))
+            The names of the fields written in every snapshot.
+
+        resume_after : int (default: None)
+            If given, append to an existing group after dropping the
+            snapshots with time IDs larger than the given one.
+
+        Returns
+        -------
+
+        out : obj
+            The constructed object.
+
+        """
+        return cls(options["Filename"],
+                   options["Groupname"],
+                   n_particles,
+                   capacity=capacity,
+                   flush_every=options.get("FlushEvery", 100),
+                   fields=fields,
+                   compression=options.get("Compression"),
+                   compression_level=options.get("CompressionLevel"),
+                   shuffle=options.get("Shuffle", False),
+                   precision=options.get("Precision", "double"),
+                   quantization=options.get("Quantization"),
+                   resume_after=resume_after)
+
+    @property
+    def path(self) -> str:
+        """
+        The absolute path to the file.
+
+        """
+        return self._path
+
+    @property
+    def size(self) -> int:
+        """
+        The number of snapshots written.
+
+        """
+        return self._size
+
+    def write(self, data: dict, time: Time) -> None:
+        """
+        Append a snapshot of the given fields at the given time.
+
+        Parameters
+        ----------
+
+        data : dict
+            The N-by-3 array of every field, keyed by the field names.
+
+        time : :class:`.Time`
+            The object representing the time of observation.
+
+        """
+        datasets = self._datasets
+        if self._size == datasets.time.shape[0]:
+            self._resize(2 * self._size)
+
+        for field, dataset in datasets.fields.items():
+            if self._quantization is None:
+                dataset[self._size] = data[field]
+            else:
+                quantized, box = quantize(data[field], self._quantization)
+                dataset[self._size] = quantized
+                datasets.boxes[field][self._size] = box
+        datasets.time[self._size] = time.value
+        datasets.time_id[self._size] = time.id_
+        self._size += 1
+
+        if self._size % self._flush_every == 0:
+            self.flush()
+
+    def write_constant(self, name: str, data: npt.NDArray) -> None:
+        """
+        Write data that does not change during the run, such as the masses.
+
+        Parameters
+        ----------
+
+        name : str
+            The name of the dataset.
+
+        data : numpy.typing.NDArray
+            The data to write.
+
+        """
+        if name in self._group:
+            del self._group[name]
+        self._group.create_dataset(name, data=data)
+
+    def flush(self) -> None:
+        """
+        Flush the snapshots written so far to disk.
+
+        """
+        self._group.attrs["Size"] = self._size
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Trim the datasets to the snapshots written and close the file.
+
+        """
+        if not self._file:
+            return
+        self._resize(self._size)
+        self._group.attrs["Size"] = self._size
+        self._file.close()
+
+    def _resume(self, group, fields: tuple, resume_after: int) -> None:
+        self._group = group
+        boxes = {
+            field: group[f"{field}Box"]
+            for field in fields if f"{field}Box" in group
+        }
+        datasets = {field: group[field] for field in fields}
+        self._datasets = _Datasets(datasets, boxes, group["Time"],
+                                   group["TimeId"])
+
+        bits = group[fields[0]].attrs.get("Quantization")
+        self._quantization = None if bits is None else int(bits)
+
+        time_ids = group["TimeId"][:group.attrs["Size"]]
+        self._size = int(np.searchsorted(time_ids, resume_after, side="right"))
+
+    def _resize(self, capacity: int) -> None:
+        datasets = self._datasets
+        for dataset in (*datasets.fields.values(), *datasets.boxes.values(),
+                        datasets.time, datasets.time_id):
+            dataset.resize(capacity, axis=0)
+
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,51 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class :class:`.Writer`.
+
+"""
+
+from typing import Protocol
+
+import numpy.typing as npt
+
+from nbpy.evolution import Time
+
+
+class Writer(Protocol):
+    """
+    Interface of the objects to which snapshots are written, such as
+    :class:`.SnapshotWriter` and :class:`.AsyncSnapshotWriter`.
+
+    """
+
+    @property
+    def path(self) -> str:
+        """
+        The absolute path to the file.
+
+        """
+
+    def write(self, data: dict, time: Time) -> None:
+        """
+        Write a snapshot of the given fields at the given time.
+
+        """
+
+    def write_constant(self, name: str, data: npt.NDArray) -> None:
+        """
+        Write data that does not change during the run.
+
+        """
+
+    def flush(self) -> None:
+        """
+        Write the pending snapshots and flush them to disk.
+
+        """
+
+    def close(self) -> None:
+        """
+        Write the pending snapshots and close the file.
+
+        """
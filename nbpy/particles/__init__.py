@@ -6,4 +6,5 @@ Defines classes and functions related to the particles.
 """
 
 from .center_of_mass import *
+from .conserved_quantities import *
 from .phase_space import *
@@ -0,0 +1,212 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines functions of the quantities conserved by the evolution of the system.
+
+All functions also accept a batched phase space, for which they return the
+quantity of every system.
+
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from .phase_space import PhaseSpace
+
+# Number of particles per side of the square blocks of pairs of the potential.
+_TILE_SIZE = 256
+
+
+def kinetic_energy(phsp: PhaseSpace, masses: npt.NDArray):
+    """
+    Compute the kinetic energy of the system.
+
+    Parameters
+    ----------
+
+    phsp : :class:`.PhaseSpace`
+        An object containing the velocities of the system.
+
+    masses : numpy.typing.NDArray
+        The masses, stored as an N-dimensional array.
+
+    Returns
+    -------
+
+    out : float or numpy.typing.NDArray
+        The kinetic energy, or the B kinetic energies of a batched phase
+        space.
+
+    """
+    speeds_sq = np.sum(phsp.velocities**2., axis=-1)
+    return 0.5 * np.sum(masses * speeds_sq, axis=-1)
+
+
+def potential_energy(phsp: PhaseSpace,
+                     masses: npt.NDArray,
+                     softening: float = 0.,
+                     constant: float = 1.,
+                     tile_size: int = _TILE_SIZE):
+    """
+    Compute the gravitational potential energy of the system, consistent with
+    the softened accelerations of :class:`.InverseSquareLaw`.
+
+    The pairs are summed in square blocks of ``tile_size`` particles per side,
+    and only the blocks on and above the diagonal are computed, so the cost
+    is a fraction of a force evaluation and the memory O(tile_size^2).
+
+    Parameters
+    ----------
+
+    phsp : :class:`.PhaseSpace`
+        An object containing the positions of the system.
+
+    masses : numpy.typing.NDArray
+        The masses, stored as an N-dimensional array.
+
+    softening : float (default: 0.)
+        The softening parameter of the interaction.
+
+    constant : float (default: 1.)
+        The gravitational constant. The default is the normalization of the
+        accelerations of :class:`.InverseSquareLaw`.
+
+    tile_size : int (default: 256)
+        The number of particles per side of a block of pairs.
+
+    Returns
+    -------
+
+    out : float or numpy.typing.NDArray
+        The potential energy, or the B potential energies of a batched phase
+        space.
+
+    """
+    if phsp.batch is not None:
+        masses = np.broadcast_to(masses, phsp.positions.shape[:2])
+        energies = [
+            _potential_energy(positions, system_masses, softening**2.,
+                              tile_size)
+            for positions, system_masses in zip(phsp.positions, masses)
+        ]
+        return constant * np.array(energies)
+    return constant * _potential_energy(phsp.positions, masses, softening**2.,
+                                        tile_size)
+
+
+def linear_momentum(phsp: PhaseSpace, masses: npt.NDArray) -> npt.NDArray:
+    """
+    Compute the total linear momentum of the system.
+
+    Parameters
+    ----------
+
+    phsp : :class:`.PhaseSpace`
+        An object containing the velocities of the system.
+
+    masses : numpy.typing.NDArray
+        The masses, stored as an N-dimensional array.
+
+    Returns
+    -------
+
+    out : numpy.typing.NDArray
+        The linear momentum, or the B-by-3 array of linear momenta of a
+        batched phase space.
+
+    """
+    return np.sum(masses[..., np.newaxis] * phsp.velocities, axis=-2)
+
+
+def angular_momentum(phsp: PhaseSpace, masses: npt.NDArray) -> npt.NDArray:
+    """
+    Compute the total angular momentum of the system about the origin.
+
+    Parameters
+    ----------
+
+    phsp : :class:`.PhaseSpace`
+        An object containing the positions and velocities of the system.
+
+    masses : numpy.typing.NDArray
+        The masses, stored as an N-dimensional array.
+
+    Returns
+    -------
+
+    out : numpy.typing.NDArray
+        The angular momentum, or the B-by-3 array of angular momenta of a
+        batched phase space.
+
+    """
+    moments = np.cross(phsp.positions, phsp.velocities)
+    return np.sum(masses[..., np.newaxis] * moments, axis=-2)
+
+
+def conserved_quantities(phsp: PhaseSpace,
+                         masses: npt.NDArray,
+                         softening: float = 0.,
+                         constant: float = 1.) -> dict:
+    """
+    Compute all quantities conserved by the evolution of the system.
+
+    Parameters
+    ----------
+
+    phsp : :class:`.PhaseSpace`
+        The phase space of the system.
+
+    masses : numpy.typing.NDArray
+        The masses, stored as an N-dimensional array.
+
+    softening : float (default: 0.)
+        The softening parameter of the interaction.
+
+    constant : float (default: 1.)
+        The gravitational constant, as in :func:`.potential_energy`.
+
+    Returns
+    -------
+
+    out : dict
+        A dictionary holding the keys ``"KineticEnergy"``,
+        ``"PotentialEnergy"``, ``"Energy"``, ``"LinearMomentum"``, and
+        ``"AngularMomentum"``.
+
+    """
+    kinetic = kinetic_energy(phsp, masses)
+    potential = potential_energy(phsp, masses, softening, constant)
+    return {
+        "KineticEnergy": kinetic,
+        "PotentialEnergy": potential,
+        "Energy": kinetic + potential,
+        "LinearMomentum": linear_momentum(phsp, masses),
+        "AngularMomentum": angular_momentum(phsp, masses)
+    }
+
+
+def _potential_energy(positions: npt.NDArray, masses: npt.NDArray,
+                      softening_sq: float, tile: int) -> float:
+    N = positions.shape[0]
+    # Coordinates are stored coordinate-major so that the differences of
+    # every block are built from contiguous rows.
+    coordinates = np.ascontiguousarray(positions.T)
+    energy = 0.
+    for start in range(0, N, tile):
+        rows = slice(start, start + tile)
+        for column_start in range(start, N, tile):
+            columns = slice(column_start, column_start + tile)
+            distances = np.zeros((len(masses[rows]), len(masses[columns])))
+            for x in coordinates:
+                diff = x[rows, np.newaxis] - x[np.newaxis, columns]
+                diff *= diff
+                distances += diff
+            distances += softening_sq
+            np.sqrt(distances, out=distances)
+            # Without softening, the distance of a particle to itself is zero.
+            inv_d = np.zeros_like(distances)
+            np.divide(1., distances, out=inv_d, where=distances > 0.)
+            # Within a diagonal block, every pair is counted once.
+            pairs = np.triu(inv_d, k=1) if column_start == start else inv_d
+            energy -= masses[rows] @ pairs @ masses[columns]
+    return energy
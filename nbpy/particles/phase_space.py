@@ -5,6 +5,8 @@ Defines class :class:`.PhaseSpace`.
 
 """
 
+from typing import Optional
+
 import numpy as np
 import numpy.typing as npt
 
@@ -24,20 +26,41 @@ class PhaseSpace:
     N : int
         The number of particles in the system.
 
+    batch : int (default: None)
+        If given, the number B of independent systems of N particles held
+        together. All arrays then have shape (B, N, 3).
+
     Notes
     -----
 
     - All members are initialized to NaNs during the construction of the
       object. It is expected that these are subsequently set to acceptable
       values later in the simulation using the provided setters.
+    - A batched phase space evolves an ensemble of systems at once. It is
+      supported by :class:`.InverseSquareLaw` and :class:`.Leapfrog`.
+    - :meth:`kick` and :meth:`drift` update the arrays in place through a
+      scratch array of the same shape, allocated on first use, so that they
+      allocate no memory afterwards.
 
     """
 
-    def __init__(self, N: int):
+    def __init__(self, N: int, batch: Optional[int] = None):
+        shape = (N, 3) if batch is None else (batch, N, 3)
+        self._batch = batch
         self._data = {}
-        self._data["Positions"] = np.full((N, 3), np.nan)
-        self._data["Velocities"] = np.full((N, 3), np.nan)
-        self._data["Accelerations"] = np.full((N, 3), np.nan)
+        self._data["Positions"] = np.full(shape, np.nan)
+        self._data["Velocities"] = np.full(shape, np.nan)
+        self._data["Accelerations"] = np.full(shape, np.nan)
+        self._scratch: Optional[npt.NDArray] = None
+
+    @property
+    def batch(self) -> Optional[int]:
+        """
+        The number of systems in the ensemble, or ``None`` if there is a
+        single system.
+
+        """
+        return self._batch
 
     @property
     def positions(self):
@@ -86,3 +109,27 @@ class PhaseSpace:
 
         """
         self._set("Accelerations", value)
+
+    def kick(self, dt: float) -> None:
+        """
+        Advance the velocities by the given time step with the current
+        accelerations, in place.
+
+        """
+        self._advance(self._data["Velocities"], self._data["Accelerations"],
+                      dt)
+
+    def drift(self, dt: float) -> None:
+        """
+        Advance the positions by the given time step with the current
+        velocities, in place.
+
+        """
+        self._advance(self._data["Positions"], self._data["Velocities"], dt)
+
+    def _advance(self, value: npt.NDArray, rate: npt.NDArray,
+                 dt: float) -> None:
+        if self._scratch is None:
+            self._scratch = np.empty_like(value)
+        np.multiply(rate, dt, out=self._scratch)
+        value += self._scratch
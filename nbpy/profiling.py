@@ -0,0 +1,222 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines classes :class:`.PhaseTimer`, :class:`.TimedInteraction`, and
+:class:`.Progress`, which instrument a simulation.
+
+"""
+
+import contextlib
+import time
+from typing import Optional
+
+
+class PhaseTimer:
+    """
+    Accumulates the wall time spent in named phases of a run, and the number
+    of times each phase is entered.
+
+    Phases may be nested, in which case the time of the inner phase is not
+    counted in the outer one, e.g. the force evaluations inside an integrator
+    step.
+
+    Parameters
+    ----------
+
+    enabled : bool (default: True)
+        Whether to time the phases. If false, :meth:`phase` does nothing.
+
+    """
+
+    def __init__(self, enabled: bool = True):
+        self._enabled = enabled
+        self._seconds: dict = {}
+        self._calls: dict = {}
+        self._stack: list = []
+        self._resumed = 0.
+        self._start = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether the phases are timed.
+
+        """
+        return self._enabled
+
+    @property
+    def seconds(self) -> dict:
+        """
+        The wall time in seconds spent in every phase.
+
+        """
+        return dict(self._seconds)
+
+    @property
+    def calls(self) -> dict:
+        """
+        The number of times every phase was entered.
+
+        """
+        return dict(self._calls)
+
+    def phase(self, name: str):
+        """
+        Return a context manager that times the given phase.
+
+        """
+        if not self._enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(None)
+
+    def _switch(self, name: Optional[str]) -> None:
+        # Charge the time since the last switch to the innermost phase.
+        now = time.perf_counter()
+        if self._stack:
+            current = self._stack[-1]
+            self._seconds[current] += now - self._resumed
+        if name is None:
+            self._stack.pop()
+        else:
+            self._stack.append(name)
+            self._seconds.setdefault(name, 0.)
+            self._calls[name] = self._calls.get(name, 0) + 1
+        self._resumed = now
+
+    def report(self, steps: Optional[int] = None) -> str:
+        """
+        Return a table of the time spent in every phase, and in none of them,
+        since the timer was created.
+
+        Parameters
+        ----------
+
+        steps : int (default: None)
+            If given, the number of steps taken, to report the steps per
+            second.
+
+        """
+        total = time.perf_counter() - self._start
+        seconds = dict(self._seconds)
+        seconds["Other"] = max(0., total - sum(self._seconds.values()))
+
+        lines = [f"Total: {total:.3f} s"]
+        if steps:
+            lines[0] += f", {steps} steps, {steps / total:.2f} steps/s"
+        lines.append(f"{'phase':>12} {'seconds':>10} {'percent':>8} "
+                     f"{'calls':>8}")
+        for name, value in seconds.items():
+            calls = self._calls.get(name, "")
+            lines.append(f"{name:>12} {value:>10.3f} "
+                         f"{100. * value / total:>8.1f} {calls:>8}")
+        return "\n".join(lines)
+
+
+class TimedInteraction:
+    """
+    Wraps an interaction to time its force evaluations in the phase
+    ``"Force"`` of a :class:`.PhaseTimer`. All other attributes are those of
+    the wrapped interaction.
+
+    Parameters
+    ----------
+
+    interaction : obj
+        The interaction.
+
+    timer : :class:`.PhaseTimer`
+        The timer.
+
+    """
+
+    def __init__(self, interaction, timer: PhaseTimer):
+        self._interaction = interaction
+        self._timer = timer
+
+    def exert(self, *args, **kwargs):
+        """
+        Time :meth:`exert` of the wrapped interaction.
+
+        """
+        with self._timer.phase("Force"):
+            return self._interaction.exert(*args, **kwargs)
+
+    def exert_on(self, *args, **kwargs):
+        """
+        Time :meth:`exert_on` of the wrapped interaction.
+
+        """
+        with self._timer.phase("Force"):
+            return self._interaction.exert_on(*args, **kwargs)
+
+    def exert_with_jerks(self, *args, **kwargs):
+        """
+        Time :meth:`exert_with_jerks` of the wrapped interaction.
+
+        """
+        with self._timer.phase("Force"):
+            return self._interaction.exert_with_jerks(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._interaction, name)
+
+
+class Progress:
+    """
+    Prints the progress of a run, the steps per second, and the estimated
+    time to completion at regular intervals of wall time.
+
+    Parameters
+    ----------
+
+    first : int
+        The first step of the run.
+
+    last : int
+        The last step of the run.
+
+    every : float
+        The wall time in seconds between progress lines.
+
+    """
+
+    def __init__(self, first: int, last: int, every: float):
+        self._first = first
+        self._last = last
+        self._every = every
+        self._start = time.perf_counter()
+        self._next = self._start + every
+
+    def update(self, step: int) -> None:
+        """
+        Print a progress line if it is due after the given step.
+
+        """
+        now = time.perf_counter()
+        if now < self._next:
+            return
+        self._next = now + self._every
+
+        done = step - self._first + 1
+        rate = done / (now - self._start)
+        eta = (self._last - step) / rate
+        print(f"Step {step}/{self._last} "
+              f"({100. * step / max(self._last, 1):.1f}%), "
+              f"{rate:.2f} steps/s, ETA {_clock(eta)}")
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+def _clock(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
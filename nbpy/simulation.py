@@ -5,9 +5,14 @@ Defines the function that runs the simulation.
 
 """
 
+import contextlib
+import cProfile
+from typing import Iterator, Optional
+
 import numpy as np
+import numpy.typing as npt
 
-from nbpy import evolution, interactions, io, particles
+from nbpy import evolution, interactions, io, particles, profiling
 
 
 def run(inputfile: str) -> None:
@@ -23,45 +28,246 @@ def run(inputfile: str) -> None:
     """
     options = io.input_from_yaml(inputfile)
 
-    particle_opts = options["Particles"]
-    N = particle_opts["N"]
-    masses = np.ones(N)
-
     evolution_opts = options["Evolution"]
-    dt = evolution_opts["InitialDt"]
     timesteps = evolution_opts["Timesteps"]
-    integrator = evolution.Leapfrog()
+    integrator = _from_options(evolution.Integrators,
+                               evolution_opts.get("Integrator", "Leapfrog"))
 
     observer_opts = options["Observers"]
     observing = observer_opts["Observing"]
 
-    # Interaction's properties.
-    constant = 4. * np.pi**2.
-    softening = 1.e-2
-    interaction = interactions.InverseSquareLaw(constant, softening)
+    # The interaction section holds a single interaction and its parameters.
+    interaction = _from_options(interactions.Interactions,
+                                options["Interaction"])
+    _check_batch(options["Particles"], integrator, interaction)
+
+    instrumentation_opts = options.get("Instrumentation", {})
+    timer, interaction = _timed(instrumentation_opts, interaction)
+    progress_every = instrumentation_opts.get("ProgressEvery")
+    profile_file = instrumentation_opts.get("Profile")
+
+    # Checkpoints hold the full state, from which the run can be resumed.
+    checkpoint_opts = options.get("Checkpoints", {})
+    checkpoint_every = checkpoint_opts.get("Every")
+    checkpoint_file = checkpoint_opts.get("Filename", "Checkpoint")
+    restart = checkpoint_opts.get("Restart", False)
+
+    if restart:
+        phsp, masses, time, parameters = _restart(checkpoint_file, integrator)
+    else:
+        phsp, masses, time, parameters = _start(options, interaction)
+    dt = parameters["InitialDt"]
+
+    if observing:
+        observer, writer = _open_observer(observer_opts,
+                                          phsp,
+                                          masses,
+                                          time,
+                                          timesteps=timesteps,
+                                          dt=dt,
+                                          restart=restart)
+
+    first_step = time.id_ + 1
+    progress = (profiling.Progress(first_step, timesteps, progress_every)
+                if progress_every else None)
+
+    print("Running evolution...")
+    try:
+        with _profiled(profile_file):
+            for time_id in range(first_step, timesteps + 1):
+                with timer.phase("Integrator"):
+                    integrator.evolve(phsp, dt, masses, interaction)
+                time = evolution.Time(time_id, dt * time_id)
+                if observing:
+                    with timer.phase("Output"):
+                        observer.observe(writer, phsp, time)
+                if checkpoint_every and time_id % checkpoint_every == 0:
+                    with timer.phase("Checkpoint"):
+                        # The snapshots up to the checkpoint must be on disk
+                        # before it, so that a restart finds them.
+                        if observing:
+                            writer.flush()
+                        io.write_checkpoint(checkpoint_file, phsp, masses,
+                                            time, parameters, integrator)
+                if progress is not None:
+                    progress.update(time_id)
+    finally:
+        if observing:
+            with timer.phase("Output"):
+                writer.close()
+
+    print("Done!")
+    if timer.enabled:
+        print(timer.report(timesteps - first_step + 1))
+    if profile_file:
+        print(f"Profile written to {profile_file}. View it with "
+              f"python -m pstats {profile_file}")
+
+
+def _check_batch(particle_opts: dict, integrator, interaction) -> None:
+    """
+    Raise a ValueError if a batch of systems is requested, but the integrator
+    or the interaction does not support batched phase spaces.
+
+    """
+    if particle_opts.get("Batch") is None:
+        return
+    for engine in (integrator, interaction):
+        if not engine.supports_batch():
+            raise ValueError(f"{type(engine).__name__} does not support a "
+                             "batch of systems.")
+
+
+def _start(options: dict, interaction) -> tuple:
+    """
+    Set up the initial state from the particles and initial data sections of
+    the input options, and return the phase space, the masses, the time, and
+    the parameters of the run.
+
+    """
+    # In ensemble mode, a batch of independent systems is evolved at once.
+    # The masses are either equal or given for every particle.
+    particle_opts = options["Particles"]
+    N = particle_opts["N"]
+    batch = particle_opts.get("Batch")
+    masses = np.broadcast_to(
+        np.asarray(particle_opts.get("Masses", 1.), dtype=np.float64),
+        (N, ) if batch is None else (batch, N)).copy()
+
+    # Without an initial data section, particles are distributed randomly.
+    initial_state = _from_options(
+        evolution.Distributions,
+        options.get("InitialData", {
+            "RandomDistribution": {
+                "Seed": particle_opts.get("Seed", 25092020)
+            }
+        }))
+    parameters = {"InitialDt": options["Evolution"]["InitialDt"]}
+    if hasattr(initial_state, "seed"):
+        parameters["Seed"] = initial_state.seed
 
     # Holds phase space variables: positions, velocities, accelerations.
-    phsp = particles.PhaseSpace(N)
+    phsp = particles.PhaseSpace(N, batch)
 
     print("Loading initial data...")
-    time = evolution.Time(0, 0.)
-    initial_state = evolution.RandomDistribution()
-    initial_state.set_variables(phsp)
+    initial_state.set_variables(phsp, masses)
     print("Initial data loaded.")
 
     # With the initial conditions set, calculate initial accelerations.
     interaction.exert(phsp, masses)
 
-    if observing:
-        filepath = io.write_snapshot_to_disk(observer_opts, phsp.positions,
-                                             time)
-        print(f"Writing data to {filepath}")
+    return phsp, masses, evolution.Time(0, 0.), parameters
 
-    print("Running evolution...")
-    for time_id in range(1, timesteps + 1):
-        integrator.evolve(phsp, dt, masses, interaction)
-        if observing:
-            time = evolution.Time(time_id, dt * time_id)
-            io.write_snapshot_to_disk(observer_opts, phsp.positions, time)
 
-    print("Done!")
+def _restart(checkpoint_file: str, integrator: evolution.Integrator) -> tuple:
+    """
+    Read the checkpoint from which the run is resumed, set the state of the
+    integrator, and return the phase space, the masses, the time, and the
+    parameters of the run.
+
+    """
+    print(f"Restarting from checkpoint {checkpoint_file}...")
+    state = io.read_checkpoint(checkpoint_file)
+    io.restore_integrator(integrator, state)
+    print(f"Restarted at time {state['Time'].value}.")
+    return (state["PhaseSpace"], state["Masses"], state["Time"],
+            state["Parameters"])
+
+
+def _open_observer(observer_opts: dict, phsp: particles.PhaseSpace,
+                   masses: npt.NDArray, time: evolution.Time, *,
+                   timesteps: int, dt: float, restart: bool) -> tuple:
+    """
+    Construct the observer and its writer. A new run is observed at its
+    initial time, while a resumed run appends to the snapshots written up to
+    the checkpoint.
+
+    """
+    # The observer sets the cadence and the data to write. An asynchronous
+    # writer overlaps the output with the evolution.
+    observer = io.Observer.from_dict(observer_opts)
+    capacity = observer.capacity(timesteps, dt)
+    writer = _open_writer(observer_opts, observer.n_observed(masses.size),
+                          capacity, observer.snapshot_fields,
+                          time.id_ if restart else None)
+    if restart:
+        observer.resume(time)
+    else:
+        observer.start(writer, masses)
+        observer.observe(writer, phsp, time)
+    print(f"Writing data to {writer.path}")
+    return observer, writer
+
+
+def _timed(instrumentation_opts: dict, interaction) -> tuple:
+    """
+    Return the phase timer and the interaction, whose force evaluations are
+    timed if timing is requested.
+
+    """
+    # Phases are timed only if requested, so that the overhead is negligible
+    # otherwise. Force evaluations are timed inside the integrator step.
+    timer = profiling.PhaseTimer(instrumentation_opts.get("Timing", False))
+    if timer.enabled:
+        interaction = profiling.TimedInteraction(interaction, timer)
+    return timer, interaction
+
+
+@contextlib.contextmanager
+def _profiled(profile_file: Optional[str]) -> Iterator[None]:
+    """
+    Profile the enclosed code with cProfile and write the statistics to the
+    given file, if a file name is given.
+
+    """
+    if not profile_file:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_file)
+
+
+def _from_options(registry, options):
+    """
+    Construct an object from its options, which are either the name of its
+    type in the given registry, or a dictionary holding the name as its only
+    key and the parameters as the value.
+
+    """
+    type_, params = _lookup(registry, options)
+    return type_.from_dict(params)
+
+
+def _lookup(registry, options) -> tuple:
+    """
+    Return the type named in the options, as taken by :func:`_from_options`,
+    and its parameters.
+
+    """
+    if isinstance(options, str):
+        options = {options: {}}
+    (name, params), = options.items()
+    types = registry.typedict()
+    if name not in types:
+        raise ValueError(f"Unknown type: {name}. "
+                         f"Types available: {list(types)}.")
+    return types[name], params or {}
+
+
+def _open_writer(observer_opts: dict, n_particles: int, capacity: int,
+                 fields: tuple, resume_after: Optional[int]) -> io.Writer:
+    """
+    Return the snapshot writer of the observer options, which writes in a
+    background thread if the option ``"Asynchronous"`` is true.
+
+    """
+    if observer_opts.get("Asynchronous", False):
+        return io.AsyncSnapshotWriter.from_dict(observer_opts, n_particles,
+                                                capacity, fields, resume_after)
+    return io.SnapshotWriter.from_dict(observer_opts, n_particles, capacity,
+                                       fields, resume_after)
@@ -0,0 +1,248 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the functions that run a sweep of simulations over a grid of
+parameters in a pool of processes.
+
+Run as ``python -m nbpy.sweep Input Grid --workers 8``, where ``Input.yml`` is
+the base input file and ``Grid.yml`` maps options to the lists of values to
+sweep, e.g.
+
+.. code-block::
+
+    Particles.N: [1000, 2000, 4000]
+    Particles.Seed: [1, 2, 3]
+    Interaction.InverseSquareLaw.Softening: [1.e-2, 1.e-3]
+
+"""
+
+import argparse
+import contextlib
+import copy
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
+
+import yaml
+
+from nbpy import interactions, io, simulation
+
+
+def expand_grid(grid: dict) -> list:
+    """
+    Return the Cartesian product of the values of a grid of parameters.
+
+    Parameters
+    ----------
+
+    grid : dict
+        The lists of values to sweep, keyed by the path of the option in the
+        input file, with the sections separated by dots.
+
+    Returns
+    -------
+
+    out : list
+        A dictionary of option paths and values for every point of the grid,
+        with the last option varying fastest.
+
+    """
+    keys = list(grid)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def job_memory(options: dict) -> int:
+    """
+    Return the approximate peak memory in bytes of a simulation: the phase
+    space, the masses, and the temporaries of a force evaluation.
+
+    Parameters
+    ----------
+
+    options : dict
+        The options of the simulation, as read by :func:`.input_from_yaml`.
+
+    """
+    N = options["Particles"]["N"]
+    batch = options["Particles"].get("Batch")
+
+    # The interaction is not constructed, since some interactions allocate
+    # large arrays when constructed.
+    # pylint: disable-next=protected-access
+    interaction_type, params = simulation._lookup(interactions.Interactions,
+                                                  options["Interaction"])
+
+    # Positions, velocities, and accelerations, plus the masses.
+    state = 10 * N * (batch or 1) * 8
+    return state + interaction_type.scratch_bytes_from_dict(params, N, batch)
+
+
+def run_sweep(inputfile: str,
+              grid: dict,
+              folder: str = "Sweep",
+              workers: Optional[int] = None,
+              memory_limit: Optional[float] = None) -> list:
+    """
+    Run a simulation for every point of a grid of parameters.
+
+    Every job runs in its own process and folder ``<folder>/Job<index>``,
+    which holds its input file, log, and output files. Jobs are started in
+    order as long as the sum of their memory estimates fits in the memory
+    limit, so that large jobs run with fewer others alongside.
+
+    Parameters
+    ----------
+
+    inputfile : str
+        The name of the base YAML input file, without extension.
+
+    grid : dict
+        The lists of values to sweep, as taken by :func:`.expand_grid`.
+
+    folder : str (default: "Sweep")
+        The folder holding the job folders and the summary.
+
+    workers : int (default: None)
+        The maximum number of processes. Defaults to the number of CPUs.
+
+    memory_limit : float (default: None)
+        The number of bytes that the running jobs may use, as estimated by
+        :func:`.job_memory`. Defaults to the available physical memory, if it
+        can be determined. A job that exceeds the limit runs alone.
+
+    Returns
+    -------
+
+    out : list
+        A dictionary for every job, with keys ``"Job"``, ``"Parameters"``,
+        ``"Folder"``, ``"Status"`` (``"Done"`` or ``"Failed"``),
+        ``"WallTime"``, and ``"Error"``. The list is also written to
+        ``<folder>/Summary.yml``.
+
+    """
+    base = io.input_from_yaml(inputfile)
+    workers = workers or os.cpu_count() or 1
+    if memory_limit is None:
+        memory_limit = _available_memory()
+
+    jobs = []
+    for index, parameters in enumerate(expand_grid(grid)):
+        options = copy.deepcopy(base)
+        for key, value in parameters.items():
+            _set_option(options, key, value)
+        path = os.path.join(folder, f"Job{index:04d}")
+        jobs.append({
+            "Job": index,
+            "Parameters": parameters,
+            "Folder": os.path.abspath(path),
+            "Options": options,
+            "Memory": job_memory(options)
+        })
+
+    summary = []
+    running: dict = {}
+    memory_used = 0
+    with ProcessPoolExecutor(workers) as executor:
+        while jobs or running:
+            while jobs and len(running) < workers:
+                job = jobs[0]
+                if (running and memory_limit is not None
+                        and memory_used + job["Memory"] > memory_limit):
+                    break
+                future = executor.submit(_run_job, job["Folder"],
+                                         job["Options"])
+                running[future] = jobs.pop(0)
+                memory_used += job["Memory"]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                memory_used -= job["Memory"]
+                status, wall_time, error = future.result()
+                print(f"Job {job['Job']}: {status} in {wall_time:.2f} s "
+                      f"{job['Parameters']}")
+                summary.append({
+                    "Job": job["Job"],
+                    "Parameters": job["Parameters"],
+                    "Folder": job["Folder"],
+                    "Status": status,
+                    "WallTime": wall_time,
+                    "Error": error
+                })
+
+    summary.sort(key=lambda entry: entry["Job"])
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "Summary.yml"), "w",
+              encoding="utf-8") as outfile:
+        yaml.safe_dump(summary, outfile, sort_keys=False)
+    return summary
+
+
+def _set_option(options: dict, key: str, value) -> None:
+    *sections, name = key.split(".")
+    for section in sections:
+        options = options.setdefault(section, {})
+    options[name] = value
+
+
+def _available_memory() -> Optional[int]:
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _run_job(folder: str, options: dict) -> tuple:
+    """
+    Run a simulation in the given folder, and return its status, wall time,
+    and error message, if any.
+
+    """
+    os.makedirs(folder, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(folder)
+    start = time.perf_counter()
+    try:
+        with open("Input.yml", "w", encoding="utf-8") as outfile:
+            yaml.safe_dump(options, outfile, sort_keys=False)
+        with open("Log.txt", "w", encoding="utf-8") as log:
+            with contextlib.redirect_stdout(log):
+                simulation.run("Input")
+        status, error = "Done", None
+    except Exception as err:  # pylint: disable=broad-except
+        status, error = "Failed", f"{type(err).__name__}: {err}"
+    finally:
+        os.chdir(cwd)
+    return status, time.perf_counter() - start, error
+
+
+def main() -> None:
+    """
+    Run the sweep given in the command line and print its summary.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("inputfile", help="base input file, no extension")
+    parser.add_argument("gridfile", help="grid file, no extension")
+    parser.add_argument("--folder", default="Sweep")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--memory-limit", type=float, default=None)
+    args = parser.parse_args()
+
+    grid = io.input_from_yaml(args.gridfile)
+    summary = run_sweep(args.inputfile,
+                        grid,
+                        folder=args.folder,
+                        workers=args.workers,
+                        memory_limit=args.memory_limit)
+    failed = sum(entry["Status"] != "Done" for entry in summary)
+    print(f"{len(summary) - failed} jobs done, {failed} failed.")
+
+
+if __name__ == "__main__":
+    main()
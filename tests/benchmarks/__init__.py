@@ -0,0 +1,2 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
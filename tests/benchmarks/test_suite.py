@@ -0,0 +1,82 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for module `benchmarks.suite`.
+
+"""
+
+import unittest
+
+import numpy as np
+
+from nbpy.benchmarks import suite
+
+
+class TestSuite(unittest.TestCase):
+    """
+    Test module `benchmarks.suite`.
+
+    """
+
+    def test_run_suite(self):
+        """
+        Test that every benchmark reports its metrics for every N.
+
+        """
+        results = suite.run_suite([8, 16], repeats=1)
+        benchmarks = [(entry["Benchmark"], entry["N"])
+                      for entry in results["Results"]]
+        for N in (8, 16):
+            for name in ("Force", "Integrator", "WriteSnapshotToDisk",
+                         "SnapshotWriter"):
+                self.assertIn((name, N), benchmarks)
+        for entry in results["Results"]:
+            for metric, value in entry.items():
+                if metric != "Benchmark":
+                    self.assertTrue(np.isfinite(value) and value > 0.)
+
+    def test_compare(self):
+        """
+        Test that only throughputs lower and peak memories higher than the
+        baseline beyond the threshold are reported.
+
+        """
+        baseline = {
+            "Results": [{
+                "Benchmark": "Force",
+                "N": 8,
+                "PairsPerSecond": 100.,
+                "PeakMiB": 1.
+            }, {
+                "Benchmark": "Force",
+                "N": 16,
+                "PairsPerSecond": 100.,
+                "PeakMiB": 1.
+            }]
+        }
+        results = {
+            "Results": [{
+                "Benchmark": "Force",
+                "N": 8,
+                "PairsPerSecond": 85.,
+                "PeakMiB": 0.5
+            }, {
+                "Benchmark": "Force",
+                "N": 16,
+                "PairsPerSecond": 200.,
+                "PeakMiB": 1.05
+            }, {
+                "Benchmark": "Force",
+                "N": 32,
+                "PairsPerSecond": 1.,
+                "PeakMiB": 100.
+            }]
+        }
+
+        regressions = suite.compare(results, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]["N"], 8)
+        self.assertEqual(regressions[0]["Metric"], "PairsPerSecond")
+        self.assertAlmostEqual(regressions[0]["Change"], -0.15)
+
+        self.assertEqual(suite.compare(results, baseline, threshold=0.2), [])
@@ -0,0 +1,128 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.BlockTimestep`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import BlockTimestep, Leapfrog
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace, conserved_quantities
+
+
+class TestBlockTimestep(unittest.TestCase):
+    """
+    Test class `evolution.BlockTimestep`.
+
+    """
+
+    _seed: int
+    _law: InverseSquareLaw
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        # The specific law we use is unimportant.
+        cls._law = InverseSquareLaw(np.random.rand(), np.random.rand())
+
+    def _random_phase_space(self, N: int, masses: np.ndarray) -> PhaseSpace:
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        phsp.set_velocities(np.random.randn(N, 3))
+        self._law.exert(phsp, masses)
+        return phsp
+
+    @staticmethod
+    def _copy(phsp: PhaseSpace) -> PhaseSpace:
+        copy = PhaseSpace(phsp.positions.shape[0])
+        copy.set_positions(phsp.positions)
+        copy.set_velocities(phsp.velocities)
+        copy.set_accelerations(phsp.accelerations)
+        return copy
+
+    def _assert_phase_spaces_close(self, phsp, phsp_expected) -> None:
+        for name in ("positions", "velocities", "accelerations"):
+            self.assertTrue(np.allclose(getattr(phsp, name),
+                                        getattr(phsp_expected, name)),
+                            msg=f"new {name} differs from expected value. "
+                            f"RNG seed: {self._seed}.")
+
+    def test_single_level(self):
+        """
+        Test that a single level reduces to `evolution.Leapfrog`.
+
+        """
+        N = np.random.randint(2, 10)
+        masses = np.random.rand(N)
+        phsp = self._random_phase_space(N, masses)
+        phsp_expected = self._copy(phsp)
+
+        dt = np.random.rand()
+        BlockTimestep(max_level=0).evolve(phsp, dt, masses, self._law)
+        Leapfrog().evolve(phsp_expected, dt, masses, self._law)
+
+        self._assert_phase_spaces_close(phsp, phsp_expected)
+
+    def test_deepest_level(self):
+        """
+        Test that particles that all require the smallest time step are
+        evolved as by `evolution.Leapfrog` with that step.
+
+        """
+        N = np.random.randint(2, 10)
+        masses = np.random.rand(N)
+        phsp = self._random_phase_space(N, masses)
+        phsp_expected = self._copy(phsp)
+
+        dt = np.random.rand()
+        max_level = np.random.randint(1, 4)
+        stepper = BlockTimestep(max_level=max_level, accuracy=1.e-12)
+        stepper.evolve(phsp, dt, masses, self._law)
+        leapfrog = Leapfrog()
+        for _ in range(2**max_level):
+            leapfrog.evolve(phsp_expected, dt / 2**max_level, masses,
+                            self._law)
+
+        self._assert_phase_spaces_close(phsp, phsp_expected)
+        self.assertTrue(np.all(stepper.levels == max_level),
+                        msg="levels differ from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_levels(self):
+        """
+        Test that a close pair takes smaller steps than distant particles, and
+        that the energy is conserved.
+
+        """
+        masses = np.array([1., 1., 1.e-3, 1.e-3])
+        softening = 1.e-3
+        law = InverseSquareLaw(1., softening)
+
+        # A circular binary of separation 0.02 and two distant particles.
+        speed = np.sqrt(1. / (2. * 0.02))
+        phsp = PhaseSpace(4)
+        phsp.set_positions([[0.01, 0., 0.], [-0.01, 0., 0.], [5., 0., 0.],
+                            [0., 5., 1.]])
+        phsp.set_velocities([[0., speed, 0.], [0., -speed, 0.], [0., 0.3, 0.],
+                             [0.3, 0., 0.]])
+        law.exert(phsp, masses)
+
+        initial = conserved_quantities(phsp, masses, softening)
+        stepper = BlockTimestep(max_level=8, accuracy=0.05, length=0.01)
+        for _ in range(10):
+            stepper.evolve(phsp, 0.05, masses, law)
+        final = conserved_quantities(phsp, masses, softening)
+
+        self.assertTrue(np.all(stepper.levels[:2] > stepper.levels[2:]),
+                        msg=f"levels {stepper.levels} do not follow the "
+                        "dynamics. "
+                        f"RNG seed: {self._seed}.")
+        self.assertLess(abs(final["Energy"] / initial["Energy"] - 1.),
+                        1.e-3,
+                        msg="energy is not conserved. "
+                        f"RNG seed: {self._seed}.")
@@ -0,0 +1,41 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.ColdCollapse`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import ColdCollapse, UniformSphere
+from nbpy.particles import PhaseSpace
+
+
+class TestColdCollapse(unittest.TestCase):
+    """
+    Test class `evolution.ColdCollapse`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+    def test_set_variables(self):
+        """
+        Test that the particles start at rest at the positions of a uniform
+        sphere.
+
+        """
+        N = np.random.randint(2, 100)
+        phsp, sphere = PhaseSpace(N), PhaseSpace(N)
+        ColdCollapse.from_dict({"Seed": self._seed}).set_variables(phsp)
+        UniformSphere(self._seed).set_variables(sphere)
+        self.assertTrue(np.array_equal(phsp.positions, sphere.positions),
+                        msg="positions differ from those of a uniform "
+                        f"sphere. RNG seed: {self._seed}.")
+        self.assertTrue(np.all(phsp.velocities == 0.),
+                        msg="particles not at rest. "
+                        f"RNG seed: {self._seed}.")
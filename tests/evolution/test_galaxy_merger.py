@@ -0,0 +1,98 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.GalaxyMerger`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import GalaxyMerger
+from nbpy.particles import PhaseSpace
+
+
+class TestGalaxyMerger(unittest.TestCase):
+    """
+    Test class `evolution.GalaxyMerger`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._separation = 10. + 10. * np.random.rand()
+        cls._impact = np.random.rand()
+        cls._dist = GalaxyMerger(cls._seed,
+                                 separation=cls._separation,
+                                 impact_parameter=cls._impact)
+
+    def test_reproducible(self):
+        """
+        Test that the same seed gives the same phase space.
+
+        """
+        N = np.random.randint(2, 100)
+        phsp, other = PhaseSpace(N), PhaseSpace(N)
+        self._dist.set_variables(phsp)
+        GalaxyMerger.from_dict({
+            "Seed": self._seed,
+            "Separation": self._separation,
+            "ImpactParameter": self._impact
+        }).set_variables(other)
+        self.assertTrue(np.array_equal(phsp.positions, other.positions),
+                        msg="positions differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.array_equal(phsp.velocities, other.velocities),
+                        msg="velocities differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_orbit(self):
+        """
+        Test the relative position and velocity of the galaxies, and the
+        center of mass of a batch of systems.
+
+        """
+        N = 2 * np.random.randint(10, 100)
+        batch = np.random.randint(2, 5)
+        masses = np.random.rand(batch, N)
+        phsp = PhaseSpace(N, batch)
+        self._dist.set_variables(phsp, masses)
+
+        centers = []
+        for galaxy in (slice(None, N // 2), slice(N // 2, None)):
+            weights = masses[..., galaxy, np.newaxis]
+            positions = phsp.positions[..., galaxy, :]
+            velocities = phsp.velocities[..., galaxy, :]
+            mass = np.sum(weights, axis=-2)
+            center = np.sum(weights * positions, axis=-2) / mass
+            momentum = np.sum(weights * velocities, axis=-2)
+            centers.append((center, momentum, mass))
+        first, first_momentum, first_mass = centers[0]
+        second, second_momentum, second_mass = centers[1]
+
+        self.assertTrue(np.allclose(second - first,
+                                    [self._separation, self._impact, 0.]),
+                        msg="separation differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(first_momentum + second_momentum, 0.),
+                        msg="center of mass not at rest. "
+                        f"RNG seed: {self._seed}.")
+
+        # By default, the relative speed is that of a parabolic orbit.
+        relative = second_momentum / second_mass - first_momentum / first_mass
+        distance = np.hypot(self._separation, self._impact)
+        speeds = np.sqrt(2. * (first_mass + second_mass) / distance)
+        self.assertTrue(np.allclose(relative, speeds * [-1., 0., 0.]),
+                        msg="relative velocity differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_too_few_particles(self):
+        """
+        Test that a single particle cannot make a merger.
+
+        """
+        with self.assertRaises(ValueError):
+            self._dist.set_variables(PhaseSpace(1))
@@ -0,0 +1,85 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.Hermite`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import Hermite
+from nbpy.interactions import BarnesHut, InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+
+class TestHermite(unittest.TestCase):
+    """
+    Test class `evolution.Hermite`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        # A large softening keeps the orbits smooth at the steps used.
+        cls._law = InverseSquareLaw(1., 0.5 + np.random.rand())
+
+    def _phase_space(self, N):
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        phsp.set_velocities(0.3 * np.random.randn(N, 3))
+        return phsp
+
+    def test_state(self):
+        """
+        Test that the jerks kept between steps survive a round trip through
+        `get_state` and `set_state`, and are computed anew without them.
+
+        """
+        N = np.random.randint(2, 10)
+        masses = np.random.rand(N)
+        phsp = self._phase_space(N)
+        self._law.exert(phsp, masses)
+
+        stepper = Hermite()
+        self.assertEqual(stepper.get_state(), {})
+        stepper.evolve(phsp, 1.e-1, masses, self._law)
+        state = stepper.get_state()
+
+        # The jerks kept are evaluated at the predicted state, so that
+        # computing them anew at the corrected state changes the step.
+        steps = []
+        for restored in (state, {}):
+            copy = PhaseSpace(N)
+            copy.set_positions(phsp.positions)
+            copy.set_velocities(phsp.velocities)
+            copy.set_accelerations(phsp.accelerations)
+            resumed = Hermite()
+            resumed.set_state(restored)
+            resumed.evolve(copy, 1.e-1, masses, self._law)
+            steps.append(copy.positions)
+
+        stepper.evolve(phsp, 1.e-1, masses, self._law)
+        self.assertTrue(np.array_equal(steps[0], phsp.positions),
+                        msg="step after set_state differs from expected "
+                        f"step. RNG seed: {self._seed}.")
+        self.assertFalse(np.array_equal(steps[1], phsp.positions),
+                         msg="step without the kept jerks equals expected "
+                         f"step. RNG seed: {self._seed}.")
+
+    def test_interaction_without_jerks(self):
+        """
+        Test that an interaction that does not compute jerks is rejected.
+
+        """
+        N = np.random.randint(2, 10)
+        masses = np.random.rand(N)
+        phsp = self._phase_space(N)
+        tree = BarnesHut(1., 0.1)
+        tree.exert(phsp, masses)
+
+        with self.assertRaisesRegex(ValueError, "BarnesHut"):
+            Hermite().evolve(phsp, 1.e-2, masses, tree)
@@ -0,0 +1,91 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.HernquistSphere`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import HernquistSphere
+from nbpy.particles import PhaseSpace, conserved_quantities
+
+
+class TestHernquistSphere(unittest.TestCase):
+    """
+    Test class `evolution.HernquistSphere`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._radius = 0.5 + np.random.rand()
+        cls._dist = HernquistSphere(cls._seed, cls._radius)
+
+    def test_reproducible(self):
+        """
+        Test that the same seed gives the same phase space.
+
+        """
+        N = np.random.randint(2, 100)
+        phsp, other = PhaseSpace(N), PhaseSpace(N)
+        self._dist.set_variables(phsp)
+        HernquistSphere(self._seed, self._radius).set_variables(other)
+        self.assertTrue(np.array_equal(phsp.positions, other.positions),
+                        msg="positions differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.array_equal(phsp.velocities, other.velocities),
+                        msg="velocities differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_equilibrium(self):
+        """
+        Test the half-mass radius, the virial ratio, the escape speed, and the
+        center of mass.
+
+        """
+        N = 4000
+        masses = np.full(N, 1. / N)
+        phsp = PhaseSpace(N)
+        self._dist.set_variables(phsp, masses)
+        quantities = conserved_quantities(phsp, masses, softening=1.e-3)
+
+        self.assertTrue(np.allclose(masses @ phsp.positions, 0.),
+                        msg="center of mass not at the origin. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(quantities["LinearMomentum"], 0.),
+                        msg="center of mass not at rest. "
+                        f"RNG seed: {self._seed}.")
+
+        ratio = quantities["KineticEnergy"] / -quantities["PotentialEnergy"]
+        self.assertAlmostEqual(ratio,
+                               0.5,
+                               delta=0.1,
+                               msg="virial ratio differs from 0.5. "
+                               f"RNG seed: {self._seed}.")
+
+        # Half the particles of the truncated profile lie within 2.33 scale
+        # radii.
+        radii = np.linalg.norm(phsp.positions, axis=-1)
+        self.assertAlmostEqual(np.median(radii) / self._radius,
+                               2.33,
+                               delta=0.3,
+                               msg="half-mass radius differs from expected "
+                               f"value. RNG seed: {self._seed}.")
+
+    def test_batch(self):
+        """
+        Test that every system of a batch is centered.
+
+        """
+        N = np.random.randint(2, 100)
+        batch = np.random.randint(2, 5)
+        phsp = PhaseSpace(N, batch)
+        self._dist.set_variables(phsp)
+        self.assertTrue(np.allclose(np.mean(phsp.velocities, axis=-2), 0.),
+                        msg="center of mass not at rest. "
+                        f"RNG seed: {self._seed}.")
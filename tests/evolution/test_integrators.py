@@ -0,0 +1,75 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for the integrators of `evolution.Integrators`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import Integrators
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+# Order of convergence of the integrators with a fixed time step.
+# BlockTimestep adapts its substeps, hence has no fixed order.
+_ORDERS = {"Leapfrog": 2, "ForestRuth": 4, "Hermite": 4}
+
+
+class TestIntegrators(unittest.TestCase):
+    """
+    Test the integrators of `evolution.Integrators`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        # A large softening keeps the orbits smooth at the steps used.
+        cls._law = InverseSquareLaw(1., 0.5 + np.random.rand())
+
+    def _final_positions(self, stepper, positions, velocities, masses, dt):
+        N = masses.size
+        phsp = PhaseSpace(N)
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
+        self._law.exert(phsp, masses)
+        for _ in range(int(round(1. / dt))):
+            stepper.evolve(phsp, dt, masses, self._law)
+        return phsp.positions
+
+    def test_order(self):
+        """
+        Test that the error decreases as the power of the time step given by
+        the order of every integrator.
+
+        """
+        dim = 3
+        N = np.random.randint(2, 10)
+        masses = np.random.rand(N) / N
+        positions = np.random.randn(N, dim)
+        velocities = 0.3 * np.random.randn(N, dim)
+
+        for integrator_type in Integrators.typelist():
+            order = _ORDERS.get(integrator_type.name())
+            if order is None:
+                continue
+            # Every run starts from a new integrator, without kept state.
+            expected = self._final_positions(integrator_type.from_dict({}),
+                                             positions, velocities, masses,
+                                             1. / 512.)
+            errors = []
+            for dt in (1. / 16., 1. / 32.):
+                final = self._final_positions(integrator_type.from_dict({}),
+                                              positions, velocities, masses,
+                                              dt)
+                errors.append(np.max(np.abs(final - expected)))
+
+            self.assertGreater(errors[0] / errors[1],
+                               0.75 * 2.**order,
+                               msg=f"error of {integrator_type.name()} does "
+                               f"not decrease as dt^{order}. "
+                               f"RNG seed: {self._seed}.")
@@ -0,0 +1,110 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.PlummerSphere`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import PlummerSphere
+from nbpy.particles import PhaseSpace, conserved_quantities
+
+
+class TestPlummerSphere(unittest.TestCase):
+    """
+    Test class `evolution.PlummerSphere`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._radius = 0.5 + np.random.rand()
+        cls._dist = PlummerSphere(cls._seed, cls._radius)
+
+    def test_reproducible(self):
+        """
+        Test that the same seed gives the same phase space.
+
+        """
+        N = np.random.randint(2, 100)
+        phsp, other = PhaseSpace(N), PhaseSpace(N)
+        self._dist.set_variables(phsp)
+        PlummerSphere(self._seed, self._radius).set_variables(other)
+        self.assertTrue(np.array_equal(phsp.positions, other.positions),
+                        msg="positions differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.array_equal(phsp.velocities, other.velocities),
+                        msg="velocities differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_equilibrium(self):
+        """
+        Test the half-mass radius, the virial ratio, and the center of mass.
+
+        """
+        N = 4000
+        masses = np.random.rand(N)
+        phsp = PhaseSpace(N)
+        self._dist.set_variables(phsp, masses)
+        quantities = conserved_quantities(phsp, masses, softening=1.e-3)
+
+        self.assertTrue(np.allclose(masses @ phsp.positions, 0.),
+                        msg="center of mass not at the origin. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(quantities["LinearMomentum"], 0.),
+                        msg="center of mass not at rest. "
+                        f"RNG seed: {self._seed}.")
+
+        ratio = quantities["KineticEnergy"] / -quantities["PotentialEnergy"]
+        self.assertAlmostEqual(ratio,
+                               0.5,
+                               delta=0.1,
+                               msg="virial ratio differs from 0.5. "
+                               f"RNG seed: {self._seed}.")
+
+        # The positions do not depend on the masses, so half the particles
+        # lie within 1.305 scale radii.
+        radii = np.linalg.norm(phsp.positions, axis=-1)
+        self.assertAlmostEqual(np.median(radii) / self._radius,
+                               1.305,
+                               delta=0.15,
+                               msg="half-mass radius differs from expected "
+                               f"value. RNG seed: {self._seed}.")
+
+    def test_truncation(self):
+        """
+        Test that no particle lies beyond the truncation radius.
+
+        """
+        N = np.random.randint(100, 1000)
+        truncation = 1. + np.random.rand()
+        phsp = PhaseSpace(N)
+        PlummerSphere(self._seed, self._radius, truncation).set_variables(phsp)
+        radii = np.linalg.norm(phsp.positions, axis=-1)
+        # Recentering may move the particles by a small amount.
+        self.assertTrue(np.all(radii < 1.1 * truncation * self._radius),
+                        msg="particles beyond the truncation radius. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_batch(self):
+        """
+        Test that every system of a batch is centered.
+
+        """
+        N = np.random.randint(2, 100)
+        batch = np.random.randint(2, 5)
+        masses = np.random.rand(batch, N)
+        phsp = PhaseSpace(N, batch)
+        self._dist.set_variables(phsp, masses)
+        centers = np.sum(masses[..., np.newaxis] * phsp.positions, axis=-2)
+        self.assertTrue(np.allclose(centers, 0.),
+                        msg="center of mass not at the origin. "
+                        f"RNG seed: {self._seed}.")
+        self.assertFalse(np.allclose(phsp.positions[0], phsp.positions[1]),
+                         msg="systems of a batch coincide. "
+                         f"RNG seed: {self._seed}.")
@@ -0,0 +1,74 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `evolution.UniformSphere`.
+
+"""
+import unittest
+
+import numpy as np
+
+from nbpy.evolution import UniformSphere
+from nbpy.particles import PhaseSpace, kinetic_energy
+
+
+class TestUniformSphere(unittest.TestCase):
+    """
+    Test class `evolution.UniformSphere`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._radius = 0.5 + np.random.rand()
+        cls._ratio = np.random.rand()
+        cls._dist = UniformSphere(cls._seed, cls._radius, cls._ratio)
+
+    def test_reproducible(self):
+        """
+        Test that the same seed gives the same phase space.
+
+        """
+        N = np.random.randint(2, 100)
+        phsp, other = PhaseSpace(N), PhaseSpace(N)
+        self._dist.set_variables(phsp)
+        UniformSphere(self._seed, self._radius,
+                      self._ratio).set_variables(other)
+        self.assertTrue(np.array_equal(phsp.positions, other.positions),
+                        msg="positions differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.array_equal(phsp.velocities, other.velocities),
+                        msg="velocities differ with the same seed. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_set_variables(self):
+        """
+        Test the radius, the kinetic energy, and the center of mass of a
+        batch of systems.
+
+        """
+        N = np.random.randint(100, 1000)
+        batch = np.random.randint(2, 5)
+        masses = np.random.rand(batch, N)
+        phsp = PhaseSpace(N, batch)
+        self._dist.set_variables(phsp, masses)
+
+        centers = np.sum(masses[..., np.newaxis] * phsp.velocities, axis=-2)
+        self.assertTrue(np.allclose(centers, 0.),
+                        msg="center of mass not at rest. "
+                        f"RNG seed: {self._seed}.")
+
+        # Recentering may move the particles by a small amount.
+        radii = np.linalg.norm(phsp.positions, axis=-1)
+        self.assertTrue(np.all(radii < 1.2 * self._radius),
+                        msg="particles outside the sphere. "
+                        f"RNG seed: {self._seed}.")
+
+        total_masses = np.sum(masses, axis=-1)
+        expected = 0.6 * self._ratio * total_masses**2. / self._radius
+        self.assertTrue(np.allclose(kinetic_energy(phsp, masses), expected),
+                        msg="kinetic energy differs from expected value. "
+                        f"RNG seed: {self._seed}.")
@@ -0,0 +1,181 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `interactions.BarnesHut`.
+
+"""
+
+import unittest
+
+import numpy as np
+
+from nbpy.interactions import BarnesHut, Interactions, InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+
+class TestBarnesHut(unittest.TestCase):
+    """
+    Test class `interactions.BarnesHut`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._constant = np.random.rand()
+        cls._softening = np.random.rand()
+        cls._opening_angle = np.random.rand()
+        cls._tree = BarnesHut(cls._constant, cls._softening,
+                              cls._opening_angle)
+
+    def test_attribute_interface(self):
+        """
+        Test interface for class attributes.
+
+        """
+        self.assertEqual("BarnesHut",
+                         self._tree.name(),
+                         msg="value of name differs from expected value. "
+                         f"RNG seed: {self._seed}.")
+
+        self.assertIn("BarnesHut",
+                      Interactions.typedict(),
+                      msg="BarnesHut is not an available interaction. "
+                      f"RNG seed: {self._seed}.")
+
+        self.assertAlmostEqual(
+            self._opening_angle,
+            self._tree.opening_angle,
+            msg="value of opening angle differs from expected value. "
+            f"RNG seed: {self._seed}.")
+
+    def test_construct_from_dict(self):
+        """
+        Test construction from dictionary.
+
+        """
+        params = {
+            "Constant": self._constant,
+            "Softening": self._softening,
+            "OpeningAngle": self._opening_angle,
+            "LeafSize": 4
+        }
+        tree_from_dict = BarnesHut.from_dict(params)
+
+        self.assertAlmostEqual(
+            tree_from_dict.softening,
+            self._tree.softening,
+            msg="value of softening differs from expected value. "
+            f"RNG seed: {self._seed}.")
+
+        self.assertEqual(tree_from_dict.leaf_size,
+                         4,
+                         msg="value of leaf size differs from expected value. "
+                         f"RNG seed: {self._seed}.")
+
+    def test_exert_exact(self):
+        """
+        Test that a vanishing opening angle reproduces the direct sum.
+
+        """
+        N = np.random.randint(2, 300)
+        masses = np.random.rand(N)
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        InverseSquareLaw(self._constant, self._softening).exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        tree = BarnesHut(self._constant,
+                         self._softening,
+                         opening_angle=0.,
+                         leaf_size=np.random.randint(1, 10))
+        tree.exert(phsp, masses)
+
+        self.assertTrue(np.allclose(phsp.accelerations,
+                                    accelerations_expected),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_exert_exact_close_pair(self):
+        """
+        Test that a vanishing opening angle reproduces the direct sum for a
+        tight pair of particles far from the origin and a small softening.
+
+        """
+        N = np.random.randint(2, 300)
+        masses = np.random.rand(N)
+        positions = np.random.randn(N, 3) + 5.
+        positions[1] = positions[0] + 1.e-6 * np.random.randn(3)
+        softening = 1.e-9
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(positions)
+        InverseSquareLaw(self._constant, softening).exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        tree = BarnesHut(self._constant,
+                         softening,
+                         opening_angle=0.,
+                         leaf_size=np.random.randint(1, 10))
+        tree.exert(phsp, masses)
+
+        self.assertTrue(np.allclose(phsp.accelerations,
+                                    accelerations_expected,
+                                    rtol=1.e-10,
+                                    atol=0.),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_exert_approximate(self):
+        """
+        Test the accuracy of the approximation for a typical opening angle.
+
+        """
+        N = 2000
+        masses = np.random.rand(N)
+        softening = 1.e-2
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        InverseSquareLaw(self._constant, softening).exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        BarnesHut(self._constant, softening, 0.5).exert(phsp, masses)
+
+        errors = np.linalg.norm(phsp.accelerations - accelerations_expected,
+                                axis=1) / np.linalg.norm(
+                                    accelerations_expected, axis=1)
+        self.assertLess(np.median(errors),
+                        1.e-2,
+                        msg="approximation error is too large. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_exert_on(self):
+        """
+        Test that the accelerations of a subset of particles agree with those
+        of the full evaluation, and that the others are left untouched.
+
+        """
+        N = np.random.randint(2, 300)
+        masses = np.random.rand(N)
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        self._tree.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        targets = np.flatnonzero(np.random.rand(N) < 0.2)
+        others = np.setdiff1d(np.arange(N), targets)
+        phsp.set_accelerations(np.full((N, 3), np.nan))
+        self._tree.exert_on(phsp, masses, targets)
+
+        self.assertTrue(np.allclose(phsp.accelerations[targets],
+                                    accelerations_expected[targets]),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.all(np.isnan(phsp.accelerations[others])),
+                        msg="acceleration of non-target particles was "
+                        f"modified. RNG seed: {self._seed}.")
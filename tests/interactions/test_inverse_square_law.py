@@ -9,8 +9,9 @@ import unittest
 
 import numpy as np
 
+from nbpy.evolution import Leapfrog
 from nbpy.interactions import InverseSquareLaw
-from nbpy.particles import PhaseSpace
+from nbpy.particles import PhaseSpace, conserved_quantities
 
 
 class TestInverseSquareLaw(unittest.TestCase):
@@ -114,3 +115,335 @@ class TestInverseSquareLaw(unittest.TestCase):
                                     accelerations_expected),
                         msg="acceleration differs from expected value. "
                         f"RNG seed: {self._seed}.")
+
+    def test_exert_tiled(self):
+        """
+        Test that the tiled direct sum agrees with the dense one.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 50)
+        masses = np.random.rand(n_body)
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(np.random.randn(n_body, dim))
+        self._law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        tile_size = np.random.randint(1, n_body + 1)
+        tiled_law = InverseSquareLaw(self._constant,
+                                     self._softening,
+                                     tile_size=tile_size)
+
+        # Evolve twice to exercise the reuse of the scratch buffers.
+        for _ in range(2):
+            phsp.set_accelerations(np.full((n_body, dim), np.nan))
+            tiled_law.exert(phsp, masses)
+            self.assertTrue(np.allclose(phsp.accelerations,
+                                        accelerations_expected),
+                            msg="tiled acceleration differs from expected "
+                            f"value. RNG seed: {self._seed}.")
+
+    def test_exert_on(self):
+        """
+        Test that the accelerations of a subset of particles agree with those
+        of the full evaluation, and that the others are left untouched.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 50)
+        masses = np.random.rand(n_body)
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(np.random.randn(n_body, dim))
+        self._law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        targets = np.flatnonzero(np.random.rand(n_body) < 0.5)
+        others = np.setdiff1d(np.arange(n_body), targets)
+        phsp.set_accelerations(np.full((n_body, dim), np.nan))
+        self._law.exert_on(phsp, masses, targets)
+
+        self.assertTrue(np.allclose(phsp.accelerations[targets],
+                                    accelerations_expected[targets]),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.all(np.isnan(phsp.accelerations[others])),
+                        msg="acceleration of non-target particles was "
+                        f"modified. RNG seed: {self._seed}.")
+
+    def test_exert_with_jerks(self):
+        """
+        Test that the jerks agree with the centered difference of the
+        accelerations along the velocities, in both the dense and tiled modes.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 50)
+        masses = np.random.rand(n_body)
+        positions = np.random.randn(n_body, dim)
+        velocities = np.random.randn(n_body, dim)
+
+        phsp = PhaseSpace(n_body)
+        h = 1.e-5
+        accelerations = []
+        for sign in (1., -1.):
+            phsp.set_positions(positions + sign * h * velocities)
+            self._law.exert(phsp, masses)
+            accelerations.append(np.copy(phsp.accelerations))
+        jerks_expected = (accelerations[0] - accelerations[1]) / (2. * h)
+
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
+        self._law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        tiled = InverseSquareLaw(self._constant,
+                                 self._softening,
+                                 tile_size=np.random.randint(1, n_body + 1),
+                                 workers=2)
+        for law in (self._law, tiled):
+            jerks = law.exert_with_jerks(phsp, masses)
+            self.assertTrue(np.allclose(phsp.accelerations,
+                                        accelerations_expected),
+                            msg="acceleration differs from expected value. "
+                            f"RNG seed: {self._seed}.")
+            self.assertTrue(np.allclose(jerks, jerks_expected, atol=1.e-6),
+                            msg="jerk differs from expected value. "
+                            f"RNG seed: {self._seed}.")
+
+        with self.assertRaises(ValueError):
+            self._law.exert_with_jerks(PhaseSpace(n_body, 2), masses)
+
+    def test_exert_batched(self):
+        """
+        Test that every system of a batched phase space has the accelerations
+        of the system evaluated alone.
+
+        """
+        dim = 3
+        batch = np.random.randint(1, 10)
+        n_body = np.random.randint(2, 30)
+        masses = np.random.rand(batch, n_body)
+
+        phsp = PhaseSpace(n_body, batch)
+        phsp.set_positions(np.random.randn(batch, n_body, dim))
+
+        workers = np.random.randint(1, 4)
+        memory_budget = np.random.choice([None, 8. * n_body**2.])
+        law = InverseSquareLaw(self._constant,
+                               self._softening,
+                               memory_budget=memory_budget,
+                               workers=workers)
+        law.exert(phsp, masses)
+
+        for member in range(batch):
+            single = PhaseSpace(n_body)
+            single.set_positions(phsp.positions[member])
+            self._law.exert(single, masses[member])
+            self.assertTrue(np.allclose(phsp.accelerations[member],
+                                        single.accelerations),
+                            msg="batched acceleration differs from expected "
+                            f"value. RNG seed: {self._seed}.")
+
+    def test_tile_size_for(self):
+        """
+        Test the choice of tile size from the constructor arguments.
+
+        """
+        N = np.random.randint(10, 100)
+        self.assertIsNone(self._law.tile_size_for(N),
+                          msg="dense law should not use tiles. "
+                          f"RNG seed: {self._seed}.")
+
+        law = InverseSquareLaw(self._constant,
+                               self._softening,
+                               tile_size=2 * N)
+        self.assertEqual(law.tile_size_for(N),
+                         N,
+                         msg="tile size should not exceed N. "
+                         f"RNG seed: {self._seed}.")
+
+        # Budget for exactly three rows of scratch buffers.
+        budget = 3 * 4 * N * 8
+        law = InverseSquareLaw(self._constant,
+                               self._softening,
+                               memory_budget=budget)
+        self.assertEqual(law.tile_size_for(N),
+                         3,
+                         msg="tile size from memory budget differs from "
+                         f"expected value. RNG seed: {self._seed}.")
+
+        law_from_dict = InverseSquareLaw.from_dict({
+            "Constant": self._constant,
+            "Softening": self._softening,
+            "MemoryBudget": budget
+        })
+        self.assertEqual(law_from_dict.tile_size_for(N),
+                         3,
+                         msg="tile size of law from dict differs from "
+                         f"expected value. RNG seed: {self._seed}.")
+
+    def test_exert_workers(self):
+        """
+        Test that distributing the row blocks among threads does not change
+        the accelerations.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 50)
+        masses = np.random.rand(n_body)
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(np.random.randn(n_body, dim))
+        self._law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        workers = np.random.randint(2, 5)
+        law_from_dict = InverseSquareLaw.from_dict({
+            "Constant":
+            self._constant,
+            "Softening":
+            self._softening,
+            "TileSize":
+            np.random.randint(1, n_body + 1),
+            "Workers":
+            workers
+        })
+        self.assertEqual(law_from_dict.workers,
+                         workers,
+                         msg="value of workers differs from expected value. "
+                         f"RNG seed: {self._seed}.")
+
+        phsp.set_accelerations(np.full((n_body, dim), np.nan))
+        law_from_dict.exert(phsp, masses)
+        self.assertTrue(np.allclose(phsp.accelerations,
+                                    accelerations_expected),
+                        msg="threaded acceleration differs from expected "
+                        f"value. RNG seed: {self._seed}.")
+
+    def test_exert_symmetric(self):
+        """
+        Test that evaluating each unordered pair once does not change the
+        accelerations.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 50)
+        masses = np.random.rand(n_body)
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(np.random.randn(n_body, dim))
+        self._law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        for workers in (1, np.random.randint(2, 5)):
+            law = InverseSquareLaw(self._constant,
+                                   self._softening,
+                                   tile_size=np.random.randint(1, n_body + 1),
+                                   workers=workers,
+                                   symmetric=True)
+            phsp.set_accelerations(np.full((n_body, dim), np.nan))
+            law.exert(phsp, masses)
+            self.assertTrue(np.allclose(phsp.accelerations,
+                                        accelerations_expected),
+                            msg="symmetric acceleration differs from expected "
+                            f"value with {workers} workers. "
+                            f"RNG seed: {self._seed}.")
+
+    def test_exert_single_precision(self):
+        """
+        Test the accelerations in single precision, and quantify their impact
+        on the energy error of a short Leapfrog evolution.
+
+        """
+        dim = 3
+        n_body = 64
+        masses = np.random.rand(n_body) / n_body
+        softening = 5.e-2
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(np.random.randn(n_body, dim))
+        phsp.set_velocities(0.1 * np.random.randn(n_body, dim))
+        double_law = InverseSquareLaw(self._constant, softening)
+        double_law.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        single_law = InverseSquareLaw(self._constant,
+                                      softening,
+                                      symmetric=True,
+                                      precision="single")
+        single_law.exert(phsp, masses)
+        self.assertEqual(phsp.accelerations.dtype,
+                         np.float64,
+                         msg="accelerations are not stored in double "
+                         f"precision. RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(phsp.accelerations,
+                                    accelerations_expected,
+                                    rtol=1.e-5,
+                                    atol=1.e-5 *
+                                    np.abs(accelerations_expected).max()),
+                        msg="single-precision acceleration differs from "
+                        f"expected value. RNG seed: {self._seed}.")
+
+        energy_errors = {}
+        leapfrog = Leapfrog()
+        for law in (double_law, single_law):
+            evolved = PhaseSpace(n_body)
+            evolved.set_positions(phsp.positions)
+            evolved.set_velocities(phsp.velocities)
+            law.exert(evolved, masses)
+            initial = conserved_quantities(evolved, masses, softening)
+            for _ in range(100):
+                leapfrog.evolve(evolved, 1.e-2, masses, law)
+            final = conserved_quantities(evolved, masses, softening)
+            energy_errors[law.precision] = abs(final["Energy"] /
+                                               initial["Energy"] - 1.)
+
+        # Round-off in the forces must not dominate the truncation error of
+        # the integrator.
+        self.assertLess(abs(energy_errors["single"] - energy_errors["double"]),
+                        1.e-5,
+                        msg="single-precision energy error differs from the "
+                        f"double-precision one: {energy_errors}. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_single_precision_error_bound(self):
+        """
+        Test that the single-precision accelerations of every mode are within
+        the error bound stated in the class notes.
+
+        """
+        dim = 3
+        n_body = np.random.randint(2, 200)
+        masses = np.random.rand(n_body) / n_body
+        softening = 0.1 * np.random.rand()
+
+        phsp = PhaseSpace(n_body)
+        phsp.set_positions(10. * np.random.randn(n_body, dim) + 5.)
+        InverseSquareLaw(self._constant, softening).exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        # The bound is a few single-precision epsilons times the sum over
+        # the sources of m_k (|d_jk| + R) / (d_jk^2 + softening^2)^(3/2).
+        d = phsp.positions[np.newaxis, :, :] - phsp.positions[:, np.newaxis]
+        distance_cube = (np.sum(d**2., axis=2) + softening**2.)**1.5
+        np.fill_diagonal(distance_cube, np.inf)
+        radius = np.max(np.abs(phsp.positions - np.mean(phsp.positions, 0)))
+        terms = (np.abs(d) + radius) / distance_cube[..., np.newaxis]
+        bound = 10. * np.spacing(np.float32(1.)) * np.einsum(
+            "k,jki->ji", masses, terms)
+
+        tile_size = np.random.randint(1, n_body + 1)
+        modes = [{}, {"tile_size": tile_size}, {"symmetric": True}]
+        for options in modes:
+            law = InverseSquareLaw(self._constant,
+                                   softening,
+                                   precision="single",
+                                   **options)
+            law.exert(phsp, masses)
+            error = np.abs(phsp.accelerations - accelerations_expected)
+            self.assertTrue(np.all(error <= bound),
+                            msg="single-precision acceleration exceeds the "
+                            f"error bound with options {options}. "
+                            f"RNG seed: {self._seed}.")
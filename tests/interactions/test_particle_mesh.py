@@ -0,0 +1,138 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for class `interactions.ParticleMesh`.
+
+"""
+
+import unittest
+
+import numpy as np
+
+from nbpy.interactions import Interactions, ParticleMesh
+from nbpy.particles import PhaseSpace
+
+
+class TestParticleMesh(unittest.TestCase):
+    """
+    Test class `interactions.ParticleMesh`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._constant = np.random.rand()
+        cls._grid_size = 64
+        cls._box_size = 1. + np.random.rand()
+        cls._mesh = ParticleMesh(cls._constant, cls._grid_size, cls._box_size)
+
+    def test_attribute_interface(self):
+        """
+        Test interface for class attributes.
+
+        """
+        self.assertEqual("ParticleMesh",
+                         self._mesh.name(),
+                         msg="value of name differs from expected value. "
+                         f"RNG seed: {self._seed}.")
+
+        self.assertIn("ParticleMesh",
+                      Interactions.typedict(),
+                      msg="ParticleMesh is not an available interaction. "
+                      f"RNG seed: {self._seed}.")
+
+    def test_construct_from_dict(self):
+        """
+        Test construction from dictionary.
+
+        """
+        params = {
+            "Constant": self._constant,
+            "GridSize": self._grid_size,
+            "BoxSize": self._box_size
+        }
+        mesh_from_dict = ParticleMesh.from_dict(params)
+
+        self.assertEqual(mesh_from_dict.grid_size,
+                         self._grid_size,
+                         msg="value of grid size differs from expected value. "
+                         f"RNG seed: {self._seed}.")
+
+        self.assertAlmostEqual(
+            mesh_from_dict.box_size,
+            self._box_size,
+            msg="value of box size differs from expected value. "
+            f"RNG seed: {self._seed}.")
+
+    def test_exert_momentum(self):
+        """
+        Test that the total force vanishes.
+
+        """
+        N = np.random.randint(2, 1000)
+        masses = np.random.rand(N)
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(self._box_size * (np.random.rand(N, 3) - 0.5))
+        self._mesh.exert(phsp, masses)
+
+        total_force = np.matmul(masses, phsp.accelerations)
+        self.assertTrue(np.allclose(
+            total_force,
+            0.,
+            atol=1.e-10 * np.abs(phsp.accelerations).max() * np.sum(masses)),
+                        msg="total force does not vanish. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_exert_two_body(self):
+        """
+        Test the acceleration of a test particle at a separation of a few
+        cells against Newton's law.
+
+        """
+        separation = 8. * self._box_size / self._grid_size
+        direction = np.random.randn(3)
+        direction /= np.linalg.norm(direction)
+
+        source = 0.2 * self._box_size * (np.random.rand(3) - 0.5)
+        phsp = PhaseSpace(2)
+        phsp.set_positions([source, source + separation * direction])
+        masses = np.array([1., 1.e-8])
+        self._mesh.exert(phsp, masses)
+
+        acceleration_expected = -direction / separation**2.
+        self.assertTrue(np.allclose(phsp.accelerations[1],
+                                    acceleration_expected,
+                                    atol=0.1 / separation**2.),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_exert_on(self):
+        """
+        Test that the accelerations of a subset of particles agree with those
+        of the full evaluation, and that the others are left untouched.
+
+        """
+        N = np.random.randint(2, 1000)
+        masses = np.random.rand(N)
+
+        phsp = PhaseSpace(N)
+        phsp.set_positions(self._box_size * (np.random.rand(N, 3) - 0.5))
+        self._mesh.exert(phsp, masses)
+        accelerations_expected = np.copy(phsp.accelerations)
+
+        targets = np.flatnonzero(np.random.rand(N) < 0.2)
+        others = np.setdiff1d(np.arange(N), targets)
+        phsp.set_accelerations(np.full((N, 3), np.nan))
+        self._mesh.exert_on(phsp, masses, targets)
+
+        self.assertTrue(np.allclose(phsp.accelerations[targets],
+                                    accelerations_expected[targets]),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.all(np.isnan(phsp.accelerations[others])),
+                        msg="acceleration of non-target particles was "
+                        f"modified. RNG seed: {self._seed}.")
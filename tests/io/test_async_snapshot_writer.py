@@ -0,0 +1,69 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `io.AsyncSnapshotWriter`.
+
+"""
+
+import os
+import unittest
+
+import h5py
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import Time
+
+
+class TestAsyncSnapshotWriter(unittest.TestCase):
+    """
+    Test class `io.AsyncSnapshotWriter`.
+
+    """
+
+    def test_write(self):
+        """
+        Test that all queued snapshots are written, even if the array passed
+        is modified right after each call.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(1, 10)
+        n_snapshots = np.random.randint(1, 50)
+        data_to_write = np.random.randn(n_snapshots, N, 3)
+
+        groupname = "Temp"
+        opts = {
+            "Groupname": groupname,
+            "Filename": "temp_async_writer",
+            "QueueSize": np.random.randint(1, 4)
+        }
+        buffer = np.empty((N, 3))
+        with io.AsyncSnapshotWriter.from_dict(opts, N) as writer:
+            for id_ in range(n_snapshots):
+                buffer[:] = data_to_write[id_]
+                writer.write({"Positions": buffer}, Time(id_, 0.1 * id_))
+                buffer[:] = np.nan
+            filepath = writer.path
+
+        with h5py.File(filepath, "r") as readfile:
+            self.assertTrue(np.array_equal(data_to_write,
+                                           readfile[groupname]["Positions"]),
+                            msg="dataset written differs from dataset read. "
+                            f"RNG seed: {seed}.")
+
+        os.remove(filepath)
+
+    def test_write_failure(self):
+        """
+        Test that an error in the writer thread is raised in the caller.
+
+        """
+        writer = io.AsyncSnapshotWriter(
+            io.SnapshotWriter("temp_async_writer", "Temp", 2))
+        with self.assertRaises(Exception):
+            writer.write({"Positions": np.zeros((3, 3))}, Time(0, 0.))
+            writer.close()
+        os.remove(writer.path)
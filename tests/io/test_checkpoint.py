@@ -0,0 +1,116 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `io.write_checkpoint`, `io.read_checkpoint`, and
+`io.restore_integrator`.
+
+"""
+
+import os
+import unittest
+
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import BlockTimestep, Hermite, Time
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Test functions `io.write_checkpoint`, `io.read_checkpoint`, and
+    `io.restore_integrator`.
+
+    """
+
+    def test_round_trip(self):
+        """
+        Test that the state read is exactly the state written.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(1, 10)
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        phsp.set_velocities(np.random.randn(N, 3))
+        phsp.set_accelerations(np.random.randn(N, 3))
+        masses = np.random.rand(N)
+        time = Time(np.random.randint(1, 100), np.random.rand())
+        parameters = {"InitialDt": np.random.rand(), "Seed": seed}
+        integrator = BlockTimestep(max_level=np.random.randint(1, 10))
+        integrator.set_state({"Levels": np.random.randint(0, 10, N)})
+
+        rng = np.random.default_rng(seed)
+        rng.standard_normal(np.random.randint(1, 10))
+
+        filepath = io.write_checkpoint("temp_checkpoint", phsp, masses, time,
+                                       parameters, integrator, rng)
+        self.assertFalse(os.path.exists(f"{filepath}.tmp"),
+                         msg="temporary checkpoint was not renamed.")
+
+        state = io.read_checkpoint("temp_checkpoint")
+        for key in ("positions", "velocities", "accelerations"):
+            self.assertTrue(np.array_equal(getattr(state["PhaseSpace"], key),
+                                           getattr(phsp, key)),
+                            msg=f"{key} read differ from {key} written. "
+                            f"RNG seed: {seed}.")
+        self.assertTrue(np.array_equal(state["Masses"], masses))
+        self.assertEqual(state["Time"].id_, time.id_)
+        self.assertEqual(state["Time"].value, time.value)
+        self.assertEqual(state["Parameters"], parameters)
+        self.assertEqual(
+            state["Integrator"], {
+                "Name": "BlockTimestep",
+                "max_level": integrator.max_level,
+                "accuracy": integrator.accuracy,
+                "length": integrator.length
+            })
+        self.assertTrue(
+            np.array_equal(state["IntegratorState"]["Levels"],
+                           integrator.levels))
+        self.assertTrue(np.array_equal(state["Rng"].standard_normal(5),
+                                       rng.standard_normal(5)),
+                        msg="RNG state read differs from RNG state written. "
+                        f"RNG seed: {seed}.")
+
+        os.remove(filepath)
+
+    def test_restore_integrator(self):
+        """
+        Test that the state of the integrator is restored exactly, and that
+        an integrator differing from the one written is rejected.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(2, 10)
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        phsp.set_velocities(np.random.randn(N, 3))
+        masses = np.random.rand(N)
+        law = InverseSquareLaw(1., 0.5)
+        law.exert(phsp, masses)
+
+        integrator = Hermite()
+        integrator.evolve(phsp, 1.e-2, masses, law)
+        filepath = io.write_checkpoint("temp_checkpoint", phsp, masses,
+                                       Time(1, 1.e-2), {}, integrator)
+        state = io.read_checkpoint("temp_checkpoint")
+
+        restored = Hermite()
+        io.restore_integrator(restored, state)
+        integrator.evolve(phsp, 1.e-2, masses, law)
+        restored.evolve(state["PhaseSpace"], 1.e-2, masses, law)
+        self.assertTrue(np.array_equal(state["PhaseSpace"].positions,
+                                       phsp.positions),
+                        msg="restored integrator differs from integrator "
+                        f"written. RNG seed: {seed}.")
+
+        with self.assertRaises(ValueError):
+            io.restore_integrator(BlockTimestep(), state)
+
+        os.remove(filepath)
@@ -0,0 +1,143 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `io.Observer`.
+
+"""
+
+import unittest
+
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import Time
+from nbpy.particles import PhaseSpace
+
+
+class _Recorder:
+    """
+    A writer that keeps the data in memory.
+
+    """
+
+    def __init__(self):
+        self.snapshots = []
+        self.constants = {}
+
+    def write(self, data: dict, time: Time) -> None:
+        """
+        Keep the snapshot and its time.
+
+        """
+        self.snapshots.append((data, time))
+
+    def write_constant(self, name: str, data) -> None:
+        """
+        Keep the constant data by name.
+
+        """
+        self.constants[name] = data
+
+
+class TestObserver(unittest.TestCase):
+    """
+    Test class `io.Observer`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+    def _observed_ids(self, observer: io.Observer, timesteps: int,
+                      dt: float) -> list:
+        return [
+            time_id for time_id in range(timesteps + 1)
+            if observer.is_due(Time(time_id, dt * time_id))
+        ]
+
+    def test_cadence(self):
+        """
+        Test the steps observed for every type of cadence.
+
+        """
+        timesteps = 100
+        dt = 1.e-3
+
+        every = np.random.randint(1, 10)
+        observer = io.Observer.from_dict({"Every": every})
+        ids = self._observed_ids(observer, timesteps, dt)
+        self.assertEqual(ids,
+                         list(range(0, timesteps + 1, every)),
+                         msg=f"steps observed differ from expected steps "
+                         f"with Every. RNG seed: {self._seed}.")
+        self.assertEqual(observer.capacity(timesteps, dt), len(ids))
+
+        observer = io.Observer.from_dict({"EveryDt": 2.5e-3})
+        ids = self._observed_ids(observer, timesteps, dt)
+        self.assertEqual(ids, [5 * (i // 2) + (i % 2) * 3 for i in range(41)],
+                         msg="steps observed differ from expected steps "
+                         "with EveryDt.")
+        self.assertEqual(observer.capacity(timesteps, dt), len(ids))
+
+        observer = io.Observer.from_dict({"Times": [0.05, 0.0205, 0.02]})
+        ids = self._observed_ids(observer, timesteps, dt)
+        self.assertEqual(ids, [20, 21, 50],
+                         msg="steps observed differ from expected steps "
+                         "with Times.")
+        self.assertEqual(observer.capacity(timesteps, dt), len(ids))
+
+        self.assertEqual(self._observed_ids(io.Observer(), 3, dt),
+                         [0, 1, 2, 3],
+                         msg="steps observed differ from expected steps "
+                         "by default.")
+
+    def test_observe(self):
+        """
+        Test the selection of fields and particles.
+
+        """
+        N = np.random.randint(1, 20)
+        subsample = np.random.randint(1, 5)
+        phsp = PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, 3))
+        phsp.set_velocities(np.random.randn(N, 3))
+        masses = np.random.rand(N)
+
+        observer = io.Observer.from_dict({
+            "Every": 2,
+            "Fields": ["Velocities", "Masses"],
+            "Subsample": subsample
+        })
+        writer = _Recorder()
+        observer.start(writer, masses)
+        self.assertTrue(observer.observe(writer, phsp, Time(0, 0.)))
+        self.assertFalse(observer.observe(writer, phsp, Time(1, 0.1)))
+
+        self.assertEqual(len(writer.snapshots), 1)
+        data, _ = writer.snapshots[0]
+        self.assertEqual(list(data.keys()), ["Velocities"])
+        self.assertTrue(np.array_equal(data["Velocities"],
+                                       phsp.velocities[::subsample]),
+                        msg="velocities written differ from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertEqual(data["Velocities"].shape[0], observer.n_observed(N))
+        self.assertTrue(np.array_equal(writer.constants["Masses"],
+                                       masses[::subsample]),
+                        msg="masses written differ from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+    def test_construct_failure(self):
+        """
+        Test that invalid options are rejected.
+
+        """
+        with self.assertRaises(ValueError):
+            io.Observer(every=2, every_dt=0.1)
+        with self.assertRaises(ValueError):
+            io.Observer(fields=("Densities", ))
+        with self.assertRaises(ValueError):
+            io.Observer.from_dict({"Fields": ["Masses"]})
+        with self.assertRaises(ValueError):
+            io.Observer(subsample=0)
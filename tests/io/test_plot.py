@@ -0,0 +1,121 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for the functions in `io.plot`.
+
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import Time
+
+
+class TestPlot(unittest.TestCase):
+    """
+    Test functions `io.orbits_3d` and `io.orbits_movie`.
+
+    """
+
+    def test_orbits_3d(self):
+        """
+        Test that one figure is rendered per selected snapshot, serially and
+        in parallel, for both file layouts.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(1, 10)
+        n_snapshots = np.random.randint(2, 8)
+        stride = np.random.randint(1, 3)
+        positions = np.random.randn(n_snapshots, N, 3)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                opts = {"Groupname": "Temp", "Filename": "Data"}
+                with io.SnapshotWriter.from_dict(opts, N) as writer:
+                    for id_ in range(n_snapshots):
+                        writer.write({"Positions": positions[id_]},
+                                     Time(id_, 0.1 * id_))
+                for id_ in range(n_snapshots):
+                    io.write_snapshot_to_disk(
+                        {
+                            "Groupname": "Legacy",
+                            "Filename": "Data"
+                        }, positions[id_], Time(id_, 0.1 * id_))
+
+                expected = [
+                    f"{id_:06}.png" for id_ in range(0, n_snapshots, stride)
+                ]
+                for groupname in ("Temp", "Legacy"):
+                    for workers in (1, 2):
+                        figure_folder = f"{groupname}{workers}"
+                        io.orbits_3d("Data.hdf5",
+                                     groupname,
+                                     figure_folder,
+                                     workers=workers,
+                                     stride=stride,
+                                     dpi=10)
+                        self.assertEqual(
+                            sorted(os.listdir(figure_folder)),
+                            expected,
+                            msg=f"figures differ from expected figures for "
+                            f"group {groupname} and {workers} workers. "
+                            f"RNG seed: {seed}.")
+            finally:
+                os.chdir(cwd)
+
+    def test_orbits_movie(self):
+        """
+        Test that every selected snapshot is streamed as a distinct frame, to
+        a sink and to an animated GIF.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(1, 10)
+        n_snapshots = np.random.randint(2, 8)
+        stride = np.random.randint(1, 3)
+        positions = np.random.randn(n_snapshots, N, 3)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                opts = {"Groupname": "Temp", "Filename": "Data"}
+                with io.SnapshotWriter.from_dict(opts, N) as writer:
+                    for id_ in range(n_snapshots):
+                        writer.write({"Positions": positions[id_]},
+                                     Time(id_, 0.1 * id_))
+
+                frames = []
+                io.orbits_movie(
+                    "Data.hdf5",
+                    "Temp",
+                    sink=lambda frame: frames.append(np.copy(frame)),
+                    stride=stride,
+                    dpi=20)
+                self.assertEqual(len(frames),
+                                 len(range(0, n_snapshots, stride)))
+                self.assertEqual(frames[0].dtype, np.uint8)
+                self.assertEqual(frames[0].shape[2], 3)
+                if len(frames) > 1:
+                    self.assertFalse(np.array_equal(frames[0], frames[1]),
+                                     msg="consecutive frames are identical. "
+                                     f"RNG seed: {seed}.")
+
+                io.orbits_movie("Data.hdf5", "Temp", "orbits.gif", dpi=20)
+                self.assertTrue(os.path.getsize("orbits.gif") > 0)
+
+                with self.assertRaises(ValueError):
+                    io.orbits_movie("Data.hdf5", "Temp")
+            finally:
+                os.chdir(cwd)
@@ -0,0 +1,42 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for the functions in `io.quantization`.
+
+"""
+
+import unittest
+
+import numpy as np
+
+from nbpy import io
+
+
+class TestQuantization(unittest.TestCase):
+    """
+    Test functions `io.quantize` and `io.dequantize`.
+
+    """
+
+    def test_round_trip(self):
+        """
+        Test that the quantization error is bounded by half a level.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(2, 100)
+        data = np.random.randn(N, 3)
+        data[:, 2] = np.random.randn()
+        for bits in (8, 16, 32):
+            quantized, box = io.quantize(data, bits)
+            self.assertEqual(quantized.dtype, np.dtype(f"uint{bits}"))
+            self.assertTrue(np.array_equal(box[0], np.min(data, axis=0)))
+            self.assertTrue(np.array_equal(box[1], np.max(data, axis=0)))
+
+            error = np.abs(io.dequantize(quantized, box, bits) - data)
+            bound = 0.5 * (box[1] - box[0]) / (2.**bits - 1.)
+            self.assertTrue(np.all(error <= bound * (1. + 1.e-6) + 1.e-15),
+                            msg=f"quantization error with {bits} bits is too "
+                            f"large. RNG seed: {seed}.")
@@ -0,0 +1,114 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `io.SnapshotReader`.
+
+"""
+
+import os
+import unittest
+
+import h5py
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import Time
+
+
+class TestSnapshotReader(unittest.TestCase):
+    """
+    Test class `io.SnapshotReader`.
+
+    """
+
+    _seed: int
+    _N: int
+    _T: int
+    _positions: np.ndarray
+    _times: np.ndarray
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+        cls._N = np.random.randint(5, 20)
+        cls._T = np.random.randint(5, 20)
+        cls._positions = np.random.randn(cls._T, cls._N, 3)
+        cls._times = np.sort(np.random.rand(cls._T))
+
+    def _cases(self) -> list:
+        """
+        Return pairs of keys and expected slices. Arrays of indices along
+        different axes select their outer product.
+
+        """
+        positions = self._positions
+        particles = np.random.randint(0, self._N, size=4)
+        times = np.array([3, 0, 3])
+        return [(np.s_[:], positions), (np.s_[2], positions[2]),
+                (np.s_[-1, 3], positions[-1, 3]),
+                (np.s_[1:4, particles], positions[1:4, particles]),
+                (np.s_[::-2, 1:3, 0], positions[::-2, 1:3, 0]),
+                (np.s_[times, particles,
+                       1:], positions[np.ix_(times, particles)][..., 1:]),
+                (np.s_[[4, 1], 2], positions[[4, 1], 2])]
+
+    def _check(self, array, tolerance: float, layout: str) -> None:
+        self.assertEqual(array.shape, self._positions.shape)
+        for key, expected in self._cases():
+            data = array[key]
+            self.assertEqual(data.shape,
+                             expected.shape,
+                             msg=f"shape of slice {key} differs from expected "
+                             f"shape for {layout} data. "
+                             f"RNG seed: {self._seed}.")
+            self.assertTrue(np.allclose(data, expected, atol=tolerance),
+                            msg=f"slice {key} differs from expected value for "
+                            f"{layout} data. RNG seed: {self._seed}.")
+
+    def test_read_written(self):
+        """
+        Test slicing the snapshots written by `io.SnapshotWriter`, with and
+        without quantization.
+
+        """
+        for layout, tolerance in (({}, 0.), ({"Quantization": 32}, 1.e-8)):
+            opts = {"Groupname": "Temp", "Filename": "temp_reader", **layout}
+            with io.SnapshotWriter.from_dict(opts, self._N) as writer:
+                writer.write_constant("Masses", np.ones(self._N))
+                for id_ in range(self._T):
+                    writer.write({"Positions": self._positions[id_]},
+                                 Time(id_, self._times[id_]))
+                filepath = writer.path
+
+            with io.SnapshotReader(filepath, "Temp") as reader:
+                self.assertEqual(reader.fields, ("Positions", ))
+                self.assertEqual(reader.size, self._T)
+                self.assertTrue(np.array_equal(reader.times, self._times))
+                self.assertTrue(
+                    np.array_equal(reader.time_ids, np.arange(self._T)))
+                self.assertTrue(
+                    np.array_equal(reader.constant("Masses"),
+                                   np.ones(self._N)))
+                self._check(reader["Positions"], tolerance, str(layout))
+
+            os.remove(filepath)
+
+    def test_read_contiguous(self):
+        """
+        Test slicing uncompressed contiguous data through a memory map.
+
+        """
+        filepath = "temp_reader.hdf5"
+        with h5py.File(filepath, "w") as outfile:
+            outfile.create_dataset("Temp/Positions", data=self._positions)
+            outfile.create_dataset("Temp/Time", data=self._times)
+            outfile.create_dataset("Temp/TimeId", data=np.arange(self._T))
+
+        with io.SnapshotReader(filepath, "Temp") as reader:
+            positions = reader["Positions"]
+            self.assertTrue(positions.memory_mapped)
+            self._check(positions, 0., "contiguous")
+
+        os.remove(filepath)
@@ -0,0 +1,128 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `io.SnapshotWriter`.
+
+"""
+
+import os
+import unittest
+
+import h5py
+import numpy as np
+
+from nbpy import io
+from nbpy.evolution import Time
+
+
+class TestSnapshotWriter(unittest.TestCase):
+    """
+    Test class `io.SnapshotWriter`.
+
+    """
+
+    def test_write(self):
+        """
+        Test writing a number of snapshots beyond the preallocated capacity.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(1, 10)
+        n_snapshots = np.random.randint(1, 20)
+        positions = np.random.randn(n_snapshots, N, 3)
+        velocities = np.random.randn(n_snapshots, N, 3)
+        masses = np.random.rand(N)
+        times = np.random.rand(n_snapshots)
+
+        groupname = "Temp"
+        opts = {
+            "Groupname": groupname,
+            "Filename": "temp_writer",
+            "FlushEvery": np.random.randint(1, 5)
+        }
+        capacity = np.random.randint(1, n_snapshots + 1)
+        fields = ("Positions", "Velocities")
+        with io.SnapshotWriter.from_dict(opts, N, capacity, fields) as writer:
+            writer.write_constant("Masses", masses)
+            for id_ in range(n_snapshots):
+                writer.write(
+                    {
+                        "Positions": positions[id_],
+                        "Velocities": velocities[id_]
+                    }, Time(id_, times[id_]))
+            filepath = writer.path
+
+        with h5py.File(filepath, "r") as readfile:
+            group = readfile[groupname]
+            self.assertTrue(np.array_equal(positions, group["Positions"][:]),
+                            msg="positions written differ from positions "
+                            f"read. RNG seed: {seed}.")
+            self.assertTrue(np.array_equal(velocities, group["Velocities"][:]),
+                            msg="velocities written differ from velocities "
+                            f"read. RNG seed: {seed}.")
+            self.assertTrue(np.array_equal(masses, group["Masses"][:]),
+                            msg="masses written differ from masses read. "
+                            f"RNG seed: {seed}.")
+            self.assertTrue(np.array_equal(times, group["Time"][:]),
+                            msg="time values differ from expected values. "
+                            f"RNG seed: {seed}.")
+            self.assertTrue(np.array_equal(np.arange(n_snapshots),
+                                           group["TimeId"][:]),
+                            msg="time IDs differ from expected values. "
+                            f"RNG seed: {seed}.")
+            self.assertEqual(group.attrs["Size"],
+                             n_snapshots,
+                             msg="number of snapshots differs from expected "
+                             f"value. RNG seed: {seed}.")
+
+        os.remove(filepath)
+
+    def test_construct_failure(self):
+        """
+        Test that a non-positive flush cadence is rejected.
+
+        """
+        with self.assertRaises(ValueError):
+            io.SnapshotWriter("temp_writer", "Temp", 1, flush_every=0)
+
+    def test_write_compact(self):
+        """
+        Test that compressed, single-precision, and quantized snapshots are
+        read back within the expected accuracy.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(2, 100)
+        n_snapshots = np.random.randint(1, 10)
+        positions = np.random.randn(n_snapshots, N, 3)
+
+        layouts = [({
+            "Compression": "gzip",
+            "CompressionLevel": 4,
+            "Shuffle": True
+        }, 0.), ({
+            "Compression": "lzf",
+            "Precision": "single"
+        }, 1.e-6), ({
+            "Quantization": 16
+        }, 1. / 2.**16)]
+        for layout, tolerance in layouts:
+            opts = {"Groupname": "Temp", "Filename": "temp_writer", **layout}
+            with io.SnapshotWriter.from_dict(opts, N, n_snapshots) as writer:
+                for id_ in range(n_snapshots):
+                    writer.write({"Positions": positions[id_]},
+                                 Time(id_, 0.1 * id_))
+                filepath = writer.path
+
+            with io.SnapshotReader(filepath, "Temp") as reader:
+                positions_read = reader["Positions"][:]
+            side = np.ptp(positions, axis=1)[:, np.newaxis, :]
+            self.assertTrue(
+                np.all(np.abs(positions_read - positions) <= tolerance * side),
+                msg=f"snapshots read with layout {layout} differ "
+                f"from snapshots written. RNG seed: {seed}.")
+            os.remove(filepath)
@@ -0,0 +1,133 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for the functions of `particles.conserved_quantities`.
+
+"""
+
+import unittest
+import warnings
+
+import numpy as np
+
+from nbpy import particles
+
+
+class TestConservedQuantities(unittest.TestCase):
+    """
+    Test the functions of `particles.conserved_quantities`.
+
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._seed = np.random.randint(0, 1e6)
+        np.random.seed(cls._seed)
+
+    def test_conserved_quantities(self):
+        """
+        Test the quantities against sums over particles and pairs.
+
+        """
+        dim = 3
+        N = np.random.randint(2, 40)
+        masses = np.random.rand(N)
+        softening = np.random.rand()
+
+        phsp = particles.PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, dim))
+        phsp.set_velocities(np.random.randn(N, dim))
+
+        kinetic_expected = 0.
+        potential_expected = 0.
+        linear_expected = np.zeros(dim)
+        angular_expected = np.zeros(dim)
+        for j, (x_j, v_j) in enumerate(zip(phsp.positions, phsp.velocities)):
+            kinetic_expected += 0.5 * masses[j] * np.dot(v_j, v_j)
+            linear_expected += masses[j] * v_j
+            angular_expected += masses[j] * np.cross(x_j, v_j)
+            for k in range(j + 1, N):
+                d_sq = np.sum((phsp.positions[k] - x_j)**2.)
+                d_soft = np.sqrt(d_sq + softening**2.)
+                potential_expected -= masses[j] * masses[k] / d_soft
+
+        quantities = particles.conserved_quantities(phsp, masses, softening)
+        self.assertTrue(np.isclose(quantities["KineticEnergy"],
+                                   kinetic_expected),
+                        msg="kinetic energy differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.isclose(quantities["PotentialEnergy"],
+                                   potential_expected),
+                        msg="potential energy differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.isclose(quantities["Energy"],
+                                   kinetic_expected + potential_expected),
+                        msg="energy differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(quantities["LinearMomentum"],
+                                    linear_expected),
+                        msg="linear momentum differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+        self.assertTrue(np.allclose(quantities["AngularMomentum"],
+                                    angular_expected),
+                        msg="angular momentum differs from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+        tile_size = np.random.randint(1, N + 1)
+        potential = particles.potential_energy(phsp,
+                                               masses,
+                                               softening,
+                                               tile_size=tile_size)
+        self.assertTrue(np.isclose(potential, potential_expected),
+                        msg="tiled potential energy differs from expected "
+                        f"value. RNG seed: {self._seed}.")
+
+    def test_batch(self):
+        """
+        Test that the quantities of every system of a batched phase space are
+        those of the system alone.
+
+        """
+        dim = 3
+        batch = np.random.randint(1, 5)
+        N = np.random.randint(2, 20)
+        masses = np.random.rand(batch, N)
+
+        phsp = particles.PhaseSpace(N, batch)
+        phsp.set_positions(np.random.randn(batch, N, dim))
+        phsp.set_velocities(np.random.randn(batch, N, dim))
+        quantities = particles.conserved_quantities(phsp, masses, 0.1)
+
+        for b in range(batch):
+            system = particles.PhaseSpace(N)
+            system.set_positions(phsp.positions[b])
+            system.set_velocities(phsp.velocities[b])
+            expected = particles.conserved_quantities(system, masses[b], 0.1)
+            for name, value in expected.items():
+                self.assertTrue(np.allclose(quantities[name][b], value),
+                                msg=f"{name} differs from expected value. "
+                                f"RNG seed: {self._seed}.")
+
+    def test_unsoftened(self):
+        """
+        Test the potential energy without softening, which must not divide by
+        the zero distance of a particle to itself.
+
+        """
+        dim = 3
+        N = np.random.randint(2, 40)
+        masses = np.random.rand(N)
+        phsp = particles.PhaseSpace(N)
+        phsp.set_positions(np.random.randn(N, dim))
+
+        j, k = np.triu_indices(N, k=1)
+        distances = np.linalg.norm(phsp.positions[j] - phsp.positions[k],
+                                   axis=1)
+        potential_expected = -np.sum(masses[j] * masses[k] / distances)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            potential = particles.potential_energy(phsp, masses)
+        self.assertTrue(np.isclose(potential, potential_expected),
+                        msg="unsoftened potential energy differs from "
+                        f"expected value. RNG seed: {self._seed}.")
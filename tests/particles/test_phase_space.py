@@ -50,3 +50,48 @@ class TestPhaseSpace(unittest.TestCase):
         self.assertTrue(np.allclose(accelerations, self._ps.accelerations),
                         msg="accelerations differs from expected value. "
                         f"RNG seed: {self._seed}.")
+
+    def test_batch(self):
+        """
+        Test the shapes of a batched phase space.
+
+        """
+        batch = np.random.randint(1, 10)
+        phsp = PhaseSpace(self._N, batch)
+        self.assertEqual(phsp.batch, batch)
+        self.assertIsNone(self._ps.batch)
+        for value in (phsp.positions, phsp.velocities, phsp.accelerations):
+            self.assertEqual(value.shape, (batch, self._N, 3))
+
+    def test_kick_drift(self):
+        """
+        Test that kicks and drifts update the velocities and positions in
+        place.
+
+        """
+        dim = 3
+        dt = np.random.randn()
+        phsp = PhaseSpace(self._N)
+        positions = np.random.randn(self._N, dim)
+        velocities = np.random.randn(self._N, dim)
+        accelerations = np.random.randn(self._N, dim)
+        phsp.set_positions(positions)
+        phsp.set_velocities(velocities)
+        phsp.set_accelerations(accelerations)
+        buffers = (phsp.positions, phsp.velocities)
+
+        phsp.kick(dt)
+        self.assertTrue(np.allclose(phsp.velocities,
+                                    velocities + dt * accelerations),
+                        msg="kicked velocities differ from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+        phsp.drift(dt)
+        velocities += dt * accelerations
+        self.assertTrue(np.allclose(phsp.positions,
+                                    positions + dt * velocities),
+                        msg="drifted positions differ from expected value. "
+                        f"RNG seed: {self._seed}.")
+
+        self.assertIs(phsp.positions, buffers[0])
+        self.assertIs(phsp.velocities, buffers[1])
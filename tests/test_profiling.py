@@ -0,0 +1,99 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for module `profiling`.
+
+"""
+
+import contextlib
+import io
+import time
+import unittest
+
+import numpy as np
+
+from nbpy.interactions import InverseSquareLaw
+from nbpy.particles import PhaseSpace
+from nbpy.profiling import PhaseTimer, Progress, TimedInteraction
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Test the classes of module `profiling`.
+
+    """
+
+    def test_phase_timer(self):
+        """
+        Test that nested phases are timed exclusively and counted.
+
+        """
+        timer = PhaseTimer()
+        for _ in range(2):
+            with timer.phase("Outer"):
+                time.sleep(0.01)
+                with timer.phase("Inner"):
+                    time.sleep(0.02)
+
+        seconds = timer.seconds
+        self.assertEqual(timer.calls, {"Outer": 2, "Inner": 2})
+        self.assertGreaterEqual(seconds["Inner"], 0.04)
+        self.assertGreaterEqual(seconds["Outer"], 0.02)
+        self.assertLess(seconds["Outer"], 0.04)
+
+        report = timer.report(steps=2)
+        for name in ("Outer", "Inner", "Other", "steps/s"):
+            self.assertIn(name, report)
+
+    def test_disabled(self):
+        """
+        Test that a disabled timer records nothing.
+
+        """
+        timer = PhaseTimer(enabled=False)
+        with timer.phase("Outer"):
+            pass
+        self.assertEqual(timer.seconds, {})
+        self.assertEqual(timer.calls, {})
+
+    def test_timed_interaction(self):
+        """
+        Test that the wrapped interaction sets the same accelerations, and
+        that its evaluations are counted.
+
+        """
+        seed = np.random.randint(0, 1e6)
+        rng = np.random.default_rng(seed)
+        N = 10
+        masses = rng.random(N)
+        phsp = PhaseSpace(N)
+        phsp.set_positions(rng.standard_normal((N, 3)))
+        phsp.set_velocities(rng.standard_normal((N, 3)))
+
+        law = InverseSquareLaw(1., 0.1)
+        law.exert(phsp, masses)
+        expected = np.copy(phsp.accelerations)
+
+        timer = PhaseTimer()
+        timed = TimedInteraction(law, timer)
+        timed.exert(phsp, masses)
+        timed.exert_on(phsp, masses, np.arange(3))
+        timed.exert_with_jerks(phsp, masses)
+
+        self.assertTrue(np.allclose(phsp.accelerations, expected),
+                        msg="acceleration differs from expected value. "
+                        f"RNG seed: {seed}.")
+        self.assertEqual(timer.calls, {"Force": 3})
+        self.assertEqual(timed.softening, law.softening)
+
+    def test_progress(self):
+        """
+        Test the progress lines.
+
+        """
+        progress = Progress(1, 10, 0.)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            progress.update(5)
+        self.assertIn("Step 5/10 (50.0%)", output.getvalue())
+        self.assertIn("ETA", output.getvalue())
@@ -0,0 +1,327 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for `simulation.run`.
+
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import h5py
+import numpy as np
+import yaml
+
+from nbpy import evolution, interactions, particles, simulation
+
+
+class TestSimulation(unittest.TestCase):
+    """
+    Test function `simulation.run`.
+
+    """
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._folder = tempfile.mkdtemp()
+        os.chdir(self._folder)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        shutil.rmtree(self._folder)
+
+    @staticmethod
+    def _run(options: dict) -> None:
+        with open("Input.yml", "w", encoding="utf-8") as outfile:
+            yaml.safe_dump(options, outfile)
+        simulation.run("Input")
+
+    def test_restart(self):
+        """
+        Test that a run resumed from a checkpoint is identical to an
+        uninterrupted run.
+
+        """
+        options = {
+            "Particles": {
+                "N": 20
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 20
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles",
+                "EveryDt": 2.5e-3
+            },
+            "Checkpoints": {
+                "Every": 7,
+                "Filename": "Checkpoint"
+            }
+        }
+        self._run(options)
+        with h5py.File("Data.hdf5", "r") as readfile:
+            positions_expected = readfile["Particles/Positions"][:]
+            time_ids_expected = readfile["Particles/TimeId"][:]
+
+        # Stop after the second checkpoint, then resume and extend the run.
+        options["Evolution"]["Timesteps"] = 16
+        self._run(options)
+        options["Evolution"]["Timesteps"] = 20
+        options["Checkpoints"]["Restart"] = True
+        self._run(options)
+
+        with h5py.File("Data.hdf5", "r") as readfile:
+            self.assertTrue(
+                np.array_equal(readfile["Particles/TimeId"][:],
+                               time_ids_expected))
+            self.assertTrue(np.array_equal(readfile["Particles/Positions"][:],
+                                           positions_expected),
+                            msg="resumed run differs from uninterrupted run.")
+
+    def test_restart_after_crash(self):
+        """
+        Test that a run killed right after a checkpoint resumes from the
+        checkpoint and the snapshots written up to it, exactly as an
+        uninterrupted run, for an integrator that keeps state between steps.
+
+        """
+        options = {
+            "Particles": {
+                "N": 20
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 20,
+                "Integrator": "Hermite"
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles",
+                "EveryDt": 2.5e-3
+            },
+            "Checkpoints": {
+                "Every": 7,
+                "Filename": "Checkpoint"
+            }
+        }
+        self._run(options)
+        with h5py.File("Data.hdf5", "r") as readfile:
+            positions_expected = readfile["Particles/Positions"][:]
+            time_ids_expected = readfile["Particles/TimeId"][:]
+
+        for asynchronous in (False, True):
+            options["Observers"]["Asynchronous"] = asynchronous
+            options["Checkpoints"]["Restart"] = False
+            os.remove("Data.hdf5")
+            os.remove("Checkpoint.hdf5")
+            process = multiprocessing.get_context("fork").Process(
+                target=self._run_until_checkpoint, args=(options, 14))
+            process.start()
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+            options["Checkpoints"]["Restart"] = True
+            self._run(options)
+            with h5py.File("Data.hdf5", "r") as readfile:
+                self.assertTrue(
+                    np.array_equal(readfile["Particles/TimeId"][:],
+                                   time_ids_expected))
+                self.assertTrue(
+                    np.array_equal(readfile["Particles/Positions"][:],
+                                   positions_expected),
+                    msg="resumed run differs from uninterrupted run "
+                    f"(asynchronous: {asynchronous}).")
+
+        options["Evolution"]["Integrator"] = "Leapfrog"
+        with self.assertRaises(ValueError):
+            self._run(options)
+
+    @classmethod
+    def _run_until_checkpoint(cls, options: dict, time_id: int) -> None:
+        """
+        Run the simulation and exit without any clean-up once the checkpoint
+        at the given time is written, as if the process were killed.
+
+        """
+        write_checkpoint = simulation.io.write_checkpoint
+
+        def crash(filename, phsp, masses, time, *args):
+            write_checkpoint(filename, phsp, masses, time, *args)
+            if time.id_ == time_id:
+                os._exit(0)  # pylint: disable=protected-access
+
+        with mock.patch.object(simulation.io, "write_checkpoint", crash):
+            cls._run(options)
+
+    def test_instrumentation(self):
+        """
+        Test that the timing report, progress lines, and profile are written
+        when requested.
+
+        """
+        options = {
+            "Particles": {
+                "N": 10
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 5
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles"
+            },
+            "Instrumentation": {
+                "Timing": True,
+                "ProgressEvery": 1.e-9,
+                "Profile": "Profile.prof"
+            }
+        }
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self._run(options)
+
+        for line in ("Step 5/5", "Force", "Integrator", "Output", "Other",
+                     "Profile written"):
+            self.assertIn(line, output.getvalue())
+        self.assertTrue(os.path.isfile("Profile.prof"))
+
+    def test_registries(self):
+        """
+        Test that the integrator, initial data, and masses given in the input
+        file are used, and that unknown types are rejected.
+
+        """
+        N = 6
+        masses = np.arange(1., N + 1.)
+        options = {
+            "Particles": {
+                "N": N,
+                "Masses": masses.tolist()
+            },
+            "InitialData": {
+                "RandomDistribution": {
+                    "Seed": 7
+                }
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 4,
+                "Integrator": "ForestRuth"
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles",
+                "Fields": ["Positions", "Masses"]
+            }
+        }
+        self._run(options)
+
+        phsp = particles.PhaseSpace(N)
+        evolution.RandomDistribution(7).set_variables(phsp)
+        law = interactions.InverseSquareLaw(1., 1.e-1)
+        law.exert(phsp, masses)
+        integrator = evolution.ForestRuth()
+        for _ in range(4):
+            integrator.evolve(phsp, 1.e-3, masses, law)
+
+        with h5py.File("Data.hdf5", "r") as readfile:
+            self.assertTrue(
+                np.array_equal(readfile["Particles/Masses"][:], masses))
+            self.assertTrue(np.array_equal(readfile["Particles/Positions"][-1],
+                                           phsp.positions),
+                            msg="run differs from expected integration.")
+
+        options["Evolution"]["Integrator"] = {"Euler": {}}
+        with self.assertRaises(ValueError):
+            self._run(options)
+
+    def test_batch(self):
+        """
+        Test that a batch of systems is evolved, and that integrators and
+        interactions not supporting batches are rejected.
+
+        """
+        options = {
+            "Particles": {
+                "N": 5,
+                "Batch": 3
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 2
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles"
+            }
+        }
+        self._run(options)
+        with h5py.File("Data.hdf5", "r") as readfile:
+            self.assertEqual(
+                np.shape(readfile["Particles/Positions"])[1:], (15, 3))
+
+        for integrator in ("Hermite", "BlockTimestep"):
+            options["Evolution"]["Integrator"] = integrator
+            with self.assertRaisesRegex(ValueError, integrator):
+                self._run(options)
+
+        options["Evolution"]["Integrator"] = "Leapfrog"
+        for interaction in ({
+                "BarnesHut": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+        }, {
+                "ParticleMesh": {
+                    "Constant": 1.,
+                    "GridSize": 8,
+                    "BoxSize": 1.
+                }
+        }):
+            options["Interaction"] = interaction
+            with self.assertRaisesRegex(ValueError, next(iter(interaction))):
+                self._run(options)
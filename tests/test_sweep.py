@@ -0,0 +1,152 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Contains unit tests for module `sweep`.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+import yaml
+
+from nbpy import sweep
+
+
+class TestSweep(unittest.TestCase):
+    """
+    Test the functions of module `sweep`.
+
+    """
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._folder = tempfile.mkdtemp()
+        os.chdir(self._folder)
+
+        options = {
+            "Particles": {
+                "N": 10
+            },
+            "Interaction": {
+                "InverseSquareLaw": {
+                    "Constant": 1.,
+                    "Softening": 1.e-1
+                }
+            },
+            "Evolution": {
+                "InitialDt": 1.e-3,
+                "Timesteps": 5
+            },
+            "Observers": {
+                "Observing": True,
+                "Filename": "Data",
+                "Groupname": "Particles"
+            }
+        }
+        with open("Input.yml", "w", encoding="utf-8") as outfile:
+            yaml.safe_dump(options, outfile)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        shutil.rmtree(self._folder)
+
+    def test_expand_grid(self):
+        """
+        Test that the grid is expanded to the Cartesian product of values.
+
+        """
+        points = sweep.expand_grid({"A.B": [1, 2], "C": ["x", "y", "z"]})
+        self.assertEqual(len(points), 6)
+        self.assertEqual(points[0], {"A.B": 1, "C": "x"})
+        self.assertEqual(points[1], {"A.B": 1, "C": "y"})
+        self.assertEqual(points[-1], {"A.B": 2, "C": "z"})
+
+    def test_job_memory(self):
+        """
+        Test that the memory estimate grows as N^2 for the dense pass and
+        is bounded by the memory budget of the tiled pass.
+
+        """
+        options = sweep.io.input_from_yaml("Input")
+        small = sweep.job_memory(options)
+        options["Particles"]["N"] = 1000
+        dense = sweep.job_memory(options)
+        self.assertGreater(dense, 5000 * small)
+
+        options["Interaction"]["InverseSquareLaw"]["MemoryBudget"] = 1.e6
+        tiled = sweep.job_memory(options)
+        self.assertLess(tiled, 1.e6 + 10 * 1000 * 8)
+
+        # The mesh and the tree are sized without being built.
+        options["Interaction"] = {
+            "ParticleMesh": {
+                "Constant": 1.,
+                "GridSize": 256,
+                "BoxSize": 1.
+            }
+        }
+        self.assertGreater(sweep.job_memory(options), 256**3 * 8)
+        options["Interaction"] = {
+            "BarnesHut": {
+                "Constant": 1.,
+                "Softening": 1.e-1
+            }
+        }
+        self.assertGreater(sweep.job_memory(options), 100 * 1000)
+
+    def test_run_sweep(self):
+        """
+        Test that every job writes its own output, that failed jobs are
+        reported, and that the summary is written.
+
+        """
+        grid = {
+            "Particles.Seed": [1, 2],
+            "Observers.Fields": [["Positions"], ["Spins"]]
+        }
+        summary = sweep.run_sweep("Input", grid, workers=2, memory_limit=1.e9)
+
+        self.assertEqual([entry["Job"] for entry in summary], [0, 1, 2, 3])
+        self.assertEqual([entry["Status"] for entry in summary],
+                         ["Done", "Failed", "Done", "Failed"])
+        self.assertIsNotNone(summary[1]["Error"])
+
+        positions = []
+        for entry in summary[::2]:
+            self.assertEqual(entry["Parameters"]["Observers.Fields"],
+                             ["Positions"])
+            with h5py.File(os.path.join(entry["Folder"], "Data.hdf5"),
+                           "r") as readfile:
+                self.assertEqual(len(readfile["Particles/Time"]), 6)
+                positions.append(readfile["Particles/Positions"][0])
+        self.assertFalse(np.allclose(positions[0], positions[1]),
+                         msg="seeds were not applied.")
+
+        with open(os.path.join("Sweep", "Summary.yml"), "r",
+                  encoding="utf-8") as infile:
+            self.assertEqual(yaml.safe_load(infile), summary)
+
+    def test_memory_limit(self):
+        """
+        Test that jobs whose memory estimates exceed the memory limit together
+        run one after the other.
+
+        """
+        grid = {"Particles.Seed": [1, 2, 3]}
+        summary = sweep.run_sweep("Input", grid, workers=3, memory_limit=1.)
+        self.assertEqual([entry["Status"] for entry in summary],
+                         ["Done", "Done", "Done"])
+
+        # Every job writes its input file when it starts, and closes its
+        # output file when it ends.
+        for previous, entry in zip(summary, summary[1:]):
+            self.assertGreaterEqual(
+                os.path.getmtime(os.path.join(entry["Folder"], "Input.yml")),
+                os.path.getmtime(os.path.join(previous["Folder"],
+                                              "Data.hdf5")),
+                msg="jobs ran concurrently despite the memory limit.")